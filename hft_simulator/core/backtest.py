@@ -66,6 +66,62 @@ class Backtester:
         equity_curve = pd.Series(equity, index=self.data['timestamp'])
         return BacktestResult(self.trades, equity_curve)
 
+    def run_vectorized(
+        self,
+        signal_func: Callable[[np.ndarray, Any], np.ndarray],
+        initial_cash: float = 100000.0
+    ) -> BacktestResult:
+        """
+        Array version of run() for signal functions written over the whole
+        price history (e.g. strategy.ma_crossover_signals), returning 1/-1/0
+        per tick for BUY/SELL/HOLD. Every order is assumed to fill at the tick
+        price, so execution_func is not called; use run() for path-dependent
+        strategies or executions. Produces the same BacktestResult as run().
+        """
+        prices = self.data['price'].to_numpy(dtype=np.float64)
+        signals = np.asarray(signal_func(prices, self.config))
+        trade_idx, trade_side = self._signal_trades(signals)
+
+        delta = np.zeros(len(prices), dtype=np.int64)
+        delta[trade_idx] = trade_side
+        position = np.cumsum(delta)
+        # Accumulate cash flows left to right, as run() does
+        flows = np.zeros(len(prices) + 1)
+        flows[0] = initial_cash
+        flows[trade_idx + 1] = -trade_side * prices[trade_idx]
+        cash = np.cumsum(flows)[1:]
+        equity = cash + position * prices
+
+        timestamps = self.data['timestamp']
+        for side, price, ts in zip(
+            trade_side.tolist(), prices[trade_idx].tolist(), timestamps.iloc[trade_idx].tolist()
+        ):
+            self.trades.append({"side": "BUY" if side > 0 else "SELL", "price": price, "timestamp": ts})
+
+        equity_curve = pd.Series(equity, index=timestamps)
+        return BacktestResult(self.trades, equity_curve)
+
+    @staticmethod
+    def _signal_trades(signals: np.ndarray):
+        """
+        Tick indices and sides (+1/-1) of the unit trades run() makes: a BUY
+        trades while position <= 0 and a SELL while position >= 0, so each run
+        of identical signals trades on its first (target - position) ticks.
+        """
+        nonzero = np.flatnonzero(signals)
+        sides = np.sign(signals[nonzero]).astype(np.int64)
+        run_starts = np.flatnonzero(np.diff(sides, prepend=0))
+        run_ends = np.append(run_starts[1:], len(sides))
+        trade_idx = []
+        position = 0
+        for start, end in zip(run_starts.tolist(), run_ends.tolist()):
+            side = int(sides[start])
+            steps = min(end - start, abs(side - position))
+            trade_idx.append(nonzero[start:start + steps])
+            position += side * steps
+        trade_idx = np.concatenate(trade_idx) if trade_idx else np.empty(0, dtype=np.int64)
+        return trade_idx, np.sign(signals[trade_idx]).astype(np.int64)
+
 # Example usage:
 # import pandas as pd
 # from strategy import StrategyConfig, generate_signal
@@ -78,6 +134,7 @@ class Backtester:
 #
 # backtester = Backtester(data, generate_signal, mock_execution, config)
 # result = backtester.run()
+# result = backtester.run_vectorized(ma_crossover_signals)  # same result, array-at-a-time
 # print("PnL:", result.pnl)
 # print("Sharpe:", result.sharpe)
 # print("Max Drawdown:", result.max_drawdown)
@@ -0,0 +1,139 @@
+import heapq
+import itertools
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import numpy as np
+from hft_simulator.core.tick_store import NAT_NS, datetime_to_ns
+
+class ScheduledEvent:
+    """Handle for a scheduled callback; cancel() drops it without touching the queue."""
+    __slots__ = ("time", "seq", "callback", "args")
+
+    def __init__(self, time: float, seq: int, callback: Callable, args: tuple):
+        self.time = time
+        self.seq = seq
+        self.callback = callback
+        self.args = args
+
+    def __lt__(self, other: "ScheduledEvent") -> bool:
+        return (self.time, self.seq) < (other.time, other.seq)
+
+    def cancel(self):
+        self.callback = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.callback is None
+
+class EventScheduler:
+    """
+    Discrete-event scheduler with a virtual clock (seconds).
+    Events run in time order, ties in scheduling order, and the clock jumps
+    straight to each event's time. With realtime=True dispatch is paced
+    against the wall clock instead, reproducing sleep-based behavior.
+    """
+    def __init__(self, start_time: float = 0.0, realtime: bool = False):
+        self.now = start_time
+        self.realtime = realtime
+        self._queue: List[ScheduledEvent] = []
+        self._seq = itertools.count()
+
+    def schedule_at(self, when: float, callback: Callable, *args) -> ScheduledEvent:
+        if when < self.now:
+            raise ValueError(f"Cannot schedule in the past: {when} < {self.now}")
+        event = ScheduledEvent(when, next(self._seq), callback, args)
+        heapq.heappush(self._queue, event)
+        return event
+
+    def schedule_in(self, delay: float, callback: Callable, *args) -> ScheduledEvent:
+        return self.schedule_at(self.now + max(0.0, delay), callback, *args)
+
+    def _next_event(self) -> Optional[ScheduledEvent]:
+        """Peek at the next live event, discarding cancelled ones."""
+        queue = self._queue
+        while queue and queue[0].cancelled:
+            heapq.heappop(queue)
+        return queue[0] if queue else None
+
+    def step(self) -> bool:
+        """Run the next pending event. Returns False when the queue is empty."""
+        if self._next_event() is None:
+            return False
+        event = heapq.heappop(self._queue)
+        if self.realtime and event.time > self.now:
+            time.sleep(event.time - self.now)
+        self.now = event.time
+        event.callback(*event.args)
+        return True
+
+    def run_until(self, until: float):
+        """Run all events due at or before `until`, then advance the clock to it."""
+        while True:
+            event = self._next_event()
+            if event is None or event.time > until:
+                break
+            self.step()
+        if until > self.now:
+            if self.realtime:
+                time.sleep(until - self.now)
+            self.now = until
+
+    def run(self):
+        """Run until no events remain."""
+        while self.step():
+            pass
+
+    def __len__(self) -> int:
+        return sum(1 for event in self._queue if not event.cancelled)
+
+def event_time(ts: Any) -> float:
+    """
+    Scheduler time in seconds for a tick timestamp: a datetime or
+    datetime64, integer epoch nanoseconds (as in the tick store) or float
+    epoch seconds. Missing timestamps (None, NaT, NaN) raise ValueError.
+    """
+    if isinstance(ts, np.datetime64):
+        ts = int(ts.astype("datetime64[ns]").astype(np.int64))
+    if isinstance(ts, datetime):
+        if ts != ts:  # pandas NaT
+            raise ValueError("Tick has no timestamp")
+        return datetime_to_ns(ts) / 1e9
+    if isinstance(ts, (int, np.integer)) and not isinstance(ts, bool):
+        if ts == NAT_NS:
+            raise ValueError("Tick has no timestamp")
+        return int(ts) / 1e9
+    if ts is None or ts != ts:
+        raise ValueError("Tick has no timestamp")
+    return float(ts)
+
+def schedule_event_stream(
+    scheduler: EventScheduler,
+    event_stream: Iterable[Dict[str, Any]],
+    callback: Callable[[Dict[str, Any]], None],
+    time_key: str = "timestamp",
+    time_func: Callable[[Any], float] = event_time
+):
+    """
+    Replay market events on the scheduler at their own timestamps. Only the
+    next event is queued at any time, so the stream is consumed lazily and
+    interleaves correctly with latency-delayed order events.
+    """
+    events = iter(event_stream)
+
+    def dispatch(event: Dict[str, Any]):
+        callback(event)
+        schedule_next()
+
+    def schedule_next():
+        event = next(events, None)
+        if event is not None:
+            scheduler.schedule_at(max(time_func(event[time_key]), scheduler.now), dispatch, event)
+
+    schedule_next()
+
+# Example usage:
+# scheduler = EventScheduler(start_time=event_time(first_tick["timestamp"]))
+# engine = ExecutionEngine(order_book_callback, latency=0.01, scheduler=scheduler)
+# schedule_event_stream(scheduler, stream_market_data("ticks.csv"), on_tick)
+# scheduler.run()
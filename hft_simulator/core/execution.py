@@ -1,6 +1,8 @@
 import time
-import uuid
 from typing import Dict, Callable, Optional
+from hft_simulator.core.orders import Order as CompactOrder
+from hft_simulator.core.clock import EventScheduler
+from hft_simulator.core.order_store import OrderStore
 
 class OrderStatus:
     NEW = "NEW"
@@ -9,50 +11,141 @@ class OrderStatus:
     CANCELLED = "CANCELLED"
     PARTIALLY_FILLED = "PARTIALLY_FILLED"
 
-class Order:
+TERMINAL_STATUSES = (OrderStatus.FILLED, OrderStatus.REJECTED, OrderStatus.CANCELLED)
+
+class Order(CompactOrder):
+    __slots__ = ("filled", "avg_price")
+
     def __init__(self, symbol: str, side: str, price: float, volume: int):
-        self.id = str(uuid.uuid4())
-        self.symbol = symbol
-        self.side = side  # "BUY" or "SELL"
-        self.price = price
-        self.volume = volume
+        super().__init__(side, price, volume, symbol)
         self.status = OrderStatus.NEW
+        self.filled = 0
+        self.avg_price = 0.0
+
+    @property
+    def leaves(self) -> int:
+        """Volume still open."""
+        return self.volume - self.filled
 
 class ExecutionEngine:
-    def __init__(self, order_book_callback: Callable[[Order], Dict], latency: float = 0.01):
-        self.orders: Dict[str, Order] = {}
+    def __init__(
+        self,
+        order_book_callback: Callable[[Order], Dict],
+        latency: float = 0.01,
+        scheduler: Optional[EventScheduler] = None
+    ):
+        # Live orders stay in the hot dict; terminal ones move to the archive
+        self.store = OrderStore()
+        self.orders: Dict[int, Order] = self.store.live
         self.order_book_callback = order_book_callback
         self.latency = latency  # Simulated latency in seconds
+        # With a scheduler, latency is simulated time rather than a real sleep
+        self.scheduler = scheduler
 
-    def send_order(self, symbol: str, side: str, price: float, volume: int) -> str:
+    def send_order(self, symbol: str, side: str, price: float, volume: int) -> int:
+        """
+        Submit an order. Without a scheduler this blocks for `latency` seconds
+        and handles the response before returning. With a scheduler the order
+        reaches the book `latency` later in simulated time and stays NEW until
+        then.
+        """
+        order = self.create_order(symbol, side, price, volume)
+        if self.scheduler is not None:
+            self.scheduler.schedule_in(self.latency, self.deliver_order, order)
+        else:
+            if self.latency > 0:
+                time.sleep(self.latency)  # Simulate execution latency
+            self.deliver_order(order)
+        return order.id
+
+    def create_order(self, symbol: str, side: str, price: float, volume: int) -> Order:
+        """Create and register a NEW order without sending it."""
         order = Order(symbol, side, price, volume)
-        self.orders[order.id] = order
-        time.sleep(self.latency)  # Simulate execution latency
+        self.store.add(order)
+        return order
+
+    def deliver_order(self, order: Order):
+        """Hand a registered order to the book and apply the response."""
+        if order.status == OrderStatus.CANCELLED:
+            return  # Cancelled while in flight
         response = self.order_book_callback(order)
         self._handle_response(order, response)
-        return order.id
 
     def _handle_response(self, order: Order, response: Dict):
-        if response.get("status") == OrderStatus.FILLED:
-            order.status = OrderStatus.FILLED
-        elif response.get("status") == OrderStatus.REJECTED:
+        """
+        Apply a book response. Fill responses may carry "filled_volume" and
+        "price" for the executed quantity; a FILLED response without them
+        fills the remaining volume at the order price.
+        """
+        status = response.get("status")
+        if status in (OrderStatus.FILLED, OrderStatus.PARTIALLY_FILLED):
+            volume = response.get("filled_volume", order.leaves if status == OrderStatus.FILLED else 0)
+            if volume > 0:
+                self._apply_fill(order, volume, response.get("price", order.price))
+            else:
+                order.status = status
+        elif status == OrderStatus.REJECTED:
             order.status = OrderStatus.REJECTED
-        elif response.get("status") == OrderStatus.PARTIALLY_FILLED:
-            order.status = OrderStatus.PARTIALLY_FILLED
-        elif response.get("status") == OrderStatus.CANCELLED:
+        elif status == OrderStatus.CANCELLED:
             order.status = OrderStatus.CANCELLED
+        self._retire_if_done(order)
 
-    def cancel_order(self, order_id: str):
+    def apply_fill(self, order_id: int, volume: int, price: float) -> bool:
+        """Record a (partial) execution reported after the initial response."""
         order = self.orders.get(order_id)
-        if order and order.status == OrderStatus.NEW:
+        if order is None:
+            return False
+        self._apply_fill(order, volume, price)
+        self._retire_if_done(order)
+        return True
+
+    def _apply_fill(self, order: Order, volume: int, price: float):
+        volume = min(volume, order.leaves)
+        if volume <= 0:
+            return
+        filled = order.filled + volume
+        order.avg_price = (order.avg_price * order.filled + price * volume) / filled
+        order.filled = filled
+        order.status = OrderStatus.FILLED if order.leaves == 0 else OrderStatus.PARTIALLY_FILLED
+
+    def _retire_if_done(self, order: Order):
+        if order.status in TERMINAL_STATUSES:
+            now = self.scheduler.now if self.scheduler is not None else time.time()
+            self.store.retire(order, now)
+
+    def cancel_order(self, order_id: int):
+        """Cancel the open volume of a NEW or PARTIALLY_FILLED order."""
+        order = self.orders.get(order_id)
+        if order and order.status in (OrderStatus.NEW, OrderStatus.PARTIALLY_FILLED):
             order.status = OrderStatus.CANCELLED
+            self._retire_if_done(order)
 
-    def get_order_status(self, order_id: str) -> Optional[str]:
+    def reject_order(self, order_id: int):
+        """Mark a live order REJECTED (e.g. the book raised while handling it) and retire it."""
         order = self.orders.get(order_id)
-        return order.status if order else None
+        if order and order.status not in TERMINAL_STATUSES:
+            order.status = OrderStatus.REJECTED
+            self._retire_if_done(order)
+
+    def get_order_status(self, order_id: int) -> Optional[str]:
+        return self.store.get_status(order_id)
 
-    def update_position(self, order_id: str, position_tracker: Callable[[Order], None]):
+    def get_order(self, order_id: int) -> Optional[Order]:
+        """Look up a live order, or rebuild an archived one."""
         order = self.orders.get(order_id)
+        if order is not None:
+            return order
+        record = self.store.archive.get(order_id)
+        if record is None:
+            return None
+        order = Order.__new__(Order)
+        for name in ("id", "symbol", "side", "price", "volume", "status", "filled", "avg_price"):
+            setattr(order, name, record[name])
+        order.seq = 0
+        return order
+
+    def update_position(self, order_id: int, position_tracker: Callable[[Order], None]):
+        order = self.get_order(order_id)
         if order and order.status == OrderStatus.FILLED:
             position_tracker(order)
 
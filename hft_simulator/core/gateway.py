@@ -0,0 +1,132 @@
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from hft_simulator.core.execution import ExecutionEngine
+
+class AsyncOrderGateway:
+    """
+    asyncio front end for ExecutionEngine that pipelines orders.
+    Submissions are acknowledged immediately with the order id and coalesced
+    into batches per event-loop tick (or per batch_interval seconds). Each
+    batch pays the engine latency once and is dispatched as its own task,
+    so many batches can be in flight at the same time. Completion futures
+    resolve to the order status once the book response has been applied.
+    """
+    def __init__(self, engine: ExecutionEngine, batch_interval: float = 0.0, max_batch_size: int = 10000):
+        self.engine = engine
+        self.batch_interval = batch_interval
+        self.max_batch_size = max_batch_size
+        self._pending: List[Tuple[str, Any]] = []  # ("new", Order) or ("cancel", order_id)
+        self._futures: Dict[int, asyncio.Future] = {}
+        self._queued: Set[int] = set()  # New orders that have not left the gateway yet
+        self._inflight: Set[asyncio.Task] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "AsyncOrderGateway":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def send_order(self, symbol: str, side: str, price: float, volume: int) -> int:
+        """Queue an order for the next batch and return its id."""
+        order = self.engine.create_order(symbol, side, price, volume)
+        self._futures[order.id] = asyncio.get_running_loop().create_future()
+        self._queued.add(order.id)
+        self._enqueue(("new", order))
+        return order.id
+
+    def send_orders(self, orders: Iterable[Tuple[str, str, float, int]]) -> List[int]:
+        """Queue many (symbol, side, price, volume) orders; returns their ids."""
+        return [self.send_order(*order) for order in orders]
+
+    def cancel_order(self, order_id: int):
+        """
+        Cancel an order. Orders still queued in the gateway are cancelled
+        locally and never sent; others are cancelled with the next batch.
+        """
+        if order_id in self._queued:
+            self.engine.cancel_order(order_id)
+        else:
+            self._enqueue(("cancel", order_id))
+
+    def cancel_orders(self, order_ids: Iterable[int]):
+        for order_id in order_ids:
+            self.cancel_order(order_id)
+
+    def completion(self, order_id: int) -> asyncio.Future:
+        """Future resolving to the order's status once its response has been handled."""
+        future = self._futures.get(order_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(self.engine.get_order_status(order_id))
+        return future
+
+    async def flush(self):
+        """Wait until every queued request has been dispatched and handled."""
+        while self._pending or self._inflight:
+            if self._inflight:
+                await asyncio.gather(*self._inflight)
+            else:
+                await asyncio.sleep(0)
+
+    async def close(self):
+        await self.flush()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _enqueue(self, request: Tuple[str, Any]):
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        self._pending.append(request)
+        self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            # Let everything submitted during this tick (or interval) join the batch
+            await asyncio.sleep(self.batch_interval)
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+            for kind, item in batch:
+                if kind == "new":
+                    self._queued.discard(item.id)
+            if not self._pending:
+                self._wakeup.clear()
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, Any]]):
+        if self.engine.latency > 0:
+            await asyncio.sleep(self.engine.latency)  # One round-trip for the whole batch
+        engine = self.engine
+        for kind, item in batch:
+            if kind == "cancel":
+                engine.cancel_order(item)
+                continue
+            try:
+                engine.deliver_order(item)
+            except Exception as exc:
+                engine.reject_order(item.id)
+                self._resolve(item.id, exception=exc)
+            else:
+                self._resolve(item.id, item.status)
+
+    def _resolve(self, order_id: int, status: Optional[str] = None, exception: Optional[BaseException] = None):
+        future = self._futures.pop(order_id, None)
+        if future is None or future.done():
+            return
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(status)
+
+# Example usage:
+# async def main():
+#     engine = ExecutionEngine(order_book_callback=mock_order_book, latency=0.01)
+#     async with AsyncOrderGateway(engine) as gateway:
+#         ids = gateway.send_orders([("AAPL", "BUY", 150.0, 10), ("MSFT", "SELL", 310.0, 5)])
+#         statuses = await asyncio.gather(*(gateway.completion(i) for i in ids))
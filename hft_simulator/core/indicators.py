@@ -0,0 +1,121 @@
+import math
+from typing import List, Optional
+
+class RingBuffer:
+    """Fixed-size circular buffer of floats."""
+    def __init__(self, size: int):
+        if size <= 0:
+            raise ValueError(f"Buffer size must be positive: {size}")
+        self.size = size
+        self.values: List[float] = [0.0] * size
+        self.index = 0  # Next write position
+        self.count = 0
+
+    def push(self, value: float) -> Optional[float]:
+        """Append a value, returning the evicted value once the buffer is full."""
+        evicted = self.values[self.index] if self.count == self.size else None
+        self.values[self.index] = value
+        self.index = (self.index + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+        return evicted
+
+    @property
+    def full(self) -> bool:
+        return self.count == self.size
+
+class SMA:
+    """Simple moving average over the last `window` values, O(1) per update."""
+    def __init__(self, window: int):
+        self.window = window
+        self.buffer = RingBuffer(window)
+        self.total = 0.0
+        self.value: Optional[float] = None
+
+    def update(self, x: float) -> Optional[float]:
+        evicted = self.buffer.push(x)
+        self.total += x - (evicted or 0.0)
+        if self.buffer.index == 0:
+            # Resum once per wrap so floating-point drift stays bounded
+            self.total = math.fsum(self.buffer.values[:self.buffer.count])
+        self.value = self.total / self.window if self.buffer.full else None
+        return self.value
+
+class EMA:
+    """Exponential moving average; alpha defaults to 2 / (span + 1)."""
+    def __init__(self, span: int, alpha: Optional[float] = None):
+        self.alpha = alpha if alpha is not None else 2.0 / (span + 1)
+        self.value: Optional[float] = None
+
+    def update(self, x: float) -> float:
+        if self.value is None:
+            self.value = x
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+class RollingStd:
+    """Rolling mean and population standard deviation over `window` values."""
+    def __init__(self, window: int):
+        self.window = window
+        self.buffer = RingBuffer(window)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.mean: Optional[float] = None
+        self.value: Optional[float] = None
+
+    def update(self, x: float) -> Optional[float]:
+        evicted = self.buffer.push(x)
+        if evicted is not None:
+            self.total -= evicted
+            self.total_sq -= evicted * evicted
+        self.total += x
+        self.total_sq += x * x
+        if self.buffer.index == 0:
+            values = self.buffer.values[:self.buffer.count]
+            self.total = math.fsum(values)
+            self.total_sq = math.fsum(v * v for v in values)
+        if not self.buffer.full:
+            return None
+        self.mean = self.total / self.window
+        variance = max(self.total_sq / self.window - self.mean * self.mean, 0.0)
+        self.value = math.sqrt(variance)
+        return self.value
+
+class ZScore:
+    """Distance of the latest value from its rolling mean, in rolling standard deviations."""
+    def __init__(self, window: int):
+        self.std = RollingStd(window)
+        self.value: Optional[float] = None
+
+    def update(self, x: float) -> Optional[float]:
+        std = self.std.update(x)
+        if std is None:
+            self.value = None
+        else:
+            self.value = (x - self.std.mean) / std if std > 0 else 0.0
+        return self.value
+
+class VWAP:
+    """Volume-weighted average price, cumulative or over the last `window` ticks."""
+    def __init__(self, window: Optional[int] = None):
+        self.notional = RingBuffer(window) if window else None
+        self.volumes = RingBuffer(window) if window else None
+        self.total_notional = 0.0
+        self.total_volume = 0.0
+        self.value: Optional[float] = None
+
+    def update(self, price: float, volume: float) -> Optional[float]:
+        notional = price * volume
+        self.total_notional += notional
+        self.total_volume += volume
+        if self.notional is not None:
+            self.total_notional -= self.notional.push(notional) or 0.0
+            self.total_volume -= self.volumes.push(volume) or 0.0
+        self.value = self.total_notional / self.total_volume if self.total_volume > 0 else None
+        return self.value
+
+# Example usage:
+# sma = SMA(20)
+# for tick in stream:
+#     avg = sma.update(tick["price"])  # None until 20 prices have been seen
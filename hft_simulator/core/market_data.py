@@ -1,18 +1,96 @@
 import os
 import csv
-from datetime import datetime
-from typing import Dict, Generator, Any, Optional
+import heapq
+from typing import Dict, Generator, Any, Optional, Union, Callable, Iterator, List
+import numpy as np
+import pandas as pd
+from hft_simulator.core.tick_store import (
+    STORE_SUFFIX, TickColumns, is_store_fresh, load_columnar, store_path_for, write_columnar
+)
+from hft_simulator.utils.helper_functions import convert_timestamp, parse_timestamps
 
 DATA_DIR = "data"
+DEFAULT_BATCH_SIZE = 100_000
 
-def load_market_data(filename: str) -> list[Dict[str, Any]]:
-    """Load tick data from a CSV file in the data/ directory."""
+def load_market_data(filename: str, columnar: bool = False) -> Union[list[Dict[str, Any]], TickColumns]:
+    """
+    Load tick data from a CSV file in the data/ directory.
+    If a binary column store newer than the CSV exists it is used instead of
+    parsing the CSV. With columnar=True the store is built if needed and the
+    memory-mapped TickColumns are returned instead of a list of dicts.
+    """
     path = os.path.join(DATA_DIR, filename)
+    if is_store_fresh(path):
+        ticks = load_columnar(store_path_for(path))
+        return ticks if columnar else ticks.to_dicts()
+    if columnar:
+        return load_columnar(convert_csv_to_columnar(filename))
     with open(path, newline='') as csvfile:
         reader = csv.DictReader(csvfile)
         data = [normalize_tick(row) for row in reader]
     return data
 
+def convert_csv_to_columnar(filename: str, batch_size: int = DEFAULT_BATCH_SIZE) -> str:
+    """One-time conversion of a CSV in data/ to a binary column store. Returns the store path."""
+    path = os.path.join(DATA_DIR, filename)
+    columns = {name: [] for name in ("timestamp", "price", "volume", "symbol", "side")}
+    symbol_dict: Dict[Optional[str], int] = {}
+    side_dict: Dict[Optional[str], int] = {}
+    for batch in read_tick_batches(path, batch_size):
+        for name in ("timestamp", "price", "volume"):
+            columns[name].append(batch[name])
+        for name, dictionary in (("symbol", symbol_dict), ("side", side_dict)):
+            codes, uniques = pd.factorize(batch[name], use_na_sentinel=False)
+            mapping = np.array([dictionary.setdefault(u, len(dictionary)) for u in uniques], dtype=np.int32)
+            columns[name].append(mapping[codes])
+    ticks = TickColumns(
+        *(np.concatenate(columns[name]) if columns[name] else np.empty(0) for name in columns),
+        symbols=list(symbol_dict),
+        sides=list(side_dict)
+    )
+    store_dir = store_path_for(path)
+    write_columnar(store_dir, ticks)
+    return store_dir
+
+def read_tick_batches(path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Generator[Dict[str, np.ndarray], None, None]:
+    """
+    Stream a tick CSV (optionally gzip/bz2/zip/xz compressed) as column batches
+    of at most batch_size rows, with the same defaults as normalize_tick.
+    Timestamps are int64 epoch nanoseconds (NaT where unparseable); symbol and
+    side are object arrays.
+    """
+    reader = pd.read_csv(
+        path, chunksize=batch_size, dtype=str, keep_default_na=False, compression="infer"
+    )
+    with reader:
+        for chunk in reader:
+            n = len(chunk)
+            yield {
+                "timestamp": parse_timestamps(chunk["timestamp"]) if "timestamp" in chunk
+                else np.full(n, np.iinfo(np.int64).min, dtype=np.int64),
+                "symbol": chunk["symbol"].to_numpy(dtype=object) if "symbol" in chunk
+                else np.full(n, None, dtype=object),
+                "price": pd.to_numeric(chunk["price"]).to_numpy(dtype=np.float64) if "price" in chunk
+                else np.zeros(n, dtype=np.float64),
+                "volume": pd.to_numeric(chunk["volume"]).to_numpy(dtype=np.int64) if "volume" in chunk
+                else np.zeros(n, dtype=np.int64),
+                "side": chunk["side"].to_numpy(dtype=object) if "side" in chunk
+                else np.full(n, "unknown", dtype=object),
+            }
+
+def stream_market_data(filename: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Generator[Dict[str, Any], None, None]:
+    """
+    Yield normalized ticks one by one from a CSV in data/ with bounded memory,
+    the same per-event interface as market_event_stream(load_market_data(...)).
+    """
+    path = os.path.join(DATA_DIR, filename)
+    for batch in read_tick_batches(path, batch_size):
+        timestamps = batch["timestamp"].view("datetime64[ns]").astype("datetime64[us]").tolist()
+        for ts, symbol, price, volume, side in zip(
+            timestamps, batch["symbol"], batch["price"].tolist(), batch["volume"].tolist(), batch["side"]
+        ):
+            yield {"timestamp": ts, "symbol": symbol, "price": price, "volume": volume, "side": side}
+
 def normalize_tick(tick: Dict[str, str]) -> Dict[str, Any]:
     """Normalize and format a raw tick dictionary."""
     return {
@@ -23,31 +101,123 @@ def normalize_tick(tick: Dict[str, str]) -> Dict[str, Any]:
         "side": tick.get("side", "unknown")
     }
 
-def convert_timestamp(ts: Optional[str]) -> Optional[datetime]:
-    """Convert a timestamp string to a datetime object."""
-    if not ts:
-        return None
-    # Try common timestamp formats
-    for fmt in ("%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S"):
-        try:
-            return datetime.strptime(ts, fmt)
-        except ValueError:
-            continue
-    return None
-
 def market_event_stream(data: list[Dict[str, Any]]) -> Generator[Dict[str, Any], None, None]:
     """Yield market events one by one, simulating a data stream."""
     for tick in data:
         yield tick
 
+def read_store_batches(store_dir: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Generator[Dict[str, np.ndarray], None, None]:
+    """Yield batches from a binary column store in the same shape as read_tick_batches."""
+    ticks = load_columnar(store_dir)
+    symbols = np.array(ticks.symbols, dtype=object)
+    sides = np.array(ticks.sides, dtype=object)
+    for start in range(0, len(ticks), batch_size):
+        stop = start + batch_size
+        yield {
+            "timestamp": ticks.timestamp[start:stop],
+            "symbol": symbols[ticks.symbol[start:stop]],
+            "price": ticks.price[start:stop],
+            "volume": ticks.volume[start:stop],
+            "side": sides[ticks.side[start:stop]],
+        }
+
+def read_source_batches(path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Generator[Dict[str, np.ndarray], None, None]:
+    """Batch reader for a tick source: a column store directory or a (compressed) CSV."""
+    if path.endswith(STORE_SUFFIX) or os.path.isdir(path):
+        return read_store_batches(path, batch_size)
+    if is_store_fresh(path):
+        return read_store_batches(store_path_for(path), batch_size)
+    return read_tick_batches(path, batch_size)
+
+class _SourceCursor:
+    """Position within the current batch of one tick source."""
+    def __init__(self, batches: Iterator[Dict[str, np.ndarray]]):
+        self.batches = batches
+        self.pos = 0
+        self.size = 0
+
+    def advance(self) -> bool:
+        """Move to the next row, loading the next batch when needed. False when exhausted."""
+        self.pos += 1
+        while self.pos >= self.size:
+            batch = next(self.batches, None)
+            if batch is None:
+                return False
+            self.keys = batch["timestamp"].tolist()
+            self.timestamps = batch["timestamp"].view("datetime64[ns]").astype("datetime64[us]").tolist()
+            self.symbols = batch["symbol"].tolist()
+            self.prices = batch["price"].tolist()
+            self.volumes = batch["volume"].tolist()
+            self.sides = batch["side"].tolist()
+            self.pos = 0
+            self.size = len(self.keys)
+        return True
+
+    def event(self) -> Dict[str, Any]:
+        i = self.pos
+        return {
+            "timestamp": self.timestamps[i],
+            "symbol": self.symbols[i],
+            "price": self.prices[i],
+            "volume": self.volumes[i],
+            "side": self.sides[i],
+        }
+
+def merge_tick_sources(paths: List[str], batch_size: int = DEFAULT_BATCH_SIZE) -> Generator[Dict[str, Any], None, None]:
+    """
+    Lazily k-way merge many tick sources (CSV or column stores) by timestamp.
+    Only one batch per source is held in memory; ties are broken by source
+    order, then file order.
+    """
+    heap = []
+    for idx, path in enumerate(paths):
+        cursor = _SourceCursor(read_source_batches(path, batch_size))
+        if cursor.advance():
+            heap.append((cursor.keys[0], idx, cursor))
+    heapq.heapify(heap)
+    while heap:
+        _, idx, cursor = heap[0]
+        yield cursor.event()
+        if cursor.advance():
+            heapq.heapreplace(heap, (cursor.keys[cursor.pos], idx, cursor))
+        else:
+            heapq.heappop(heap)
+
+def make_symbol_dispatcher(books: Dict[str, Any]) -> Callable[[Dict[str, Any]], None]:
+    """
+    Build a callback that routes each tick to its symbol's OrderBook as a
+    limit order. Ticks for unknown symbols, unknown sides or without volume
+    are ignored.
+    """
+    def dispatch(event: Dict[str, Any]):
+        book = books.get(event["symbol"])
+        if book is not None and event["volume"] > 0 and event["side"] in ("BUY", "SELL"):
+            book.add_order(event["side"], event["price"], event["volume"])
+    return dispatch
+
 # Example utility to feed events into an order book (stub)
-def feed_events_to_order_book(event_stream, order_book_callback):
-    """Feed events into the order book via a callback."""
+def feed_events_to_order_book(event_stream, order_book_callback, instrumentation=None):
+    """
+    Feed events into the order book via a callback.
+    With an enabled utils.instrumentation.Instrumentation, time spent
+    producing each event is recorded as "market_data" and each callback as
+    "tick_to_trade".
+    """
+    if instrumentation is not None and instrumentation.enabled:
+        event_stream = instrumentation.timed_stream("market_data", event_stream)
+        order_book_callback = instrumentation.wrap("tick_to_trade", order_book_callback)
     for event in event_stream:
         order_book_callback(event)
 
 # Example usage:
+# convert_csv_to_columnar("sample_ticks.csv")  # once; later loads use the binary store
 # data = load_market_data("sample_ticks.csv")
-# stream = market_event_stream(data)
+# stream = market_event_stream(data)  # or stream_market_data("big_ticks.csv.gz")
 # for event in stream:
-#     print(event)
\ No newline at end of file
+#     print(event)
+#
+# books = {"AAPL": OrderBook(), "MSFT": OrderBook()}
+# feed_events_to_order_book(
+#     merge_tick_sources(["data/AAPL.csv.gz", "data/MSFT.csv.cols"]),
+#     make_symbol_dispatcher(books)
+# )
\ No newline at end of file
@@ -0,0 +1,211 @@
+import os
+import time
+from typing import Any, Dict, Iterator, List
+import numpy as np
+from hft_simulator.core.order_book import BookSide, OrderBook
+
+# Market-by-order (L3) message types
+ADD, CANCEL, MODIFY, EXECUTE, CLEAR = 1, 2, 3, 4, 5
+MSG_NAMES = {ADD: "add", CANCEL: "cancel", MODIFY: "modify", EXECUTE: "execute", CLEAR: "clear"}
+
+# One fixed-size record per message. Field use by type:
+#   ADD      order_id, side, price, volume (size)
+#   CANCEL   order_id, volume (cancelled size; 0 cancels the whole order)
+#   MODIFY   order_id, price, volume (new price and size)
+#   EXECUTE  order_id, volume (executed size), price (trade price; NaN for the order price)
+#   CLEAR    nothing (drop every resting order)
+MBO_DTYPE = np.dtype([
+    ("timestamp", np.int64),  # Epoch nanoseconds
+    ("order_id", np.int64),
+    ("price", np.float64),
+    ("volume", np.int64),
+    ("msg_type", np.uint8),
+    ("side", np.int8),        # 1 for BUY, -1 for SELL
+])
+
+# File layout: 16-byte header (magic + record size) then packed MBO_DTYPE records
+MBO_MAGIC = b"HFTMBO01"
+MBO_HEADER_BYTES = 16
+
+def write_mbo_file(path: str, records: np.ndarray, append: bool = False):
+    """Write MBO_DTYPE records to a binary L3 event file."""
+    records = np.ascontiguousarray(records, dtype=MBO_DTYPE)
+    if append and os.path.exists(path):
+        with open(path, "ab") as f:
+            f.write(records.tobytes())
+        return
+    with open(path, "wb") as f:
+        f.write(MBO_MAGIC + np.array([MBO_DTYPE.itemsize], dtype=np.int64).tobytes())
+        f.write(records.tobytes())
+
+def load_mbo_file(path: str) -> np.ndarray:
+    """Memory-map an L3 event file as a read-only MBO_DTYPE array."""
+    with open(path, "rb") as f:
+        header = f.read(MBO_HEADER_BYTES)
+    if header[:8] != MBO_MAGIC:
+        raise ValueError(f"Not an MBO event file: {path}")
+    itemsize = int(np.frombuffer(header[8:], dtype=np.int64)[0])
+    if itemsize != MBO_DTYPE.itemsize:
+        raise ValueError(f"Record size {itemsize} does not match MBO_DTYPE ({MBO_DTYPE.itemsize})")
+    count = (os.path.getsize(path) - MBO_HEADER_BYTES) // itemsize
+    if count == 0:
+        return np.empty(0, dtype=MBO_DTYPE)
+    return np.memmap(path, dtype=MBO_DTYPE, mode="r", offset=MBO_HEADER_BYTES, shape=(count,))
+
+def read_mbo_batches(path: str, batch_size: int = 65536) -> Iterator[np.ndarray]:
+    """Yield consecutive memory-mapped slices of an L3 event file."""
+    records = load_mbo_file(path)
+    for start in range(0, len(records), batch_size):
+        yield records[start:start + batch_size]
+
+class MBOApplier:
+    """
+    Applies market-by-order messages to an OrderBook using the feed's own
+    order ids. Bad messages (unknown ids, duplicate adds, non-positive
+    sizes) are counted and skipped rather than raised. An execute larger
+    than the resting order is counted as bad_volume too, and executes the
+    whole order. An add that crosses
+    the book is matched by the book as usual, but it is also counted,
+    because a consistent feed reports executions explicitly. With
+    check_every=N, check_consistency() runs after every N batches.
+    """
+    def __init__(self, book: OrderBook, check_every: int = 0):
+        self.book = book
+        self.check_every = check_every
+        self.messages = 0
+        self.batches = 0
+        self.seconds = 0.0  # Time spent applying
+        self.counts = {name: 0 for name in MSG_NAMES.values()}
+        self.errors = {"unknown_order": 0, "duplicate_add": 0, "bad_volume": 0, "unknown_type": 0, "crossed": 0}
+        self.inconsistencies: List[str] = []
+
+    def apply(self, records: np.ndarray) -> int:
+        """Apply a batch of MBO_DTYPE records in order; returns the count applied."""
+        book = self.book
+        order_map = book.order_map
+        add, cancel, modify, execute = book.add_order, book.cancel_order, book.modify_order, book.execute_order
+        counts, errors = self.counts, self.errors
+        started = time.perf_counter()
+        for msg_type, oid, side, price, volume in zip(
+            records["msg_type"].tolist(), records["order_id"].tolist(), records["side"].tolist(),
+            records["price"].tolist(), records["volume"].tolist()
+        ):
+            if msg_type == ADD:
+                if oid in order_map:
+                    errors["duplicate_add"] += 1
+                elif volume <= 0:
+                    errors["bad_volume"] += 1
+                else:
+                    fill_seq = book.fill_seq
+                    add("BUY" if side > 0 else "SELL", price, volume, order_id=oid)
+                    if book.fill_seq != fill_seq:
+                        errors["crossed"] += 1
+                    counts["add"] += 1
+            elif msg_type == CANCEL:
+                order = order_map.get(oid)
+                if order is None:
+                    errors["unknown_order"] += 1
+                    continue
+                if 0 < volume < order.volume:
+                    modify(oid, order.price, order.volume - volume)  # Partial cancel keeps priority
+                else:
+                    cancel(oid)
+                counts["cancel"] += 1
+            elif msg_type == EXECUTE:
+                order = order_map.get(oid)
+                if order is None:
+                    errors["unknown_order"] += 1
+                elif volume <= 0:
+                    errors["bad_volume"] += 1
+                else:
+                    if volume > order.volume:
+                        errors["bad_volume"] += 1  # Over-execution: clipped to the resting size
+                    execute(oid, volume, None if price != price else price)  # NaN: order price
+                    counts["execute"] += 1
+            elif msg_type == MODIFY:
+                if oid not in order_map:
+                    errors["unknown_order"] += 1
+                else:
+                    fill_seq = book.fill_seq
+                    modify(oid, price, volume)
+                    if book.fill_seq != fill_seq:
+                        errors["crossed"] += 1
+                    counts["modify"] += 1
+            elif msg_type == CLEAR:
+                book.clear()
+                order_map = book.order_map
+                counts["clear"] += 1
+            else:
+                errors["unknown_type"] += 1
+        self.seconds += time.perf_counter() - started
+        self.messages += len(records)
+        self.batches += 1
+        if self.check_every and self.batches % self.check_every == 0:
+            self.inconsistencies.extend(self.check_consistency())
+        return len(records)
+
+    def replay(self, path: str, batch_size: int = 65536) -> Dict[str, Any]:
+        """Apply a whole L3 event file and return stats()."""
+        for batch in read_mbo_batches(path, batch_size):
+            self.apply(batch)
+        return self.stats()
+
+    @property
+    def msgs_per_sec(self) -> float:
+        return self.messages / self.seconds if self.seconds > 0 else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "messages": self.messages,
+            "msgs_per_sec": self.msgs_per_sec,
+            "counts": dict(self.counts),
+            "errors": dict(self.errors),
+            "resting_orders": len(self.book.order_map),
+            "inconsistencies": len(self.inconsistencies),
+        }
+
+    def check_consistency(self) -> List[str]:
+        """Problems with the book's internal invariants (empty when consistent)."""
+        return check_book_consistency(self.book)
+
+def check_book_consistency(book: OrderBook) -> List[str]:
+    """
+    Verify level volumes against their queues, order_map against the
+    levels, sorted keys and cached best levels, and that the book is not
+    crossed.
+    """
+    problems = []
+    seen = 0
+    for name, side in (("bid", book.bids), ("ask", book.asks)):
+        problems.extend(_check_side(name, side, book.order_map))
+        seen += sum(len(level.orders) for level in side.levels.values())
+    if seen != len(book.order_map):
+        problems.append(f"order_map has {len(book.order_map)} orders, levels hold {seen}")
+    if book.bids.best and book.asks.best and book.bids.best.price >= book.asks.best.price:
+        problems.append(f"book crossed: bid {book.bids.best.price} >= ask {book.asks.best.price}")
+    return problems
+
+def _check_side(name: str, side: BookSide, order_map: Dict[int, Any]) -> List[str]:
+    problems = []
+    if sorted(side._keys) != side._keys or len(side._keys) != len(side.levels):
+        problems.append(f"{name} keys out of sync with levels")
+    expected_best = side.levels[side._key(side._keys[-1])] if side._keys else None
+    if side.best is not expected_best:
+        problems.append(f"{name} best level cache is stale")
+    for price, level in side.levels.items():
+        if not level.orders:
+            problems.append(f"{name} level {price} is empty")
+        if level.volume != sum(order.volume for order in level.orders.values()):
+            problems.append(f"{name} level {price} volume {level.volume} != queue total")
+        for oid, order in level.orders.items():
+            if order_map.get(oid) is not order:
+                problems.append(f"{name} order {oid} at {price} missing from order_map")
+            if order.price != price or order.volume <= 0:
+                problems.append(f"{name} order {oid} has price {order.price} / volume {order.volume}")
+    return problems
+
+# Example usage:
+# book = OrderBook()
+# applier = MBOApplier(book, check_every=100)
+# stats = applier.replay("data/XNAS-AAPL-20240102.mbo", batch_size=1 << 16)
+# print(f"{stats['msgs_per_sec']:,.0f} msgs/sec", stats["errors"], applier.inconsistencies[:5])
@@ -1,87 +1,290 @@
-import heapq
-import uuid
-from typing import Optional, Dict, List, Tuple
-
-class Order:
-    def __init__(self, side: str, price: float, volume: int):
-        self.id = str(uuid.uuid4())
-        self.side = side  # "BUY" or "SELL"
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Optional, Dict, List, Tuple, Callable, NamedTuple
+import numpy as np
+from hft_simulator.core.orders import Order
+
+class Fill(NamedTuple):
+    """A single trade between an incoming (aggressor) and a resting order."""
+    seq: int
+    aggressor_id: int
+    resting_id: int
+    aggressor_side: str
+    price: float
+    volume: int
+
+FILL_DTYPE = np.dtype([
+    ("seq", np.int64),
+    ("aggressor_id", np.int64),
+    ("resting_id", np.int64),
+    ("aggressor_side", np.int8),  # 1 for BUY, -1 for SELL
+    ("price", np.float64),
+    ("volume", np.int64),
+])
+
+class FillBuffer:
+    """Preallocated ring buffer holding the most recent fills."""
+    def __init__(self, capacity: int = 65536):
+        self.capacity = capacity
+        self.records = np.zeros(capacity, dtype=FILL_DTYPE)
+        self.count = 0  # Total fills ever written
+
+    def append(self, fill: Fill):
+        # One tuple assignment is several times faster than per-field writes
+        self.records[self.count % self.capacity] = (
+            fill.seq, fill.aggressor_id, fill.resting_id,
+            1 if fill.aggressor_side == "BUY" else -1, fill.price, fill.volume
+        )
+        self.count += 1
+
+    def since(self, seq: int) -> np.ndarray:
+        """Return a copy of the retained fills with sequence number >= seq, oldest first."""
+        # Fill sequence numbers start at 1, so fill `seq` was written at position seq - 1
+        start = max(seq - 1, self.count - self.capacity, 0)
+        if start >= self.count:
+            return self.records[:0].copy()
+        idx = np.arange(start, self.count) % self.capacity
+        return self.records[idx]
+
+    def latest(self, n: int) -> np.ndarray:
+        """Return a copy of the last n retained fills, oldest first."""
+        return self.since(self.count - n + 1)
+
+class PriceLevel:
+    """FIFO queue of resting orders at a single price."""
+    def __init__(self, price: float):
         self.price = price
-        self.volume = volume
+        self.volume = 0  # Aggregate resting volume
+        self.orders: "OrderedDict[int, Order]" = OrderedDict()
 
-class OrderBook:
-    def __init__(self):
-        # Max-heap for bids (invert price for heapq)
-        self.bids: List[Tuple[float, str, Order]] = []
-        # Min-heap for asks
-        self.asks: List[Tuple[float, str, Order]] = []
-        # Order lookup for cancel/modify
-        self.order_map: Dict[str, Tuple[str, float, Order]] = {}
-
-    def add_order(self, side: str, price: float, volume: int) -> str:
-        order = Order(side, price, volume)
-        if side == "BUY":
-            heapq.heappush(self.bids, (-price, order.id, order))
+    def append(self, order: Order):
+        self.orders[order.id] = order
+        self.volume += order.volume
+
+    def remove(self, order: Order):
+        del self.orders[order.id]
+        self.volume -= order.volume
+
+    def head(self) -> Order:
+        return next(iter(self.orders.values()))
+
+class BookSide:
+    """Price levels for one side of the book, with a cached best level."""
+    def __init__(self, is_bid: bool):
+        self.is_bid = is_bid
+        self.levels: Dict[float, PriceLevel] = {}
+        # Sort keys in ascending order with the best price last
+        # (price for bids, -price for asks), so the top of book pops in O(1)
+        self._keys: List[float] = []
+        self.best: Optional[PriceLevel] = None
+
+    def _key(self, price: float) -> float:
+        return price if self.is_bid else -price
+
+    def add(self, order: Order):
+        level = self.levels.get(order.price)
+        if level is None:
+            level = PriceLevel(order.price)
+            self.levels[order.price] = level
+            key = self._key(order.price)
+            insort(self._keys, key)
+            if self.best is None or key > self._key(self.best.price):
+                self.best = level
+        level.append(order)
+
+    def remove(self, order: Order):
+        level = self.levels[order.price]
+        level.remove(order)
+        if not level.orders:
+            self._drop_level(level)
+
+    def reduce(self, order: Order, volume: int):
+        """Reduce an order's volume in place, keeping its queue position."""
+        order.volume -= volume
+        self.levels[order.price].volume -= volume
+
+    def _drop_level(self, level: PriceLevel):
+        del self.levels[level.price]
+        key = self._key(level.price)
+        if self._keys[-1] == key:
+            self._keys.pop()
         else:
-            heapq.heappush(self.asks, (price, order.id, order))
-        self.order_map[order.id] = (side, price, order)
+            del self._keys[bisect_left(self._keys, key)]
+        if self.best is level:
+            self.best = self.levels[self._key(self._keys[-1])] if self._keys else None
+
+    def iter_levels(self):
+        """Iterate price levels from best to worst."""
+        for key in reversed(self._keys):
+            yield self.levels[self._key(key)]
+
+    def depth(self, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Prices and aggregate volumes of the top n levels, best first."""
+        keys = self._keys[:-n - 1:-1] if n > 0 else []
+        prices = np.array(keys, dtype=np.float64)
+        if not self.is_bid:
+            prices = -prices
+        levels = self.levels
+        volumes = np.fromiter((levels[p].volume for p in prices.tolist()), dtype=np.int64, count=len(keys))
+        return prices, volumes
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+class OrderBook:
+    def __init__(self, fill_capacity: int = 65536):
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        # Resting order lookup for O(1) cancel/modify
+        self.order_map: Dict[int, Order] = {}
+        self.fills = FillBuffer(fill_capacity)
+        self.fill_seq = 0
+        self._order_seq = 0
+        self._subscribers: List[Callable[[Fill], None]] = []
+
+    def subscribe(self, callback: Callable[[Fill], None]):
+        """Register a callback invoked with every Fill produced by matching."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Fill], None]):
+        self._subscribers.remove(callback)
+
+    def _book_side(self, side: str) -> BookSide:
+        return self.bids if side == "BUY" else self.asks
+
+    def add_order(self, side: str, price: float, volume: int, order_id: Optional[int] = None) -> int:
+        """
+        Add a limit order and match. order_id lets a feed use its own ids;
+        it must not collide with an order already resting in the book.
+        """
+        if volume <= 0:
+            raise ValueError(f"Order volume must be positive: {volume}")
+        order = Order(side, price, volume, order_id=order_id)
+        self._order_seq += 1
+        order.seq = self._order_seq
+        self._book_side(side).add(order)
+        self.order_map[order.id] = order
         self.match_orders()
         return order.id
 
-    def cancel_order(self, order_id: str) -> bool:
-        if order_id not in self.order_map:
+    def cancel_order(self, order_id: int) -> bool:
+        order = self.order_map.pop(order_id, None)
+        if order is None:
             return False
-        side, price, order = self.order_map.pop(order_id)
-        # Mark order as cancelled (lazy deletion)
-        order.volume = 0
+        self._book_side(order.side).remove(order)
         return True
 
-    def modify_order(self, order_id: str, new_price: float, new_volume: int) -> bool:
-        if order_id not in self.order_map:
+    def modify_order(self, order_id: int, new_price: float, new_volume: int) -> bool:
+        """
+        Modify a resting order. A volume reduction at the same price keeps
+        queue priority; any other change moves the order to the back of the
+        queue at its new price. A non-positive volume cancels the order.
+        """
+        order = self.order_map.get(order_id)
+        if order is None:
             return False
-        side, _, order = self.order_map[order_id]
-        self.cancel_order(order_id)
-        self.add_order(side, new_price, new_volume)
+        if new_volume <= 0:
+            return self.cancel_order(order_id)
+        book_side = self._book_side(order.side)
+        if new_price == order.price and new_volume <= order.volume:
+            book_side.reduce(order, order.volume - new_volume)
+            return True
+        book_side.remove(order)
+        order.price = new_price
+        order.volume = new_volume
+        self._order_seq += 1
+        order.seq = self._order_seq
+        book_side.add(order)
+        self.match_orders()
         return True
 
+    def execute_order(self, order_id: int, volume: int, price: Optional[float] = None) -> bool:
+        """
+        Execute volume of a resting order against an unseen aggressor (e.g. an
+        exchange-reported trade). Emits a Fill with aggressor_id 0 at the
+        given price, or the order price. Returns False for unknown orders.
+        """
+        order = self.order_map.get(order_id)
+        if order is None or volume <= 0:
+            return False
+        volume = min(volume, order.volume)
+        self.fill_seq += 1
+        fill = Fill(
+            self.fill_seq, 0, order.id, "SELL" if order.side == "BUY" else "BUY",
+            order.price if price is None else price, volume
+        )
+        self.fills.append(fill)
+        for callback in self._subscribers:
+            callback(fill)
+        self._fill(self._book_side(order.side), order, volume)
+        return True
+
+    def clear(self):
+        """Remove every resting order; fills and sequence counters are kept."""
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self.order_map.clear()
+
     def get_best_bid(self) -> Optional[Tuple[float, int]]:
-        while self.bids:
-            price, order_id, order = self.bids[0]
-            if order.volume > 0:
-                return (-price, order.volume)
-            heapq.heappop(self.bids)  # Remove cancelled/filled
-        return None
+        """Best bid price and aggregate volume resting at that price."""
+        best = self.bids.best
+        return (best.price, best.volume) if best else None
 
     def get_best_ask(self) -> Optional[Tuple[float, int]]:
-        while self.asks:
-            price, order_id, order = self.asks[0]
-            if order.volume > 0:
-                return (price, order.volume)
-            heapq.heappop(self.asks)  # Remove cancelled/filled
-        return None
-
-    def match_orders(self):
-        # Simple price-time priority matching
-        while self.bids and self.asks:
-            best_bid = self.bids[0][2]
-            best_ask = self.asks[0][2]
-            if best_bid.volume == 0:
-                heapq.heappop(self.bids)
-                continue
-            if best_ask.volume == 0:
-                heapq.heappop(self.asks)
-                continue
-            if -self.bids[0][0] >= self.asks[0][0]:
-                trade_volume = min(best_bid.volume, best_ask.volume)
-                best_bid.volume -= trade_volume
-                best_ask.volume -= trade_volume
-                # Optionally, log or process the trade here
+        """Best ask price and aggregate volume resting at that price."""
+        best = self.asks.best
+        return (best.price, best.volume) if best else None
+
+    def depth(self, n: int) -> Dict[str, np.ndarray]:
+        """Top-n aggregated price levels per side, best first."""
+        bid_prices, bid_volumes = self.bids.depth(n)
+        ask_prices, ask_volumes = self.asks.depth(n)
+        return {
+            "bid_prices": bid_prices,
+            "bid_volumes": bid_volumes,
+            "ask_prices": ask_prices,
+            "ask_volumes": ask_volumes,
+        }
+
+    def match_orders(self) -> int:
+        """
+        Price-time priority matching: cross the head orders of the best levels.
+        The later-arriving order is the aggressor and trades at the resting
+        order's price. Returns the number of fills produced.
+        """
+        bids, asks = self.bids, self.asks
+        fills = 0
+        while bids.best and asks.best and bids.best.price >= asks.best.price:
+            best_bid = bids.best.head()
+            best_ask = asks.best.head()
+            trade_volume = min(best_bid.volume, best_ask.volume)
+            if best_bid.seq > best_ask.seq:
+                aggressor, resting = best_bid, best_ask
             else:
-                break
+                aggressor, resting = best_ask, best_bid
+            self._emit_fill(aggressor, resting, trade_volume)
+            self._fill(bids, best_bid, trade_volume)
+            self._fill(asks, best_ask, trade_volume)
+            fills += 1
+        return fills
+
+    def _emit_fill(self, aggressor: Order, resting: Order, volume: int):
+        self.fill_seq += 1
+        fill = Fill(self.fill_seq, aggressor.id, resting.id, aggressor.side, resting.price, volume)
+        self.fills.append(fill)
+        for callback in self._subscribers:
+            callback(fill)
+
+    def _fill(self, book_side: BookSide, order: Order, volume: int):
+        if volume >= order.volume:
+            book_side.remove(order)
+            del self.order_map[order.id]
+        else:
+            book_side.reduce(order, volume)
 
 # Example usage:
 # ob = OrderBook()
 # ob.add_order("BUY", 100.0, 10)
 # ob.add_order("SELL", 99.5, 5)
 # print(ob.get_best_bid())
-# print(ob.get_best_ask())
\ No newline at end of file
+# print(ob.get_best_ask())
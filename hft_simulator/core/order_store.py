@@ -0,0 +1,140 @@
+from typing import Any, Dict, List, Optional
+import numpy as np
+
+ARCHIVE_DTYPES = {
+    "id": np.int64,
+    "symbol": np.int32,   # Code into OrderArchive.symbols
+    "side": np.int8,      # 1 for BUY, -1 for SELL
+    "price": np.float64,
+    "volume": np.int64,
+    "filled": np.int64,
+    "avg_price": np.float64,
+    "status": np.int8,    # Code into OrderArchive.statuses
+    "time": np.float64,   # When the order became terminal
+}
+
+class OrderArchive:
+    """
+    Append-only columnar store for terminal orders. Columns grow by doubling,
+    so appends are amortized O(1) and each order costs a fixed ~60 bytes,
+    plus an id -> row dict entry used for O(1) lookups by id.
+    """
+    def __init__(self, capacity: int = 4096):
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in ARCHIVE_DTYPES.items()}
+        self.size = 0
+        self.symbols: List[Optional[str]] = []
+        self._symbol_codes: Dict[Optional[str], int] = {}
+        self.statuses: List[str] = []
+        self._status_codes: Dict[str, int] = {}
+        self._rows: Dict[int, int] = {}  # id -> row for the first _indexed rows
+        self._indexed = 0
+
+    def append(self, order: Any, when: float):
+        if self.size == len(self.columns["id"]):
+            for name, column in self.columns.items():
+                grown = np.zeros(2 * len(column), dtype=column.dtype)
+                grown[:self.size] = column
+                self.columns[name] = grown
+        i = self.size
+        cols = self.columns
+        cols["id"][i] = order.id
+        cols["symbol"][i] = self._code(self._symbol_codes, self.symbols, order.symbol)
+        cols["side"][i] = 1 if order.side == "BUY" else -1
+        cols["price"][i] = order.price
+        cols["volume"][i] = order.volume
+        cols["filled"][i] = getattr(order, "filled", 0)
+        cols["avg_price"][i] = getattr(order, "avg_price", 0.0)
+        cols["status"][i] = self._code(self._status_codes, self.statuses, order.status)
+        cols["time"][i] = when
+        self.size += 1
+
+    @staticmethod
+    def _code(codes: Dict, values: List, value) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(value)
+        return code
+
+    def column(self, name: str) -> np.ndarray:
+        """View of the filled part of a column."""
+        return self.columns[name][:self.size]
+
+    def find(self, order_id: int) -> Optional[int]:
+        """Row index of an archived order, or None."""
+        if self._indexed < self.size:
+            # Index rows appended (or loaded column-wise) since the last lookup
+            start = self._indexed
+            self._rows.update(zip(self.columns["id"][start:self.size].tolist(), range(start, self.size)))
+            self._indexed = self.size
+        return self._rows.get(order_id)
+
+    def record(self, row: int) -> Dict[str, Any]:
+        cols = self.columns
+        return {
+            "id": int(cols["id"][row]),
+            "symbol": self.symbols[cols["symbol"][row]],
+            "side": "BUY" if cols["side"][row] > 0 else "SELL",
+            "price": float(cols["price"][row]),
+            "volume": int(cols["volume"][row]),
+            "filled": int(cols["filled"][row]),
+            "avg_price": float(cols["avg_price"][row]),
+            "status": self.statuses[cols["status"][row]],
+            "time": float(cols["time"][row]),
+        }
+
+    def get(self, order_id: int) -> Optional[Dict[str, Any]]:
+        row = self.find(order_id)
+        return self.record(row) if row is not None else None
+
+    def between(self, start: float, end: float) -> Dict[str, np.ndarray]:
+        """Columns for orders archived in [start, end). Rows are in archival (time) order."""
+        times = self.column("time")
+        lo, hi = np.searchsorted(times, start), np.searchsorted(times, end)
+        return {name: self.columns[name][lo:hi] for name in self.columns}
+
+    def save(self, path: str):
+        """Write the archive to an .npz file."""
+        np.savez(
+            path,
+            symbols=np.array(self.symbols, dtype=object),
+            statuses=np.array(self.statuses, dtype=object),
+            **{name: self.column(name) for name in self.columns}
+        )
+
+    def __len__(self) -> int:
+        return self.size
+
+class OrderStore:
+    """Live orders in a dict; terminal orders moved to an OrderArchive."""
+    def __init__(self, archive: Optional[OrderArchive] = None):
+        self.live: Dict[int, Any] = {}
+        self.archive = archive if archive is not None else OrderArchive()
+
+    def add(self, order: Any):
+        self.live[order.id] = order
+
+    def retire(self, order: Any, when: float):
+        """Move a terminal order out of the hot dict into the archive."""
+        if self.live.pop(order.id, None) is not None:
+            self.archive.append(order, when)
+
+    def get_status(self, order_id: int) -> Optional[str]:
+        order = self.live.get(order_id)
+        if order is not None:
+            return order.status
+        row = self.archive.find(order_id)
+        return self.archive.statuses[self.archive.columns["status"][row]] if row is not None else None
+
+    def __contains__(self, order_id: int) -> bool:
+        return order_id in self.live or self.archive.find(order_id) is not None
+
+    def __len__(self) -> int:
+        return len(self.live)
+
+# Example usage:
+# store = OrderStore()
+# store.add(order)
+# store.retire(order, when=time.time())  # once FILLED/CANCELLED/REJECTED
+# store.archive.get(order.id)
+# store.archive.between(t0, t1)["avg_price"]
@@ -0,0 +1,70 @@
+import itertools
+import uuid
+from typing import Dict, Optional
+
+# Process-wide, monotonically increasing 64-bit order ids
+_order_ids = itertools.count(1)
+
+def next_order_id() -> int:
+    """Allocate the next integer order id."""
+    return next(_order_ids)
+
+def reserve_order_ids(last_id: int):
+    """Make sure ids allocated from now on are greater than last_id (e.g. after restoring a snapshot)."""
+    global _order_ids
+    upcoming = next(_order_ids)
+    _order_ids = itertools.count(max(upcoming, last_id + 1))
+
+class Order:
+    """Compact order shared by the order book and the execution engine."""
+    __slots__ = ("id", "symbol", "side", "price", "volume", "status", "seq")
+
+    def __init__(self, side: str, price: float, volume: int, symbol: Optional[str] = None, order_id: Optional[int] = None):
+        # Feeds that carry their own ids (e.g. market-by-order) pass them in
+        self.id = next_order_id() if order_id is None else order_id
+        self.symbol = symbol
+        self.side = side  # "BUY" or "SELL"
+        self.price = price
+        self.volume = volume
+        self.status: Optional[str] = None
+        self.seq = 0  # Arrival sequence, assigned by the book for time priority
+
+    def __repr__(self) -> str:
+        return f"Order(id={self.id}, symbol={self.symbol}, side={self.side}, price={self.price}, volume={self.volume})"
+
+class OrderIdMap:
+    """
+    Optional two-way mapping between integer order ids and external string ids,
+    for interfaces (gateways, reports) that need globally unique string ids.
+    """
+    def __init__(self):
+        self._external: Dict[int, str] = {}
+        self._internal: Dict[str, int] = {}
+
+    def register(self, order_id: int, external_id: str):
+        self._external[order_id] = external_id
+        self._internal[external_id] = order_id
+
+    def external_id(self, order_id: int) -> str:
+        """Return the string id for an order, generating a UUID on first use."""
+        external_id = self._external.get(order_id)
+        if external_id is None:
+            external_id = str(uuid.uuid4())
+            self.register(order_id, external_id)
+        return external_id
+
+    def internal_id(self, external_id: str) -> Optional[int]:
+        return self._internal.get(external_id)
+
+    def discard(self, order_id: int):
+        external_id = self._external.pop(order_id, None)
+        if external_id is not None:
+            del self._internal[external_id]
+
+    def __len__(self) -> int:
+        return len(self._external)
+
+# Example usage:
+# order = Order("BUY", 100.0, 10, symbol="AAPL")
+# ids = OrderIdMap()
+# ids.external_id(order.id)  # e.g. "1b4e28ba-2fa1-11d2-883f-0016d3cca427"
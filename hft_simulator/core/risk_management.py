@@ -1,4 +1,8 @@
-from typing import Dict, Callable
+import queue
+import threading
+import time
+from typing import Any, Dict, Callable, List, Optional, Sequence, Tuple
+import numpy as np
 
 class RiskLimits:
     def __init__(self, max_position: int, max_order_size: int, stop_loss: float):
@@ -6,24 +10,103 @@ class RiskLimits:
         self.max_order_size = max_order_size
         self.stop_loss = stop_loss  # e.g., -1000.0 for max loss
 
+class AlertDispatcher:
+    """
+    Delivers alerts from a background thread so raising one never blocks the
+    caller. Alerts are queued unformatted; repeats of the same key within
+    min_interval seconds are coalesced into one summary line.
+    """
+    def __init__(self, callback: Callable[[str], None], min_interval: float = 1.0):
+        self.callback = callback
+        self.min_interval = min_interval
+        self._queue: "queue.SimpleQueue[Optional[Tuple[str, str, tuple]]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="risk-alerts", daemon=True)
+        self._thread.start()
+
+    def alert(self, key: str, template: str, *args: Any):
+        """Queue an alert; template.format(*args) is only evaluated on the consumer thread."""
+        self._queue.put((key, template, args))
+
+    def close(self):
+        """Deliver everything still queued (including suppressed counts) and stop."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        last_sent: Dict[str, float] = {}
+        suppressed: Dict[str, Tuple[int, str, tuple]] = {}
+        # Without rate limiting nothing is ever suppressed, so block until the next alert
+        timeout = self.min_interval if self.min_interval > 0 else None
+        while True:
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()
+            now = time.monotonic()
+            if item:
+                key, template, args = item
+                if now - last_sent.get(key, -np.inf) >= self.min_interval:
+                    last_sent[key] = now
+                    self._send(template.format(*args))
+                else:
+                    count = suppressed.get(key, (0,))[0]
+                    suppressed[key] = (count + 1, template, args)
+            for key, (count, template, args) in list(suppressed.items()):
+                if item is None or now - last_sent[key] >= self.min_interval:
+                    del suppressed[key]
+                    last_sent[key] = now
+                    self._send(f"{template.format(*args)} (repeated {count}x)")
+            if item is None:
+                return
+
+    def _send(self, message: str):
+        try:
+            self.callback(message)
+        except Exception:
+            pass  # A failing alert sink must not kill the consumer
+
 class RiskManager:
-    def __init__(self, limits: RiskLimits, alert_callback: Callable[[str], None]):
+    def __init__(
+        self,
+        limits: RiskLimits,
+        alert_callback: Callable[[str], None],
+        alert_dispatcher: Optional[AlertDispatcher] = None
+    ):
         self.limits = limits
         self.positions: Dict[str, int] = {}  # symbol -> position size
         self.pnl: float = 0.0
         self.alert_callback = alert_callback
+        # Optional background dispatcher; alerts are synchronous without one
+        self.alert_dispatcher = alert_dispatcher
 
     def check_order(self, symbol: str, side: str, volume: int) -> bool:
         """Validate order against risk limits."""
+        # Fast path: one lookup and chained comparisons against the current
+        # position and limits (nothing cached, so direct edits are honored)
+        limits = self.limits
+        pos = self.positions.get(symbol, 0)
+        new_position = pos + volume if side == "BUY" else pos - volume
+        if 0 < volume <= limits.max_order_size and -limits.max_position <= new_position <= limits.max_position:
+            return True
+        return self._reject_order(symbol, side, volume)
+
+    def _reject_order(self, symbol: str, side: str, volume: int) -> bool:
+        """Slow path: work out which limit failed and raise the alert."""
         new_position = self.positions.get(symbol, 0) + (volume if side == "BUY" else -volume)
         if abs(new_position) > self.limits.max_position:
-            self.alert_callback(f"Position limit breached for {symbol}: {new_position}")
+            self._alert(f"position:{symbol}", "Position limit breached for {}: {}", symbol, new_position)
             return False
         if volume > self.limits.max_order_size:
-            self.alert_callback(f"Order size limit breached: {volume}")
+            self._alert("order_size", "Order size limit breached: {}", volume)
             return False
         return True
 
+    def _alert(self, key: str, template: str, *args: Any):
+        if self.alert_dispatcher is not None:
+            self.alert_dispatcher.alert(key, template, *args)
+        else:
+            self.alert_callback(template.format(*args))
+
     def update_position(self, symbol: str, side: str, volume: int, price: float):
         """Update position and PnL after order execution."""
         pos = self.positions.get(symbol, 0)
@@ -37,7 +120,7 @@ class RiskManager:
 
     def _check_stop_loss(self):
         if self.pnl < self.limits.stop_loss:
-            self.alert_callback(f"Stop-loss triggered! PnL: {self.pnl}")
+            self._alert("stop_loss", "Stop-loss triggered! PnL: {}", self.pnl)
 
     def get_position(self, symbol: str) -> int:
         return self.positions.get(symbol, 0)
@@ -45,8 +128,164 @@ class RiskManager:
     def get_pnl(self) -> float:
         return self.pnl
 
+class PortfolioRiskManager:
+    """
+    Multi-symbol risk engine with per-symbol state in NumPy arrays indexed by
+    symbol id: positions, average cost, realized/unrealized PnL and limits.
+    Orders are validated in vectorized batches and the whole book is marked
+    to market in one step.
+    """
+    def __init__(self, symbols: Sequence[str], limits: RiskLimits, alert_callback: Callable[[str], None]):
+        self.limits = limits
+        self.alert_callback = alert_callback
+        self.symbols: List[str] = []
+        self.symbol_ids: Dict[str, int] = {}
+        n = len(symbols)
+        self.positions = np.zeros(n, dtype=np.int64)
+        self.avg_cost = np.zeros(n)
+        self.realized = np.zeros(n)
+        self.unrealized = np.zeros(n)
+        self.marks = np.full(n, np.nan)
+        self.max_position = np.full(n, limits.max_position, dtype=np.int64)
+        self.max_order_size = np.full(n, limits.max_order_size, dtype=np.int64)
+        self.stopped = False
+        for symbol in symbols:
+            self.symbol_ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+
+    def add_symbol(self, symbol: str) -> int:
+        """Register a symbol with the default limits and return its id."""
+        if symbol in self.symbol_ids:
+            return self.symbol_ids[symbol]
+        sid = len(self.symbols)
+        self.symbols.append(symbol)
+        self.symbol_ids[symbol] = sid
+        self.positions = np.append(self.positions, 0)
+        self.avg_cost = np.append(self.avg_cost, 0.0)
+        self.realized = np.append(self.realized, 0.0)
+        self.unrealized = np.append(self.unrealized, 0.0)
+        self.marks = np.append(self.marks, np.nan)
+        self.max_position = np.append(self.max_position, self.limits.max_position)
+        self.max_order_size = np.append(self.max_order_size, self.limits.max_order_size)
+        return sid
+
+    def set_limits(self, symbol: str, max_position: Optional[int] = None, max_order_size: Optional[int] = None):
+        sid = self.symbol_ids[symbol]
+        if max_position is not None:
+            self.max_position[sid] = max_position
+        if max_order_size is not None:
+            self.max_order_size[sid] = max_order_size
+
+    def check_orders(self, symbol_ids: np.ndarray, sides: np.ndarray, volumes: np.ndarray) -> np.ndarray:
+        """
+        Validate a batch of orders (sides +1 BUY / -1 SELL). Orders for the
+        same symbol are checked cumulatively in batch order, as if every
+        earlier accepted order in the batch fills. Returns a boolean
+        acceptance mask.
+        """
+        symbol_ids = np.asarray(symbol_ids, dtype=np.intp)
+        volumes = np.asarray(volumes, dtype=np.int64)
+        deltas = np.asarray(sides, dtype=np.int64) * volumes
+        if self.stopped:
+            return np.zeros(len(deltas), dtype=bool)
+        # Oversized orders never fill, so they add nothing to the running exposure
+        size_ok = volumes <= self.max_order_size[symbol_ids]
+        deltas = np.where(size_ok, deltas, 0)
+        # Running per-symbol exposure within the batch
+        order = np.argsort(symbol_ids, kind="stable")
+        running = np.cumsum(deltas[order])
+        starts = np.flatnonzero(np.diff(symbol_ids[order], prepend=-1))
+        before = np.append(0, running)[starts]  # Batch total preceding each symbol group
+        exposure = np.empty_like(deltas)
+        exposure[order] = running - np.repeat(before, np.diff(np.append(starts, len(order))))
+        new_positions = self.positions[symbol_ids] + exposure
+        accepted = size_ok & (np.abs(new_positions) <= self.max_position[symbol_ids])
+        breached = size_ok & ~accepted
+        if breached.any():
+            # A position rejection also drops out of the running sum, so redo
+            # those symbols one order at a time
+            for sid in np.unique(symbol_ids[breached]).tolist():
+                idx = np.flatnonzero(symbol_ids == sid)
+                pos, limit = int(self.positions[sid]), int(self.max_position[sid])
+                for i, ok, delta in zip(idx.tolist(), size_ok[idx].tolist(), deltas[idx].tolist()):
+                    accepted[i] = ok and abs(pos + delta) <= limit
+                    if accepted[i]:
+                        pos += delta
+        if not accepted.all():
+            rejected = np.unique(symbol_ids[~accepted])
+            self.alert_callback(
+                f"{int((~accepted).sum())} orders rejected by risk limits for "
+                f"{', '.join(self.symbols[i] for i in rejected[:10])}"
+            )
+        return accepted
+
+    def check_order(self, symbol: str, side: str, volume: int) -> bool:
+        """Single-order check with the same rules as check_orders."""
+        sid = self.symbol_ids[symbol]
+        new_position = int(self.positions[sid]) + (volume if side == "BUY" else -volume)
+        if self.stopped:
+            return False
+        if abs(new_position) > self.max_position[sid]:
+            self.alert_callback(f"Position limit breached for {symbol}: {new_position}")
+            return False
+        if volume > self.max_order_size[sid]:
+            self.alert_callback(f"Order size limit breached: {volume}")
+            return False
+        return True
+
+    def update_position(self, symbol: str, side: str, volume: int, price: float):
+        """Apply a fill: update position, average cost and realized PnL."""
+        sid = self.symbol_ids[symbol]
+        pos = int(self.positions[sid])
+        delta = volume if side == "BUY" else -volume
+        if pos == 0 or (pos > 0) == (delta > 0):
+            # Opening or adding: blend the average cost
+            self.avg_cost[sid] = (self.avg_cost[sid] * abs(pos) + price * volume) / (abs(pos) + volume)
+        else:
+            closed = min(volume, abs(pos))
+            self.realized[sid] += closed * (price - self.avg_cost[sid]) * (1 if pos > 0 else -1)
+            if volume > abs(pos):
+                self.avg_cost[sid] = price  # Flipped through flat
+            elif volume == abs(pos):
+                self.avg_cost[sid] = 0.0
+        self.positions[sid] = pos + delta
+        if not np.isnan(self.marks[sid]):
+            self.unrealized[sid] = self.positions[sid] * (self.marks[sid] - self.avg_cost[sid])
+
+    def mark(self, prices: np.ndarray):
+        """Revalue every position at the given prices (NaN keeps the previous mark)."""
+        prices = np.asarray(prices, dtype=np.float64)
+        self.marks = np.where(np.isnan(prices), self.marks, prices)
+        marked = ~np.isnan(self.marks)
+        self.unrealized = np.where(marked, self.positions * (self.marks - self.avg_cost), 0.0)
+        self._check_stop_loss()
+
+    def get_pnl(self) -> float:
+        """Total marked-to-market PnL."""
+        return float(self.realized.sum() + self.unrealized.sum())
+
+    def get_position(self, symbol: str) -> int:
+        sid = self.symbol_ids.get(symbol)
+        return int(self.positions[sid]) if sid is not None else 0
+
+    def _check_stop_loss(self):
+        pnl = self.get_pnl()
+        if not self.stopped and pnl < self.limits.stop_loss:
+            self.stopped = True  # Block new orders until reset
+            self.alert_callback(f"Stop-loss triggered! PnL: {pnl}")
+
+    def reset_stop(self):
+        self.stopped = False
+
 # Example usage:
 # def alert(msg): print("ALERT:", msg)
 # limits = RiskLimits(max_position=100, max_order_size=50, stop_loss=-1000.0)
 # risk = RiskManager(limits, alert)
-# if risk.check_order("AAPL", "BUY", 60):
\ No newline at end of file
+# if risk.check_order("AAPL", "BUY", 60):
+#
+# Non-blocking, rate-limited alerts:
+# risk = RiskManager(limits, alert, alert_dispatcher=AlertDispatcher(alert, min_interval=1.0))
+#
+# book = PortfolioRiskManager(["AAPL", "MSFT"], limits, alert)
+# ok = book.check_orders(np.array([0, 1]), np.array([1, -1]), np.array([10, 20]))
+# book.mark(np.array([150.0, 310.0]))
\ No newline at end of file
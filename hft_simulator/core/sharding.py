@@ -0,0 +1,432 @@
+import multiprocessing as mp
+import queue
+import time
+import traceback
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import numpy as np
+from hft_simulator.core.execution import ExecutionEngine, OrderStatus
+from hft_simulator.core.order_book import OrderBook
+from hft_simulator.core.risk_management import PortfolioRiskManager, RiskLimits, RiskManager
+from hft_simulator.core.strategy import MACrossoverStrategy, StrategyConfig
+from hft_simulator.core.tick_store import TickColumns
+
+# Ticks as sent to shards; symbol is an index into ShardedSimulation.symbols
+TICK_DTYPE = np.dtype([
+    ("timestamp", np.int64),
+    ("symbol", np.int32),
+    ("side", np.int8),      # 1 for BUY, -1 for SELL
+    ("price", np.float64),
+    ("volume", np.int64),
+])
+
+# Strategy fills reported back to the aggregator
+SHARD_FILL_DTYPE = np.dtype([
+    ("timestamp", np.int64),
+    ("symbol", np.int32),
+    ("side", np.int8),
+    ("price", np.float64),
+    ("volume", np.int64),
+])
+
+_HEAD, _TAIL, _CLOSED = 0, 1, 2
+_HEADER_BYTES = 64
+
+class ShmRingBuffer:
+    """
+    Single-producer, single-consumer ring of fixed-size records in shared
+    memory. The header holds monotonically increasing write (head) and read
+    (tail) counters; each side only writes its own counter, and only after
+    the records it covers have been copied, so no lock is needed.
+    """
+    def __init__(self, capacity: int, dtype: np.dtype = TICK_DTYPE, name: Optional[str] = None):
+        self.capacity = capacity
+        self.dtype = np.dtype(dtype)
+        size = _HEADER_BYTES + capacity * self.dtype.itemsize
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            # Worker processes share the creator's resource tracker, so attaching
+            # does not hand cleanup to them; the owner unlinks in release()
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.header = np.ndarray(3, dtype=np.int64, buffer=self.shm.buf)
+        self.records = np.ndarray(capacity, dtype=self.dtype, buffer=self.shm.buf, offset=_HEADER_BYTES)
+        if self.owner:
+            self.header[:] = 0
+
+    def __len__(self) -> int:
+        return int(self.header[_HEAD] - self.header[_TAIL])
+
+    def write(self, records: np.ndarray) -> int:
+        """Copy as many records as fit; returns how many were written."""
+        head = int(self.header[_HEAD])
+        n = min(len(records), self.capacity - (head - int(self.header[_TAIL])))
+        if n <= 0:
+            return 0
+        start = head % self.capacity
+        first = min(n, self.capacity - start)
+        self.records[start:start + first] = records[:first]
+        self.records[:n - first] = records[first:n]
+        self.header[_HEAD] = head + n  # Publish after the copy
+        return n
+
+    def read(self, max_records: int) -> np.ndarray:
+        """Copy out up to max_records pending records."""
+        tail = int(self.header[_TAIL])
+        n = min(int(self.header[_HEAD]) - tail, max_records)
+        if n <= 0:
+            return self.records[:0].copy()
+        start = tail % self.capacity
+        first = min(n, self.capacity - start)
+        out = np.empty(n, dtype=self.dtype)
+        out[:first] = self.records[start:start + first]
+        out[first:] = self.records[:n - first]
+        self.header[_TAIL] = tail + n  # Free the slots after the copy
+        return out
+
+    def close_writer(self):
+        """Tell the consumer no more records will be written."""
+        self.header[_CLOSED] = 1
+
+    @property
+    def finished(self) -> bool:
+        """Writer closed and everything read."""
+        return bool(self.header[_CLOSED]) and len(self) == 0
+
+    def release(self):
+        del self.header, self.records
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+def default_strategy_factory(symbol: str) -> MACrossoverStrategy:
+    return MACrossoverStrategy(StrategyConfig())
+
+class ShardRunner:
+    """
+    Books, strategies, execution and per-symbol risk for one shard's
+    symbols. Each tick rests in its symbol's book as a limit order (as in
+    make_symbol_dispatcher), then the symbol's strategy may trade
+    order_volume at the tick price, immediate-or-cancel, flipping position
+    the way Backtester.run does.
+    """
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        symbol_ids: Sequence[int],
+        limits: RiskLimits,
+        strategy_factory: Callable[[str], Any] = default_strategy_factory,
+        order_volume: int = 1,
+        alert_callback: Callable[[str], None] = lambda msg: None
+    ):
+        self.names = dict(zip(symbol_ids, symbols))
+        self.ids = dict(zip(symbols, symbol_ids))
+        self.books = {symbol: OrderBook() for symbol in symbols}
+        self.strategies = {symbol: strategy_factory(symbol) for symbol in symbols}
+        self.order_volume = order_volume
+        self.engine = ExecutionEngine(self._execute, latency=0.0)
+        # Symbols live on exactly one shard, so per-symbol limits are checked here
+        self.risk = RiskManager(limits, alert_callback)
+        self.ticks = 0
+        self._fills: List[tuple] = []
+
+    def _execute(self, order) -> Dict[str, Any]:
+        book = self.books[order.symbol]
+        first = book.fill_seq + 1
+        order_id = book.add_order(order.side, order.price, order.volume)
+        fills = book.fills.since(first)
+        fills = fills[fills["aggressor_id"] == order_id]
+        if order_id in book.order_map:
+            book.cancel_order(order_id)  # Immediate-or-cancel
+        filled = int(fills["volume"].sum())
+        if filled == 0:
+            return {"status": OrderStatus.CANCELLED}
+        price = float((fills["price"] * fills["volume"]).sum() / filled)
+        status = OrderStatus.FILLED if filled == order.volume else OrderStatus.PARTIALLY_FILLED
+        return {"status": status, "filled_volume": filled, "price": price}
+
+    def process(self, ticks: np.ndarray, halted: bool = False) -> np.ndarray:
+        """Apply a batch of ticks; returns the strategy fills it produced."""
+        volume = self.order_volume
+        for ts, sid, side, price, size in zip(
+            ticks["timestamp"].tolist(), ticks["symbol"].tolist(), ticks["side"].tolist(),
+            ticks["price"].tolist(), ticks["volume"].tolist()
+        ):
+            symbol = self.names.get(sid)
+            if symbol is None:
+                continue
+            self.ticks += 1
+            if size > 0:
+                self.books[symbol].add_order("BUY" if side > 0 else "SELL", price, size)
+            signal = self.strategies[symbol].on_tick(price)
+            if halted or signal == "HOLD":
+                continue
+            position = self.risk.get_position(symbol)
+            if (signal == "BUY" and position > 0) or (signal == "SELL" and position < 0):
+                continue
+            if not self.risk.check_order(symbol, signal, volume):
+                continue
+            # create + deliver rather than send_order, which returns only the id
+            order = self.engine.create_order(symbol, signal, price, volume)
+            self.engine.deliver_order(order)
+            if order.filled:
+                self.risk.update_position(symbol, signal, order.filled, order.avg_price)
+                self._fills.append((ts, sid, 1 if signal == "BUY" else -1, order.avg_price, order.filled))
+            if order.status == OrderStatus.PARTIALLY_FILLED:
+                self.engine.cancel_order(order.id)
+        fills = np.array(self._fills, dtype=SHARD_FILL_DTYPE)
+        self._fills.clear()
+        return fills
+
+def _shard_main(
+    shard_id: int,
+    symbols: List[str],
+    symbol_ids: List[int],
+    ring_name: str,
+    capacity: int,
+    limits: RiskLimits,
+    strategy_factory: Callable[[str], Any],
+    order_volume: int,
+    batch_size: int,
+    halted,
+    results
+):
+    ring = ShmRingBuffer(capacity, TICK_DTYPE, name=ring_name)
+    started = time.perf_counter()
+    try:
+        runner = ShardRunner(
+            symbols, symbol_ids, limits, strategy_factory, order_volume,
+            alert_callback=lambda msg: results.put(("alert", shard_id, msg))
+        )
+        while True:
+            ticks = ring.read(batch_size)
+            if len(ticks) == 0:
+                if ring.finished:
+                    break
+                time.sleep(0.0001)
+                continue
+            fills = runner.process(ticks, halted=bool(halted.value))
+            if len(fills):
+                results.put(("fills", shard_id, fills))
+        positions = {symbol: runner.risk.get_position(symbol) for symbol in symbols}
+        results.put(("done", shard_id, {
+            "ticks": runner.ticks, "positions": positions, "seconds": time.perf_counter() - started
+        }))
+    except Exception:
+        results.put(("error", shard_id, traceback.format_exc()))  # Re-raised by the parent
+    finally:
+        ring.release()
+
+class ShardedSimulation:
+    """
+    Runs independent symbols on n_shards worker processes. Symbol i goes to
+    shard i % n_shards. The parent publishes ticks into one shared-memory
+    ring per shard; workers run a ShardRunner and send their fills back
+    over a queue. The parent aggregates fills into a PortfolioRiskManager
+    marked at the published prices, and when the global stop-loss
+    triggers it sets a shared halt flag that stops every shard from
+    trading.
+    """
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        limits: RiskLimits,
+        n_shards: Optional[int] = None,
+        strategy_factory: Callable[[str], Any] = default_strategy_factory,
+        order_volume: int = 1,
+        alert_callback: Callable[[str], None] = lambda msg: None,
+        ring_capacity: int = 1 << 16,
+        batch_size: int = 4096,
+        context: Optional[str] = None
+    ):
+        self.symbols = list(symbols)
+        self.symbol_ids = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.n_shards = n_shards or mp.cpu_count()
+        self.limits = limits
+        self.strategy_factory = strategy_factory
+        self.order_volume = order_volume
+        self.alert_callback = alert_callback
+        self.ring_capacity = ring_capacity
+        self.batch_size = batch_size
+        self.portfolio = PortfolioRiskManager(self.symbols, limits, alert_callback)
+        self.fills: List[np.ndarray] = []
+        self.shard_stats: Dict[int, Dict[str, Any]] = {}
+        self._ctx = mp.get_context(context)
+        self._rings: List[ShmRingBuffer] = []
+        self._procs: List[Any] = []
+        self._halted = None
+        self._results = None
+
+    def shard_of(self, symbol: str) -> int:
+        return self.symbol_ids[symbol] % self.n_shards
+
+    def start(self) -> "ShardedSimulation":
+        ctx = self._ctx
+        self._halted = ctx.RawValue("b", 0)
+        self._results = ctx.Queue()
+        for shard in range(self.n_shards):
+            ids = list(range(shard, len(self.symbols), self.n_shards))
+            ring = ShmRingBuffer(self.ring_capacity, TICK_DTYPE)
+            proc = ctx.Process(
+                target=_shard_main,
+                args=(
+                    shard, [self.symbols[i] for i in ids], ids, ring.name, self.ring_capacity,
+                    self.limits, self.strategy_factory, self.order_volume, self.batch_size,
+                    self._halted, self._results
+                ),
+                name=f"hft-shard-{shard}",
+                daemon=True
+            )
+            proc.start()
+            self._rings.append(ring)
+            self._procs.append(proc)
+        return self
+
+    def __enter__(self) -> "ShardedSimulation":
+        return self.start()
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self._shutdown(time.monotonic())  # Already failing; don't wait for the shards
+
+    def encode_ticks(self, ticks: TickColumns) -> np.ndarray:
+        """TickColumns (e.g. from load_market_data(columnar=True)) as TICK_DTYPE records."""
+        codes = np.array([self.symbol_ids.get(symbol, -1) for symbol in ticks.symbols], dtype=np.int32)
+        side_codes = np.array([1 if side == "BUY" else -1 if side == "SELL" else 0 for side in ticks.sides], dtype=np.int8)
+        out = np.empty(len(ticks), dtype=TICK_DTYPE)
+        out["timestamp"] = ticks.timestamp
+        out["symbol"] = codes[ticks.symbol]
+        out["side"] = side_codes[ticks.side]
+        out["price"] = ticks.price
+        out["volume"] = np.where(out["side"] != 0, ticks.volume, 0)
+        return out[out["symbol"] >= 0]
+
+    def publish(self, ticks: np.ndarray):
+        """Route a time-ordered batch of TICK_DTYPE records to the shards."""
+        shards = ticks["symbol"] % self.n_shards
+        for shard, ring in enumerate(self._rings):
+            pending = ticks[shards == shard]
+            while len(pending):
+                written = ring.write(pending)
+                pending = pending[written:]
+                if len(pending):
+                    self.drain()  # Keep the result queue moving while the ring is full
+                    self._check_worker(shard)
+                    time.sleep(0.0001)
+        marks = np.full(len(self.symbols), np.nan)
+        marks[ticks["symbol"]] = ticks["price"]  # Last price per symbol in the batch
+        self.drain()
+        self.portfolio.mark(marks)
+        self._update_halt()
+
+    def drain(self, block: bool = False) -> int:
+        """Apply queued shard results to the aggregator; returns messages handled."""
+        handled = 0
+        while True:
+            try:
+                kind, shard, payload = self._results.get(block=block, timeout=0.1 if block else None)
+            except queue.Empty:
+                return handled
+            handled += 1
+            if kind == "fills":
+                self._apply_fills(payload)
+            elif kind == "alert":
+                self.alert_callback(f"[shard {shard}] {payload}")
+            elif kind == "done":
+                self.shard_stats[shard] = payload
+            elif kind == "error":
+                raise RuntimeError(f"Shard {shard} failed:\n{payload}")
+            block = False
+
+    def _check_worker(self, shard: int):
+        """Raise if a shard's process has exited without reporting its result."""
+        proc = self._procs[shard]
+        if shard in self.shard_stats or proc.is_alive():
+            return
+        self.drain()  # Picks up a result or error the shard posted before exiting
+        if shard not in self.shard_stats:
+            raise RuntimeError(f"Shard {shard} exited with code {proc.exitcode} before finishing")
+
+    def _apply_fills(self, fills: np.ndarray):
+        self.fills.append(fills)
+        for sid, side, price, volume in zip(
+            fills["symbol"].tolist(), fills["side"].tolist(), fills["price"].tolist(), fills["volume"].tolist()
+        ):
+            self.portfolio.update_position(self.symbols[sid], "BUY" if side > 0 else "SELL", volume, price)
+        self._update_halt()
+
+    def _update_halt(self):
+        if self.portfolio.stopped:
+            self._halted.value = 1
+
+    @property
+    def halted(self) -> bool:
+        return self._halted is not None and bool(self._halted.value)
+
+    def close(self, timeout: float = 60.0) -> Dict[str, Any]:
+        """
+        Finish the replay: wait for every shard and return the aggregate
+        result. Raises RuntimeError if a shard failed and TimeoutError if
+        the shards do not finish within `timeout` seconds.
+        """
+        if self._procs:
+            deadline = time.monotonic() + timeout
+            try:
+                for ring in self._rings:
+                    ring.close_writer()
+                while len(self.shard_stats) < len(self._procs):
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(f"Shards did not finish within {timeout}s")
+                    self.drain(block=True)
+                    for shard in range(len(self._procs)):
+                        self._check_worker(shard)
+            finally:
+                self._shutdown(deadline)
+        return self.summary()
+
+    def _shutdown(self, deadline: float):
+        for proc in self._procs:
+            proc.join(max(deadline - time.monotonic(), 0))
+            if proc.is_alive():
+                proc.terminate()
+        for ring in self._rings:
+            ring.release()
+        self._procs, self._rings = [], []
+
+    def summary(self) -> Dict[str, Any]:
+        fills = np.concatenate(self.fills) if self.fills else np.empty(0, dtype=SHARD_FILL_DTYPE)
+        return {
+            "ticks": sum(stats["ticks"] for stats in self.shard_stats.values()),
+            "fills": fills,
+            "positions": {symbol: self.portfolio.get_position(symbol) for symbol in self.symbols},
+            "pnl": self.portfolio.get_pnl(),
+            "halted": self.halted,
+            "shards": dict(sorted(self.shard_stats.items())),
+        }
+
+def run_sharded(
+    ticks: np.ndarray,
+    symbols: Sequence[str],
+    limits: RiskLimits,
+    n_shards: Optional[int] = None,
+    chunk_size: int = 65536,
+    **kwargs
+) -> Dict[str, Any]:
+    """Replay TICK_DTYPE records across n_shards processes and return the summary."""
+    with ShardedSimulation(symbols, limits, n_shards, **kwargs) as sim:
+        for start in range(0, len(ticks), chunk_size):
+            sim.publish(ticks[start:start + chunk_size])
+    return sim.summary()
+
+# Example usage:
+# ticks = load_market_data("sample_ticks.csv", columnar=True)
+# limits = RiskLimits(max_position=100, max_order_size=10, stop_loss=-50_000.0)
+# with ShardedSimulation(ticks.symbols, limits, n_shards=8) as sim:
+#     records = sim.encode_ticks(ticks)
+#     for start in range(0, len(records), 65536):
+#         sim.publish(records[start:start + 65536])
+# print(sim.summary()["positions"])
@@ -0,0 +1,315 @@
+import io
+import json
+import os
+import re
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+import numpy as np
+from hft_simulator.core.clock import event_time
+from hft_simulator.core.execution import ExecutionEngine, Order as ExecutionOrder
+from hft_simulator.core.order_book import FillBuffer, OrderBook
+from hft_simulator.core.order_store import OrderArchive
+from hft_simulator.core.orders import Order, reserve_order_ids
+from hft_simulator.core.risk_management import RiskManager
+from hft_simulator.core.tick_store import TickColumns
+
+# Resting orders, one row per order: bids then asks, levels best first,
+# each level in queue (time priority) order
+BOOK_ORDER_DTYPE = np.dtype([
+    ("id", np.int64),
+    ("side", np.int8),      # 1 for BUY, -1 for SELL
+    ("price", np.float64),
+    ("volume", np.int64),
+    ("seq", np.int64),
+])
+
+# Live ExecutionEngine orders; symbol and status are codes into the
+# snapshot's "symbols" and "statuses" arrays
+LIVE_ORDER_DTYPE = np.dtype([
+    ("id", np.int64),
+    ("symbol", np.int32),
+    ("side", np.int8),
+    ("price", np.float64),
+    ("volume", np.int64),
+    ("filled", np.int64),
+    ("avg_price", np.float64),
+    ("status", np.int8),
+])
+
+CHECKPOINT_PATTERN = re.compile(r"ckpt-(\d+)\.npz$")
+
+def snapshot_order_book(book: OrderBook) -> Dict[str, np.ndarray]:
+    """Resting orders, sequence counters and retained fills (not the empty ring slots) as arrays."""
+    rows = [
+        (order.id, 1 if side is book.bids else -1, order.price, order.volume, order.seq)
+        for side in (book.bids, book.asks)
+        for level in side.iter_levels()
+        for order in level.orders.values()
+    ]
+    return {
+        "orders": np.array(rows, dtype=BOOK_ORDER_DTYPE),
+        "counters": np.array([book._order_seq, book.fill_seq, book.fills.count, book.fills.capacity], dtype=np.int64),
+        "fills": book.fills.since(0),
+    }
+
+def restore_order_book(state: Dict[str, np.ndarray], book: Optional[OrderBook] = None) -> OrderBook:
+    """
+    Rebuild a book from snapshot_order_book() output, in place when a book
+    is given (subscribers are kept). Queue priority is preserved.
+    """
+    order_seq, fill_seq, fill_count, fill_capacity = (int(v) for v in state["counters"])
+    if book is None:
+        book = OrderBook(fill_capacity=fill_capacity)
+    book.clear()
+    book.fills = FillBuffer(fill_capacity)
+    orders = state["orders"]
+    for oid, side, price, volume, seq in zip(
+        orders["id"].tolist(), orders["side"].tolist(), orders["price"].tolist(),
+        orders["volume"].tolist(), orders["seq"].tolist()
+    ):
+        order = Order.__new__(Order)
+        order.id, order.symbol, order.price, order.volume, order.seq, order.status = oid, None, price, volume, seq, None
+        order.side = "BUY" if side > 0 else "SELL"
+        (book.bids if side > 0 else book.asks).add(order)
+        book.order_map[oid] = order
+    book._order_seq, book.fill_seq, book.fills.count = order_seq, fill_seq, fill_count
+    # Put the retained fills back in the ring slots they were written to
+    fills = state["fills"]
+    book.fills.records[np.arange(fill_count - len(fills), fill_count) % fill_capacity] = fills
+    if len(orders):
+        reserve_order_ids(int(orders["id"].max()))
+    return book
+
+def snapshot_execution_engine(engine: ExecutionEngine) -> Dict[str, np.ndarray]:
+    """Live orders and the terminal-order archive."""
+    symbols: List[Optional[str]] = []
+    statuses: List[str] = []
+    symbol_codes: Dict[Optional[str], int] = {}
+    status_codes: Dict[str, int] = {}
+    code = OrderArchive._code
+
+    live = np.array([
+        (o.id, code(symbol_codes, symbols, o.symbol), 1 if o.side == "BUY" else -1, o.price, o.volume,
+         o.filled, o.avg_price, code(status_codes, statuses, o.status))
+        for o in engine.orders.values()
+    ], dtype=LIVE_ORDER_DTYPE)
+    archive = engine.store.archive
+    state = {
+        "live": live,
+        "symbols": np.array(json.dumps(symbols)),
+        "statuses": np.array(json.dumps(statuses)),
+        "archive_symbols": np.array(json.dumps(archive.symbols)),
+        "archive_statuses": np.array(json.dumps(archive.statuses)),
+    }
+    for name in archive.columns:
+        state["archive_" + name] = archive.column(name).copy()
+    return state
+
+def restore_execution_engine(state: Dict[str, np.ndarray], engine: ExecutionEngine) -> ExecutionEngine:
+    """Load snapshot_execution_engine() output into an engine (callback and latency are kept)."""
+    symbols = json.loads(str(state["symbols"]))
+    statuses = json.loads(str(state["statuses"]))
+    engine.orders.clear()
+    live = state["live"]
+    for row in live.tolist():
+        oid, symbol, side, price, volume, filled, avg_price, status = row
+        order = ExecutionOrder.__new__(ExecutionOrder)
+        order.id, order.symbol, order.price, order.volume, order.seq = oid, symbols[symbol], price, volume, 0
+        order.side = "BUY" if side > 0 else "SELL"
+        order.filled, order.avg_price, order.status = filled, avg_price, statuses[status]
+        engine.orders[oid] = order
+    size = len(state["archive_id"])
+    archive = OrderArchive(capacity=max(size, 4096))
+    for name in archive.columns:
+        archive.columns[name][:size] = state["archive_" + name]
+    archive.size = size
+    archive.symbols = json.loads(str(state["archive_symbols"]))
+    archive.statuses = json.loads(str(state["archive_statuses"]))
+    archive._symbol_codes = {value: i for i, value in enumerate(archive.symbols)}
+    archive._status_codes = {value: i for i, value in enumerate(archive.statuses)}
+    engine.store.archive = archive
+    last_id = max(int(live["id"].max()) if len(live) else 0, int(state["archive_id"].max()) if size else 0)
+    reserve_order_ids(last_id)
+    return engine
+
+def snapshot_risk_manager(risk: RiskManager) -> Dict[str, np.ndarray]:
+    return {
+        "positions": np.array(json.dumps(risk.positions)),
+        "pnl": np.array(risk.pnl, dtype=np.float64),
+    }
+
+def restore_risk_manager(state: Dict[str, np.ndarray], risk: RiskManager) -> RiskManager:
+    """Load snapshot_risk_manager() output into a RiskManager (limits and alerts are kept)."""
+    risk.positions = json.loads(str(state["positions"]))
+    risk.pnl = float(state["pnl"])
+    return risk
+
+def save_checkpoint(
+    path: str,
+    event_index: int,
+    timestamp: float,
+    books: Dict[str, OrderBook],
+    engine: Optional[ExecutionEngine] = None,
+    risk: Optional[RiskManager] = None
+):
+    """
+    Write one binary checkpoint (.npz): book, engine and risk state after
+    event_index events, the last of which happened at timestamp.
+    """
+    arrays: Dict[str, np.ndarray] = {
+        "meta": np.array(json.dumps({"event_index": event_index, "timestamp": timestamp, "books": list(books)})),
+    }
+    for i, book in enumerate(books.values()):
+        arrays.update({f"book{i}/{k}": v for k, v in snapshot_order_book(book).items()})
+    if engine is not None:
+        arrays.update({f"engine/{k}": v for k, v in snapshot_execution_engine(engine).items()})
+    if risk is not None:
+        arrays.update({f"risk/{k}": v for k, v in snapshot_risk_manager(risk).items()})
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(buffer.getvalue())
+    os.replace(tmp, path)  # Readers never see a partial checkpoint
+
+def load_checkpoint(
+    path: str,
+    books: Dict[str, OrderBook],
+    engine: Optional[ExecutionEngine] = None,
+    risk: Optional[RiskManager] = None
+) -> Dict[str, Any]:
+    """Restore state from a checkpoint into the given objects; returns its metadata."""
+    with np.load(path) as data:
+        meta = json.loads(str(data["meta"]))
+        groups: Dict[str, Dict[str, np.ndarray]] = {}
+        for key in data.files:
+            if "/" in key:
+                group, name = key.split("/", 1)
+                groups.setdefault(group, {})[name] = data[key]
+    for i, name in enumerate(meta["books"]):
+        restore_order_book(groups[f"book{i}"], books[name])
+    if engine is not None and "engine" in groups:
+        restore_execution_engine(groups["engine"], engine)
+    if risk is not None and "risk" in groups:
+        restore_risk_manager(groups["risk"], risk)
+    return meta
+
+class ReplayCheckpointer:
+    """
+    Periodic checkpoints for an event-log replay, and seeking by time.
+    run() replays the whole log and writes a checkpoint every `every`
+    events; seek() restores the last checkpoint at or before a target time
+    and applies only the remaining events up to it.
+
+    Events are dicts with a time_key timestamp (anything event_time
+    accepts), applied in log order by apply(event). An event with a missing
+    timestamp (e.g. a NaT tick) takes the time of the event before it. The log is read through
+    event_source(start), which yields events from index start onwards, so
+    a seek does not have to touch the skipped prefix.
+    """
+    def __init__(self, directory: str, every: int = 100_000, time_key: str = "timestamp"):
+        self.directory = directory
+        self.every = every
+        self.time_key = time_key
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, event_index: int) -> str:
+        return os.path.join(self.directory, f"ckpt-{event_index:012d}.npz")
+
+    def run(
+        self,
+        events: Iterable[Dict[str, Any]],
+        apply: Callable[[Dict[str, Any]], None],
+        books: Dict[str, OrderBook],
+        engine: Optional[ExecutionEngine] = None,
+        risk: Optional[RiskManager] = None
+    ) -> int:
+        """Replay events, checkpointing as it goes. Returns the number applied."""
+        count = 0
+        last_time = -np.inf
+        for event in events:
+            apply(event)
+            count += 1
+            last_time = self._event_time(event, last_time)
+            if count % self.every == 0:
+                save_checkpoint(self._path(count), count, last_time, books, engine, risk)
+        return count
+
+    def _event_time(self, event: Dict[str, Any], last_time: float) -> float:
+        """event_time of an event, carrying last_time forward when it has none."""
+        try:
+            return event_time(event.get(self.time_key))
+        except ValueError:
+            return last_time
+
+    def checkpoints(self) -> List[Tuple[int, float, str]]:
+        """(event_index, timestamp, path) for every checkpoint, in log order."""
+        found = []
+        for name in os.listdir(self.directory):
+            match = CHECKPOINT_PATTERN.match(name)
+            if match:
+                path = os.path.join(self.directory, name)
+                with np.load(path) as data:
+                    found.append((int(match.group(1)), json.loads(str(data["meta"]))["timestamp"], path))
+        return sorted(found)
+
+    def nearest(self, target: Union[datetime, float]) -> Optional[Tuple[int, float, str]]:
+        """Latest checkpoint taken at or before target."""
+        target = event_time(target)
+        best = None
+        for checkpoint in self.checkpoints():
+            if checkpoint[1] <= target:
+                best = checkpoint
+        return best
+
+    def seek(
+        self,
+        target: Union[datetime, float],
+        event_source: Callable[[int], Iterable[Dict[str, Any]]],
+        apply: Callable[[Dict[str, Any]], None],
+        books: Dict[str, OrderBook],
+        engine: Optional[ExecutionEngine] = None,
+        risk: Optional[RiskManager] = None
+    ) -> int:
+        """
+        Bring books (and engine/risk) to their state after the last event at
+        or before target. Without a usable checkpoint the objects must start
+        empty and the log is replayed from the beginning. Returns the index
+        of the next unapplied event.
+        """
+        target = event_time(target)
+        start = 0
+        checkpoint = self.nearest(target)
+        if checkpoint is not None:
+            start = load_checkpoint(checkpoint[2], books, engine, risk)["event_index"]
+        index = start
+        last_time = -np.inf
+        for event in event_source(start):
+            last_time = self._event_time(event, last_time)
+            if last_time > target:
+                break
+            apply(event)
+            index += 1
+        return index
+
+def tick_columns_source(ticks, batch_size: int = 65536) -> Callable[[int], Iterable[Dict[str, Any]]]:
+    """event_source for ReplayCheckpointer over memory-mapped TickColumns: starts at any index in O(1)."""
+    def source(start: int):
+        for lo in range(start, len(ticks), batch_size):
+            hi = min(lo + batch_size, len(ticks))
+            batch = TickColumns(
+                ticks.timestamp[lo:hi], ticks.price[lo:hi], ticks.volume[lo:hi],
+                ticks.symbol[lo:hi], ticks.side[lo:hi], ticks.symbols, ticks.sides
+            )
+            yield from batch.to_dicts()
+    return source
+
+# Example usage:
+# books = {"AAPL": OrderBook()}
+# ckpt = ReplayCheckpointer("checkpoints/2024-01-02", every=500_000)
+# ckpt.run(market_event_stream(load_market_data("day.csv")), make_symbol_dispatcher(books), books)
+#
+# Later, to inspect the book at 15:30:
+# ticks = load_market_data("day.csv", columnar=True)
+# books = {"AAPL": OrderBook()}
+# ckpt.seek(datetime(2024, 1, 2, 15, 30), tick_columns_source(ticks), make_symbol_dispatcher(books), books)
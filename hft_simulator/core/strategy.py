@@ -1,4 +1,14 @@
-from typing import List, Dict, Optional
+from typing import List, Optional
+import numpy as np
+from hft_simulator.core.indicators import SMA
+
+# Integer signal codes used by vectorized strategies
+SIGNAL_CODES = {"BUY": 1, "SELL": -1, "HOLD": 0}
+
+# Averages closer than this (relative to their magnitude) count as a tie.
+# Far below a price tick, far above float rounding, so a running sum and a
+# fresh sum of the same tick-quantized prices give the same signal.
+MA_TIE_TOLERANCE = 1e-9
 
 class StrategyConfig:
     """Configuration for trading strategy parameters."""
@@ -16,18 +26,67 @@ def generate_signal(prices: List[float], config: StrategyConfig) -> str:
     """
     Generate trading signal based on moving average crossover.
     Returns: "BUY", "SELL", or "HOLD"
+    Recomputes both averages from the full history; streaming callers should
+    use MACrossoverStrategy instead.
     """
     short_ma = moving_average(prices, config.short_window)
     long_ma = moving_average(prices, config.long_window)
+    return crossover_signal(short_ma, long_ma)
+
+def crossover_signal(short_ma: Optional[float], long_ma: Optional[float]) -> str:
+    """Compare two moving averages, treating near-equal values as a tie ("HOLD")."""
     if short_ma is None or long_ma is None:
         return "HOLD"
-    if short_ma > long_ma:
+    tolerance = MA_TIE_TOLERANCE * max(abs(short_ma), abs(long_ma))
+    if short_ma - long_ma > tolerance:
         return "BUY"
-    elif short_ma < long_ma:
+    elif long_ma - short_ma > tolerance:
         return "SELL"
     else:
         return "HOLD"
 
+class MACrossoverStrategy:
+    """Stateful moving average crossover with O(1) cost and memory per tick."""
+    def __init__(self, config: StrategyConfig):
+        self.config = config
+        self.short_ma = SMA(config.short_window)
+        self.long_ma = SMA(config.long_window)
+
+    def on_tick(self, price: float) -> str:
+        """Consume the next price and return "BUY", "SELL", or "HOLD"."""
+        return crossover_signal(self.short_ma.update(price), self.long_ma.update(price))
+
+def trailing_mean(prices: np.ndarray, window: int) -> np.ndarray:
+    """
+    moving_average evaluated at every tick (NaN until the window fills).
+    Windows are summed left to right like sum(), so results are bit-identical
+    to the per-tick version.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    out = np.full(len(prices), np.nan)
+    n = len(prices) - window + 1
+    if window <= 0 or n <= 0:
+        return out
+    acc = np.zeros(n)
+    for k in range(window):
+        acc += prices[k:k + n]
+    out[window - 1:] = acc / window
+    return out
+
+def ma_crossover_signals(prices: np.ndarray, config: StrategyConfig) -> np.ndarray:
+    """
+    Vectorized generate_signal over a whole price history.
+    Returns int8 SIGNAL_CODES per tick: 1 for BUY, -1 for SELL, 0 for HOLD.
+    """
+    short_ma = trailing_mean(prices, config.short_window)
+    long_ma = trailing_mean(prices, config.long_window)
+    # Same tie rule as crossover_signal; NaN comparisons are False, so warm-up ticks are HOLD
+    tolerance = MA_TIE_TOLERANCE * np.maximum(np.abs(short_ma), np.abs(long_ma))
+    signals = np.full(len(short_ma), SIGNAL_CODES["HOLD"], dtype=np.int8)
+    signals[short_ma - long_ma > tolerance] = SIGNAL_CODES["BUY"]
+    signals[long_ma - short_ma > tolerance] = SIGNAL_CODES["SELL"]
+    return signals
+
 def decide_order_action(prices: List[float], config: StrategyConfig) -> str:
     """Determine order action based on the generated signal."""
     signal = generate_signal(prices, config)
@@ -37,6 +96,9 @@ def decide_order_action(prices: List[float], config: StrategyConfig) -> str:
 # config = StrategyConfig(short_window=10, long_window=50)
 # prices = [tick['price'] for tick in recent_ticks]
 # action = decide_order_action(prices, config)
+#
+# strategy = MACrossoverStrategy(config)
+# action = strategy.on_tick(tick['price'])
 # if action == "BUY":
 #     # send buy order
 # elif action == "SELL":
@@ -0,0 +1,102 @@
+import itertools
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from hft_simulator.core.backtest import Backtester
+from hft_simulator.core.strategy import StrategyConfig, ma_crossover_signals
+
+# Per-worker state, set up once by _init_worker
+_worker_data: Optional[pd.DataFrame] = None
+
+def expand_grid(grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Cartesian product of a parameter grid, in key order then value order."""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+def _sweep_frame(prices: np.ndarray) -> pd.DataFrame:
+    # Metrics only depend on the price path, so ticks are indexed by position
+    return pd.DataFrame({"timestamp": np.arange(len(prices)), "price": prices}, copy=False)
+
+def _init_worker(prices_path: str):
+    global _worker_data
+    _worker_data = _sweep_frame(np.load(prices_path, mmap_mode="r"))
+
+def _run_point(
+    index: int,
+    params: Dict[str, Any],
+    signal_func: Callable[[np.ndarray, Any], np.ndarray],
+    config_factory: Callable[..., Any],
+    initial_cash: float
+) -> Dict[str, Any]:
+    backtester = Backtester(_worker_data, None, None, config_factory(**params))
+    result = backtester.run_vectorized(signal_func, initial_cash)
+    return {
+        "index": index,
+        **params,
+        "pnl": float(result.pnl),
+        "sharpe": float(result.sharpe),
+        "max_drawdown": float(result.max_drawdown),
+        "trades": len(result.trades),
+    }
+
+def run_parameter_sweep(
+    data: pd.DataFrame,
+    grid: Dict[str, Sequence[Any]],
+    signal_func: Callable[[np.ndarray, Any], np.ndarray] = ma_crossover_signals,
+    config_factory: Callable[..., Any] = StrategyConfig,
+    initial_cash: float = 100000.0,
+    processes: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> pd.DataFrame:
+    """
+    Run Backtester.run_vectorized for every point of a parameter grid across
+    a process pool. Prices are written once to a memory-mapped file that all
+    workers map read-only, rather than pickling the DataFrame per task.
+    signal_func and config_factory must be picklable (module-level).
+    Returns one row per grid point with pnl, sharpe, max_drawdown and trade
+    count, in grid order. progress(done, total) is called as points finish.
+    """
+    global _worker_data
+    points = expand_grid(grid)
+    prices = data["price"].to_numpy(dtype=np.float64)
+    rows = []
+
+    if processes == 1:
+        _worker_data = _sweep_frame(prices)
+        for i, params in enumerate(points):
+            rows.append(_run_point(i, params, signal_func, config_factory, initial_cash))
+            if progress:
+                progress(i + 1, len(points))
+        _worker_data = None
+    else:
+        tmp_dir = tempfile.mkdtemp(prefix="hft_sweep_")
+        try:
+            prices_path = os.path.join(tmp_dir, "prices.npy")
+            np.save(prices_path, prices)
+            with ProcessPoolExecutor(
+                max_workers=processes, initializer=_init_worker, initargs=(prices_path,)
+            ) as pool:
+                futures = [
+                    pool.submit(_run_point, i, params, signal_func, config_factory, initial_cash)
+                    for i, params in enumerate(points)
+                ]
+                for done, future in enumerate(as_completed(futures), start=1):
+                    rows.append(future.result())
+                    if progress:
+                        progress(done, len(points))
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    columns = ["index", *grid, "pnl", "sharpe", "max_drawdown", "trades"]
+    table = pd.DataFrame(rows, columns=columns).sort_values("index")
+    return table.drop(columns="index").reset_index(drop=True)
+
+# Example usage:
+# data = pd.read_csv("data/sample_ticks.csv", parse_dates=["timestamp"])
+# grid = {"short_window": range(2, 22), "long_window": range(30, 230, 10)}
+# table = run_parameter_sweep(data, grid, progress=lambda done, total: print(f"{done}/{total}"))
+# print(table.sort_values("sharpe", ascending=False).head())
@@ -0,0 +1,95 @@
+import json
+import os
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+import numpy as np
+
+# A tick store is a directory of .npy columns next to the source CSV:
+#   timestamp.npy  int64 epoch nanoseconds (NAT_NS when missing)
+#   price.npy      float64
+#   volume.npy     int64
+#   symbol.npy     int32 codes into dictionary.json["symbols"]
+#   side.npy       int8 codes into dictionary.json["sides"]
+# dictionary.json is written last, so its mtime marks a complete store.
+STORE_SUFFIX = ".cols"
+DICTIONARY_FILE = "dictionary.json"
+COLUMNS = ("timestamp", "price", "volume", "symbol", "side")
+NAT_NS = np.iinfo(np.int64).min  # Same bit pattern as numpy NaT
+
+_EPOCH = datetime(1970, 1, 1)
+
+def datetime_to_ns(ts: Optional[datetime]) -> int:
+    """Convert a naive datetime to epoch nanoseconds (NAT_NS for None)."""
+    if ts is None:
+        return NAT_NS
+    delta = ts - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+
+class TickColumns:
+    """Column arrays for a tick file, with dictionary-encoded symbol and side."""
+    def __init__(
+        self,
+        timestamp: np.ndarray,
+        price: np.ndarray,
+        volume: np.ndarray,
+        symbol: np.ndarray,
+        side: np.ndarray,
+        symbols: List[Optional[str]],
+        sides: List[Optional[str]]
+    ):
+        self.timestamp = timestamp
+        self.price = price
+        self.volume = volume
+        self.symbol = symbol
+        self.side = side
+        self.symbols = symbols
+        self.sides = sides
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Materialize ticks in the same shape as market_data.normalize_tick."""
+        timestamps = self.timestamp.view("datetime64[ns]").astype("datetime64[us]").tolist()
+        symbols = [self.symbols[code] for code in self.symbol.tolist()]
+        sides = [self.sides[code] for code in self.side.tolist()]
+        return [
+            {"timestamp": ts, "symbol": sym, "price": price, "volume": volume, "side": side}
+            for ts, sym, price, volume, side in zip(
+                timestamps, symbols, self.price.tolist(), self.volume.tolist(), sides
+            )
+        ]
+
+def store_path_for(csv_path: str) -> str:
+    return csv_path + STORE_SUFFIX
+
+def is_store_fresh(csv_path: str, store_dir: Optional[str] = None) -> bool:
+    """True if a complete store exists and is newer than its source CSV."""
+    store_dir = store_dir or store_path_for(csv_path)
+    marker = os.path.join(store_dir, DICTIONARY_FILE)
+    if not os.path.exists(marker):
+        return False
+    return os.path.getmtime(marker) >= os.path.getmtime(csv_path)
+
+def write_columnar(store_dir: str, columns: TickColumns):
+    """Write column arrays to store_dir."""
+    os.makedirs(store_dir, exist_ok=True)
+    marker = os.path.join(store_dir, DICTIONARY_FILE)
+    if os.path.exists(marker):
+        os.remove(marker)  # Invalidate while columns are rewritten
+    dtypes = {"timestamp": np.int64, "price": np.float64, "volume": np.int64, "symbol": np.int32, "side": np.int8}
+    for name in COLUMNS:
+        np.save(os.path.join(store_dir, name + ".npy"), np.asarray(getattr(columns, name), dtype=dtypes[name]))
+    with open(marker, "w") as f:
+        json.dump({"symbols": columns.symbols, "sides": columns.sides}, f)
+
+def load_columnar(store_dir: str) -> TickColumns:
+    """Memory-map a tick store; the returned arrays are read-only views of the files."""
+    with open(os.path.join(store_dir, DICTIONARY_FILE)) as f:
+        dictionary = json.load(f)
+    arrays = {name: np.load(os.path.join(store_dir, name + ".npy"), mmap_mode="r") for name in COLUMNS}
+    return TickColumns(symbols=dictionary["symbols"], sides=dictionary["sides"], **arrays)
+
+# Example usage:
+# ticks = load_columnar("data/sample_ticks.csv.cols")
+# vwap = (ticks.price * ticks.volume).sum() / ticks.volume.sum()
@@ -1,28 +1,46 @@
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Sequence, Tuple
 import heapq
 import numpy as np
+from hft_simulator.core.clock import EventScheduler
+from hft_simulator.core.order_book import Fill, OrderBook, PriceLevel
+from hft_simulator.core.orders import next_order_id
 
 class Venue:
     """Simulated exchange or liquidity pool."""
     def __init__(self, name: str, fee: float = 0.0):
         self.name = name
         self.fee = fee
-        self.order_book = []  # Simple list for demonstration
+        self.order_book = OrderBook()
+        # Volume filled by the order being added, counted as fills happen
+        # (reading them back from the fill ring would miss any it overwrote)
+        self._arrival_id: Optional[int] = None
+        self._arrival_filled = 0
+        self.order_book.subscribe(self._on_fill)
+
+    def _on_fill(self, fill: Fill):
+        if fill.aggressor_id == self._arrival_id:
+            self._arrival_filled += fill.volume
 
     def add_order(self, side: str, price: float, volume: int, order_type: str = "LIMIT") -> Dict[str, Any]:
-        # In a real system, this would interact with an OrderBook instance
-        order = {"side": side, "price": price, "volume": volume, "type": order_type, "venue": self.name}
-        self.order_book.append(order)
-        return {"status": "ACCEPTED", "order": order}
+        """Submit an order to the venue book; the response reports the volume filled on arrival."""
+        self._arrival_id = order_id = next_order_id()
+        self._arrival_filled = 0
+        self.order_book.add_order(side, price, volume, order_id=order_id)
+        filled = self._arrival_filled
+        self._arrival_id = None
+        order = {
+            "id": order_id, "side": side, "price": price, "volume": volume,
+            "type": order_type, "venue": self.name
+        }
+        return {"status": "ACCEPTED", "order": order, "filled": filled}
+
+    def best_level(self, side: str) -> Optional[PriceLevel]:
+        """Best resting price level on one side of the venue book (O(1))."""
+        return self.order_book.bids.best if side == "BUY" else self.order_book.asks.best
 
     def get_best_price(self, side: str) -> Optional[float]:
-        filtered = [o for o in self.order_book if o["side"] == side and o["volume"] > 0]
-        if not filtered:
-            return None
-        if side == "BUY":
-            return max(o["price"] for o in filtered)
-        else:
-            return min(o["price"] for o in filtered)
+        level = self.best_level(side)
+        return level.price if level else None
 
 class SmartOrderRouter:
     def __init__(self, venues: List[Venue]):
@@ -31,34 +49,38 @@ class SmartOrderRouter:
     def route_order(self, side: str, price: float, volume: int, order_type: str = "LIMIT", smart: bool = True) -> List[Dict[str, Any]]:
         """
         Route order across venues.
-        If smart=True, split order for best price/venue.
+        If smart=True, sweep the contra-side liquidity of all venues in price
+        order (then fee, then venue order) up to the limit price, taking at
+        most the volume resting at each level. Any remainder rests passively
+        on the first venue.
         """
         results = []
         remaining = volume
+        contra = "SELL" if side == "BUY" else "BUY"
+
+        def crosses(level_price: float) -> bool:
+            return price >= level_price if side == "BUY" else price <= level_price
 
-        # Gather best prices from all venues
-        venue_prices = []
-        for venue in self.venues:
-            best = venue.get_best_price("SELL" if side == "BUY" else "BUY")
-            if best is not None:
-                venue_prices.append((best, venue))
-
-        # Sort venues for best execution
-        if side == "BUY":
-            venue_prices.sort(key=lambda x: x[0])  # Lowest ask first
-        else:
-            venue_prices.sort(key=lambda x: -x[0])  # Highest bid first
-
-        # Smart routing: split order across venues for best price
-        for best_price, venue in venue_prices:
-            if (side == "BUY" and price >= best_price) or (side == "SELL" and price <= best_price):
-                # Simulate full fill at best price for simplicity
-                fill_volume = min(remaining, volume)  # In real life, use venue's available liquidity
-                result = venue.add_order(side, best_price, fill_volume, order_type)
-                results.append(result)
+        if smart:
+            # Merged cross-venue heap holding each venue's current best level
+            heap = []
+            for idx, venue in enumerate(self.venues):
+                level = venue.best_level(contra)
+                if level is not None and crosses(level.price):
+                    heap.append((level.price if side == "BUY" else -level.price, venue.fee, idx))
+            heapq.heapify(heap)
+
+            while remaining > 0 and heap:
+                _, _, idx = heapq.heappop(heap)
+                venue = self.venues[idx]
+                level = venue.best_level(contra)
+                fill_volume = min(remaining, level.volume)
+                results.append(venue.add_order(side, level.price, fill_volume, order_type))
                 remaining -= fill_volume
-                if remaining <= 0:
-                    break
+                # The taken level is gone (or the order is done); requeue the venue's next level
+                level = venue.best_level(contra)
+                if remaining > 0 and level is not None and crosses(level.price):
+                    heapq.heappush(heap, (level.price if side == "BUY" else -level.price, venue.fee, idx))
 
         # If not fully filled, send remainder to first venue as passive order
         if remaining > 0 and self.venues:
@@ -70,6 +92,8 @@ class SmartOrderRouter:
     def iceberg_order(self, side: str, price: float, total_volume: int, display_size: int, order_type: str = "LIMIT") -> List[Dict[str, Any]]:
         """
         Simulate iceberg order: only display a portion of the total volume at a time.
+        Posts every chunk immediately; ParentOrderScheduler.iceberg refreshes
+        the displayed slice only as fills arrive.
         """
         results = []
         remaining = total_volume
@@ -81,6 +105,151 @@ class SmartOrderRouter:
             # In real HFT, would wait for fills before posting next chunk
         return results
 
+class ParentOrder:
+    """A parent order worked through child orders by ParentOrderScheduler."""
+    def __init__(self, kind: str, side: str, price: float, total_volume: int, order_type: str):
+        self.id = next_order_id()
+        self.kind = kind  # "ICEBERG", "TWAP" or "VWAP"
+        self.side = side
+        self.price = price
+        self.total_volume = total_volume
+        self.order_type = order_type
+        self.unsent = total_volume
+        self.filled = 0
+        self.display_size = 0
+        # (venue name, child order id) -> open volume of resting children
+        self.children: Dict[Tuple[str, int], int] = {}
+        self.slice_times: List[float] = []
+        self.slice_volumes: List[int] = []
+        self.next_slice = 0
+        self.cancelled = False
+
+    @property
+    def done(self) -> bool:
+        return self.filled >= self.total_volume
+
+class ParentOrderScheduler:
+    """
+    Works parent orders (iceberg, TWAP, VWAP) through a SmartOrderRouter on
+    the simulation clock. Icebergs post their next slice only when the
+    displayed slice has completely filled, driven by venue fill events.
+    Timed strategies keep one pending wake-up per parent on the shared
+    EventScheduler heap. Parents are dropped from `parents` once they are
+    fully filled or cancelled.
+    """
+    def __init__(self, router: SmartOrderRouter, scheduler: EventScheduler):
+        self.router = router
+        self.scheduler = scheduler
+        self.parents: Dict[int, ParentOrder] = {}
+        self._child_parent: Dict[Tuple[str, int], ParentOrder] = {}
+        for venue in router.venues:
+            venue.order_book.subscribe(lambda fill, name=venue.name: self._on_fill(name, fill))
+
+    def iceberg(self, side: str, price: float, total_volume: int, display_size: int, order_type: str = "LIMIT") -> int:
+        if display_size <= 0:
+            raise ValueError(f"Iceberg display size must be positive: {display_size}")
+        parent = self._new_parent("ICEBERG", side, price, total_volume, order_type)
+        parent.display_size = display_size
+        self._post_slice(parent)
+        return parent.id
+
+    def twap(
+        self, side: str, price: float, total_volume: int, start: float, end: float,
+        slices: int, order_type: str = "LIMIT"
+    ) -> int:
+        """Split evenly across `slices` wake-ups spread over [start, end)."""
+        if slices <= 0:
+            raise ValueError(f"TWAP needs at least one slice: {slices}")
+        return self._timed("TWAP", side, price, total_volume, start, end, np.ones(slices), order_type)
+
+    def vwap(
+        self, side: str, price: float, total_volume: int, start: float, end: float,
+        volume_profile: Sequence[float], order_type: str = "LIMIT"
+    ) -> int:
+        """Split in proportion to an expected volume profile (one weight per slice)."""
+        weights = np.asarray(volume_profile, dtype=float)
+        if weights.ndim != 1 or len(weights) == 0 or not np.isfinite(weights).all() or (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("VWAP volume profile must be non-empty, non-negative and sum to more than zero")
+        return self._timed("VWAP", side, price, total_volume, start, end, weights, order_type)
+
+    def cancel(self, parent_id: int) -> bool:
+        """Stop working a parent: cancel its resting children and any slices not yet sent."""
+        parent = self.parents.pop(parent_id, None)
+        if parent is None:
+            return False
+        parent.cancelled = True
+        parent.unsent = 0
+        venues = {venue.name: venue for venue in self.router.venues}
+        for key in list(parent.children):
+            venues[key[0]].order_book.cancel_order(key[1])
+            del self._child_parent[key]
+        parent.children.clear()
+        return True
+
+    def _new_parent(self, kind: str, side: str, price: float, total_volume: int, order_type: str) -> ParentOrder:
+        if total_volume <= 0:
+            raise ValueError(f"Parent order volume must be positive: {total_volume}")
+        parent = ParentOrder(kind, side, price, total_volume, order_type)
+        self.parents[parent.id] = parent
+        return parent
+
+    def _timed(
+        self, kind: str, side: str, price: float, total_volume: int, start: float, end: float,
+        weights: np.ndarray, order_type: str
+    ) -> int:
+        parent = self._new_parent(kind, side, price, total_volume, order_type)
+        # Round cumulative targets so slice volumes always sum to the total
+        targets = np.rint(total_volume * np.cumsum(weights) / weights.sum()).astype(np.int64)
+        parent.slice_volumes = np.diff(targets, prepend=0).tolist()
+        parent.slice_times = (start + (end - start) * np.arange(len(weights)) / len(weights)).tolist()
+        self.scheduler.schedule_at(max(parent.slice_times[0], self.scheduler.now), self._wake, parent)
+        return parent.id
+
+    def _wake(self, parent: ParentOrder):
+        if parent.cancelled:
+            return
+        volume = parent.slice_volumes[parent.next_slice]
+        parent.next_slice += 1
+        if volume > 0:
+            self._send(parent, volume)
+        if parent.next_slice < len(parent.slice_times):
+            when = max(parent.slice_times[parent.next_slice], self.scheduler.now)
+            self.scheduler.schedule_at(when, self._wake, parent)
+
+    def _post_slice(self, parent: ParentOrder):
+        # A slice that fills completely on arrival is replaced right away
+        while parent.unsent > 0 and not parent.children:
+            self._send(parent, min(parent.display_size, parent.unsent))
+
+    def _send(self, parent: ParentOrder, volume: int):
+        parent.unsent -= volume
+        for result in self.router.route_order(parent.side, parent.price, volume, parent.order_type):
+            order = result["order"]
+            parent.filled += result["filled"]
+            open_volume = order["volume"] - result["filled"]
+            if open_volume > 0:
+                key = (order["venue"], order["id"])
+                parent.children[key] = open_volume
+                self._child_parent[key] = parent
+        if parent.done:
+            self.parents.pop(parent.id, None)
+
+    def _on_fill(self, venue_name: str, fill: Fill):
+        key = (venue_name, fill.resting_id)
+        parent = self._child_parent.get(key)
+        if parent is None:
+            return
+        parent.filled += fill.volume
+        parent.children[key] -= fill.volume
+        if parent.children[key] <= 0:
+            del parent.children[key]
+            del self._child_parent[key]
+            if parent.done:
+                self.parents.pop(parent.id, None)
+            elif parent.kind == "ICEBERG" and not parent.children and parent.unsent > 0:
+                # Refresh outside the book's matching loop
+                self.scheduler.schedule_in(0.0, self._post_slice, parent)
+
 # Optional: Performance optimization hooks
 try:
     from numba import njit
@@ -91,4 +260,11 @@ except ImportError:
     def fast_min(arr):
         return min(arr)
 
-# Example usage:
\ No newline at end of file
+# Example usage:
+# venues = [Venue("A", fee=0.001), Venue("B", fee=0.0005)]
+# router = SmartOrderRouter(venues)
+# scheduler = EventScheduler()
+# parents = ParentOrderScheduler(router, scheduler)
+# parents.iceberg("BUY", 100.0, total_volume=10000, display_size=100)
+# parents.twap("SELL", 101.0, total_volume=5000, start=0.0, end=3600.0, slices=60)
+# scheduler.run()
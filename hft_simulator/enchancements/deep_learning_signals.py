@@ -1,8 +1,10 @@
 import numpy as np
 import pandas as pd
-from typing import Tuple, Any
+from typing import Tuple, Any, Optional, Sequence, Union
 import torch
 import torch.nn as nn
+from numpy.lib.stride_tricks import sliding_window_view
+from torch.utils.data import BatchSampler, DataLoader, Dataset, RandomSampler, SequentialSampler
 from sklearn.preprocessing import StandardScaler
 
 class PricePredictorNN(nn.Module):
@@ -18,6 +20,69 @@ class PricePredictorNN(nn.Module):
     def forward(self, x):
         return self.net(x)
 
+def make_windows(features: np.ndarray, window_size: int) -> np.ndarray:
+    """
+    Zero-copy sliding windows over a (time, features) array.
+    Returns a read-only view of shape (time - window_size + 1, window_size, features),
+    with no windows when there are fewer than window_size rows.
+    """
+    if len(features) < window_size:
+        return np.empty((0, window_size, features.shape[1]), dtype=features.dtype)
+    return sliding_window_view(features, window_size, axis=0).transpose(0, 2, 1)
+
+class WindowDataset(Dataset):
+    """
+    Lazily windowed training samples: sample i is the window of features
+    before tick i + window_size and the target at that tick. Indexing with a
+    sequence of indices returns a whole mini-batch, so only one batch is ever
+    materialized.
+    """
+    def __init__(self, features: np.ndarray, targets: np.ndarray, window_size: int):
+        self.features = np.ascontiguousarray(features, dtype=np.float32)
+        self.targets = np.asarray(targets, dtype=np.float32)
+        self.window_size = window_size
+        self.windows = make_windows(self.features, window_size)
+
+    def __len__(self) -> int:
+        return max(len(self.features) - self.window_size, 0)
+
+    def __getitem__(self, idx: Union[int, Sequence[int], np.ndarray]) -> Tuple[torch.Tensor, torch.Tensor]:
+        if np.isscalar(idx):
+            x = self.features[idx:idx + self.window_size].reshape(-1)  # Contiguous rows: still a view
+            y = self.targets[idx + self.window_size:idx + self.window_size + 1]
+        else:
+            idx = np.asarray(idx)
+            x = self.windows[idx].reshape(len(idx), -1)
+            y = self.targets[idx + self.window_size][:, None]
+        return torch.from_numpy(x), torch.from_numpy(y)
+
+def make_loader(
+    dataset: WindowDataset,
+    batch_size: int = 256,
+    shuffle: bool = True,
+    seed: Optional[int] = None,
+    num_workers: int = 0
+) -> DataLoader:
+    """DataLoader yielding (X, y) mini-batches built directly from the window view."""
+    generator = torch.Generator().manual_seed(seed) if seed is not None else None
+    sampler = RandomSampler(dataset, generator=generator) if shuffle else SequentialSampler(dataset)
+    # batch_size=None: the sampler hands whole index batches to dataset.__getitem__
+    return DataLoader(
+        dataset, batch_size=None, sampler=BatchSampler(sampler, batch_size, drop_last=False),
+        num_workers=num_workers
+    )
+
+def build_window_dataset(
+    df: pd.DataFrame,
+    feature_cols: list,
+    target_col: str,
+    window_size: int = 20
+) -> Tuple[WindowDataset, Any]:
+    """Streaming counterpart of preprocess_data: scaled features wrapped in a WindowDataset."""
+    scaler = StandardScaler()
+    features = scaler.fit_transform(df[feature_cols])
+    return WindowDataset(features, df[target_col].to_numpy(), window_size), scaler
+
 def preprocess_data(
     df: pd.DataFrame, 
     feature_cols: list, 
@@ -27,46 +92,87 @@ def preprocess_data(
     """
     Prepares time series data for neural network input.
     Returns: X (samples, window*features), y (samples,), scaler
+    X is materialized in one copy from the window view; use
+    build_window_dataset to avoid materializing it at all.
     """
     scaler = StandardScaler()
     features = scaler.fit_transform(df[feature_cols])
-    X, y = [], []
-    for i in range(window_size, len(df)):
-        X.append(features[i-window_size:i].flatten())
-        y.append(df[target_col].iloc[i])
-    return np.array(X), np.array(y), scaler
+    windows = make_windows(features, window_size)[:-1]
+    X = windows.reshape(len(windows), window_size * features.shape[1])
+    y = df[target_col].to_numpy(copy=True)[window_size:]
+    return X, y, scaler
 
 def train_model(
     X: np.ndarray, 
     y: np.ndarray, 
     input_dim: int, 
     epochs: int = 10, 
-    lr: float = 1e-3
+    lr: float = 1e-3,
+    batch_size: Optional[int] = None,
+    num_threads: Optional[int] = None,
+    seed: Optional[int] = None
+) -> PricePredictorNN:
+    """
+    Train the neural network on historical data.
+    batch_size=None trains full-batch; otherwise shuffled mini-batches.
+    """
+    X_tensor = torch.as_tensor(X, dtype=torch.float32)
+    y_tensor = torch.as_tensor(y, dtype=torch.float32).view(-1, 1)
+    if batch_size is None:
+        batches = lambda: [(X_tensor, y_tensor)]
+    else:
+        generator = torch.Generator().manual_seed(seed) if seed is not None else None
+
+        def batches():
+            order = torch.randperm(len(X_tensor), generator=generator)
+            for start in range(0, len(order), batch_size):
+                idx = order[start:start + batch_size]
+                yield X_tensor[idx], y_tensor[idx]
+    return _fit(PricePredictorNN(input_dim), batches, epochs, lr, num_threads)
+
+def train_windowed_model(
+    dataset: WindowDataset,
+    epochs: int = 10,
+    lr: float = 1e-3,
+    batch_size: int = 256,
+    num_threads: Optional[int] = None,
+    num_workers: int = 0,
+    seed: Optional[int] = None
 ) -> PricePredictorNN:
-    """Train the neural network on historical data."""
-    model = PricePredictorNN(input_dim)
-    optimizer = torch.optim.Adam(model.parameters(), lr=lr)
-    loss_fn = nn.MSELoss()
-    X_tensor = torch.tensor(X, dtype=torch.float32)
-    y_tensor = torch.tensor(y, dtype=torch.float32).view(-1, 1)
+    """Train on lazily built mini-batches of a WindowDataset."""
+    loader = make_loader(dataset, batch_size, shuffle=True, seed=seed, num_workers=num_workers)
+    input_dim = dataset.window_size * dataset.features.shape[1]
+    return _fit(PricePredictorNN(input_dim), lambda: loader, epochs, lr, num_threads)
 
-    for epoch in range(epochs):
+def _fit(model: PricePredictorNN, batches, epochs: int, lr: float, num_threads: Optional[int]) -> PricePredictorNN:
+    previous_threads = torch.get_num_threads()
+    if num_threads is not None:
+        torch.set_num_threads(num_threads)  # Intra-op CPU parallelism, for this call only
+    try:
+        optimizer = torch.optim.Adam(model.parameters(), lr=lr)
+        loss_fn = nn.MSELoss()
         model.train()
-        optimizer.zero_grad()
-        preds = model(X_tensor)
-        loss = loss_fn(preds, y_tensor)
-        loss.backward()
-        optimizer.step()
+        for epoch in range(epochs):
+            for X_batch, y_batch in batches():
+                optimizer.zero_grad()
+                loss = loss_fn(model(X_batch), y_batch)
+                loss.backward()
+                optimizer.step()
+    finally:
+        torch.set_num_threads(previous_threads)
     return model
 
 def predict_next(
     model: PricePredictorNN, 
     recent_window: np.ndarray
 ) -> float:
-    """Generate a prediction for the next price movement."""
+    """
+    Generate a prediction for the next price movement.
+    For per-tick inference across many symbols use inference.InferenceServer.
+    """
     model.eval()
-    with torch.no_grad():
-        x = torch.tensor(recent_window.flatten()[None, :], dtype=torch.float32)
+    with torch.inference_mode():
+        x = torch.as_tensor(recent_window.reshape(1, -1), dtype=torch.float32)
         pred = model(x)
         return float(pred.item())
 
@@ -76,4 +182,7 @@ def predict_next(
 # X, y, scaler = preprocess_data(df, feature_cols, target_col="price", window_size=20)
 # model = train_model(X, y, input_dim=X.shape[1], epochs=20)
 # recent_window = scaler.transform(df[feature_cols].iloc[-20:].values)
-#
\ No newline at end of file
+#
+# Without materializing the window matrix:
+# dataset, scaler = build_window_dataset(df, feature_cols, target_col="price", window_size=20)
+# model = train_windowed_model(dataset, epochs=20, batch_size=512, num_threads=8)
@@ -0,0 +1,237 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+from hft_simulator.enchancements.deep_learning_signals import preprocess_data
+
+# A feature store is a directory of entries, one per cache key:
+#   <root>/<key>/<name>.npy   arrays, memory-mapped on load
+#   <root>/<key>/meta.json    source path/fingerprint, spec and size
+# Entries are built in a temp dir and renamed into place, so a visible
+# entry is always complete. meta.json's mtime is the LRU clock.
+META_FILE = "meta.json"
+
+def dataset_fingerprint(path: str) -> str:
+    """Cheap identity of a source file: path, size and mtime. Changes when the file is rewritten."""
+    stat = os.stat(path)
+    raw = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+def cache_key(fingerprint: str, spec: Dict[str, Any]) -> str:
+    """Key for a (dataset fingerprint, feature spec) pair; spec must be JSON-serializable."""
+    raw = json.dumps({"dataset": fingerprint, "spec": spec}, sort_keys=True)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+class FeatureStore:
+    """
+    On-disk cache of computed arrays (feature matrices, scaler parameters,
+    model predictions) keyed by source file fingerprint and feature spec.
+    Loads are memory-mapped. Both budgets use least-recently-used eviction:
+    max_bytes bounds the disk footprint, and max_mapped_bytes bounds the
+    entries the store keeps mapped in this process (mappings it drops are
+    closed once callers release their arrays too). Writing an entry for a
+    source file drops entries built from older versions of that file.
+    """
+    def __init__(self, root: str, max_bytes: int = 2 * 1024 ** 3, max_mapped_bytes: int = 512 * 1024 ** 2):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_mapped_bytes = max_mapped_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(root, exist_ok=True)
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # Oldest access first
+        self._mapped: "OrderedDict[str, Dict[str, np.ndarray]]" = OrderedDict()  # Open memmaps, oldest first
+        self._scan()
+
+    def _scan(self):
+        found = []
+        for key in os.listdir(self.root):
+            meta_path = os.path.join(self.root, key, META_FILE)
+            try:
+                with open(meta_path) as f:
+                    meta = json.load(f)
+                found.append((os.path.getmtime(meta_path), key, meta))
+            except (OSError, ValueError):
+                continue  # Leftover temp dir or partial entry
+        for _, key, meta in sorted(found, key=lambda item: item[0]):
+            self._entries[key] = meta
+
+    @property
+    def nbytes(self) -> int:
+        return sum(meta["nbytes"] for meta in self._entries.values())
+
+    @property
+    def mapped_bytes(self) -> int:
+        return sum(self._entries[key]["nbytes"] for key in self._mapped)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """Memory-mapped arrays for a key, or None on a miss."""
+        arrays = self._load(key)
+        if arrays is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return arrays
+
+    def _load(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        meta = self._entries.get(key)
+        if meta is None:
+            return None
+        entry_dir = os.path.join(self.root, key)
+        arrays = self._mapped.get(key)
+        try:
+            if arrays is None:
+                arrays = {name: np.load(os.path.join(entry_dir, name + ".npy"), mmap_mode="r") for name in meta["arrays"]}
+            os.utime(os.path.join(entry_dir, META_FILE))
+        except OSError:
+            self._remove(key)  # Removed behind our back
+            return None
+        self._entries.move_to_end(key)
+        self._mapped[key] = arrays
+        self._mapped.move_to_end(key)
+        self._unmap(keep=key)
+        return arrays
+
+    def put(self, key: str, arrays: Dict[str, np.ndarray], source: Optional[str] = None, fingerprint: Optional[str] = None, spec: Optional[Dict[str, Any]] = None) -> Dict[str, np.ndarray]:
+        """Store arrays under key and return them memory-mapped from disk."""
+        tmp_dir = tempfile.mkdtemp(dir=self.root, prefix=".tmp-")
+        nbytes = 0
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            np.save(os.path.join(tmp_dir, name + ".npy"), array)
+            nbytes += array.nbytes
+        meta = {
+            "source": os.path.abspath(source) if source else None,
+            "fingerprint": fingerprint,
+            "spec": spec,
+            "arrays": list(arrays),
+            "nbytes": nbytes,
+            "created": time.time(),
+        }
+        with open(os.path.join(tmp_dir, META_FILE), "w") as f:
+            json.dump(meta, f)
+        entry_dir = os.path.join(self.root, key)
+        self._mapped.pop(key, None)
+        if os.path.exists(entry_dir):
+            shutil.rmtree(entry_dir)
+        os.replace(tmp_dir, entry_dir)
+        self._entries[key] = meta
+        self._entries.move_to_end(key)
+        if meta["source"] is not None:
+            self._drop_stale(meta["source"], fingerprint)
+        self._evict(keep=key)
+        return self._load(key)
+
+    def get_or_compute(self, source: str, spec: Dict[str, Any], compute: Callable[[], Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        """Arrays for (source file, spec), computing and storing them on a miss."""
+        fingerprint = dataset_fingerprint(source)
+        key = cache_key(fingerprint, spec)
+        arrays = self.get(key)
+        if arrays is None:
+            arrays = self.put(key, compute(), source=source, fingerprint=fingerprint, spec=spec)
+        return arrays
+
+    def invalidate(self, source: Optional[str] = None):
+        """Drop every entry built from source (or everything when source is None)."""
+        source = os.path.abspath(source) if source else None
+        for key, meta in list(self._entries.items()):
+            if source is None or meta["source"] == source:
+                self._remove(key)
+
+    def _drop_stale(self, source: str, fingerprint: Optional[str]):
+        for key, meta in list(self._entries.items()):
+            if meta["source"] == source and meta["fingerprint"] != fingerprint:
+                self._remove(key)
+
+    def _evict(self, keep: str):
+        total = self.nbytes
+        for key in list(self._entries):
+            if total <= self.max_bytes:
+                break
+            if key != keep:
+                total -= self._entries[key]["nbytes"]
+                self._remove(key)
+
+    def _unmap(self, keep: str):
+        total = self.mapped_bytes
+        for key in list(self._mapped):
+            if total <= self.max_mapped_bytes:
+                break
+            if key != keep:
+                total -= self._entries[key]["nbytes"]
+                del self._mapped[key]
+
+    def _remove(self, key: str):
+        self._entries.pop(key, None)
+        self._mapped.pop(key, None)
+        shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+
+def _scaler_arrays(scaler: StandardScaler) -> Dict[str, np.ndarray]:
+    return {
+        "scaler_mean": scaler.mean_,
+        "scaler_scale": scaler.scale_,
+        "scaler_var": scaler.var_,
+        "scaler_n_samples": np.asarray(scaler.n_samples_seen_),
+    }
+
+def _restore_scaler(arrays: Dict[str, np.ndarray]) -> StandardScaler:
+    scaler = StandardScaler()
+    scaler.mean_ = np.array(arrays["scaler_mean"])
+    scaler.scale_ = np.array(arrays["scaler_scale"])
+    scaler.var_ = np.array(arrays["scaler_var"])
+    scaler.n_samples_seen_ = np.array(arrays["scaler_n_samples"])
+    scaler.n_features_in_ = len(scaler.mean_)
+    return scaler
+
+def cached_preprocess(
+    store: FeatureStore,
+    path: str,
+    feature_cols: Sequence[str],
+    target_col: str,
+    window_size: int = 20,
+    reader: Callable[[str], pd.DataFrame] = pd.read_csv
+) -> Tuple[np.ndarray, np.ndarray, StandardScaler]:
+    """
+    preprocess_data on a tick file, served from the store when the file has
+    not changed. X and y come back as read-only memory maps.
+    """
+    spec = {"kind": "windows", "features": list(feature_cols), "target": target_col, "window": window_size}
+
+    def compute() -> Dict[str, np.ndarray]:
+        X, y, scaler = preprocess_data(reader(path), list(feature_cols), target_col, window_size)
+        return {"X": X, "y": y, **_scaler_arrays(scaler)}
+
+    arrays = store.get_or_compute(path, spec, compute)
+    return arrays["X"], arrays["y"], _restore_scaler(arrays)
+
+def cached_predictions(
+    store: FeatureStore,
+    path: str,
+    feature_spec: Dict[str, Any],
+    model_id: str,
+    predict: Callable[[], np.ndarray]
+) -> np.ndarray:
+    """
+    Model predictions over a tick file, cached per (file, feature spec,
+    model_id). model_id must change whenever the model weights do.
+    """
+    spec = {"kind": "predictions", "features": feature_spec, "model": model_id}
+    return store.get_or_compute(path, spec, lambda: {"predictions": predict()})["predictions"]
+
+# Example usage:
+# store = FeatureStore("cache/features", max_bytes=4 * 1024 ** 3, max_mapped_bytes=1024 ** 3)
+# X, y, scaler = cached_preprocess(store, "data/sample_ticks.csv", ["price", "volume"], "price", window_size=20)
+# preds = cached_predictions(store, "data/sample_ticks.csv", {"window": 20}, "mlp-v1", lambda: server.predict_batch(X))
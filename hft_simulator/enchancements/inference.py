@@ -0,0 +1,142 @@
+import copy
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
+import numpy as np
+import torch
+import torch.nn as nn
+
+BACKENDS = ("eager", "traced", "quantized")
+
+def prepare_model(model: nn.Module, input_dim: int, backend: str = "eager") -> nn.Module:
+    """
+    Inference copy of a model in eval mode; the caller's model is left as is.
+    backend: "eager" (as is), "traced" (TorchScript trace, frozen) or
+             "quantized" (int8 dynamic quantization of the Linear layers, CPU)
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}; expected one of {BACKENDS}")
+    model = copy.deepcopy(model).eval()
+    if backend == "quantized":
+        return torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+    if backend == "traced":
+        with torch.inference_mode():
+            traced = torch.jit.trace(model, torch.zeros(1, input_dim))
+        return torch.jit.freeze(traced)
+    return model
+
+class InferenceServer:
+    """
+    Micro-batching predictor for many symbols. Requests are copied straight
+    into a preallocated input buffer and run in one forward pass when the
+    batch fills or the oldest request has waited time_budget seconds. The
+    loop is synchronous: call poll() (e.g. once per tick) to flush on time,
+    or flush() to force it. Per-request latency (submit to result) is kept
+    for the most recent latency_window requests.
+    """
+    def __init__(
+        self,
+        model: nn.Module,
+        input_dim: int,
+        max_batch_size: int = 256,
+        time_budget: float = 0.0005,
+        backend: str = "eager",
+        latency_window: int = 65536
+    ):
+        # Thread count is process-wide torch state, so it is left to the caller
+        self.model = prepare_model(model, input_dim, backend)
+        self.input_dim = input_dim
+        self.max_batch_size = max_batch_size
+        self.time_budget = time_budget
+        self._inputs = torch.zeros(max_batch_size, input_dim)
+        self._buffer = self._inputs.numpy()  # Same memory as the tensor
+        self._submitted = np.zeros(max_batch_size, dtype=np.int64)  # perf_counter_ns per row
+        self._keys: List[Hashable] = []
+        self._callbacks: List[Optional[Callable[[Hashable, float], None]]] = []
+        self._latencies = np.zeros(latency_window, dtype=np.int64)
+        self._latency_count = 0
+
+    def submit(self, key: Hashable, window: np.ndarray, callback: Optional[Callable[[Hashable, float], None]] = None) -> Optional[Dict[Hashable, float]]:
+        """
+        Queue a prediction for `key` (e.g. a symbol). Returns the batch
+        results if this request filled the batch or exhausted the time
+        budget, otherwise None; callback(key, prediction) fires on flush.
+        """
+        row = len(self._keys)
+        self._buffer[row] = window.reshape(-1)
+        self._submitted[row] = time.perf_counter_ns()
+        self._keys.append(key)
+        self._callbacks.append(callback)
+        if row + 1 == self.max_batch_size:
+            return self.flush()
+        return self.poll()
+
+    def poll(self) -> Optional[Dict[Hashable, float]]:
+        """Flush if the oldest pending request is over its time budget."""
+        if self._keys and time.perf_counter_ns() - self._submitted[0] >= self.time_budget * 1e9:
+            return self.flush()
+        return None
+
+    def flush(self) -> Dict[Hashable, float]:
+        """Run every pending request now; returns key -> prediction."""
+        n = len(self._keys)
+        if n == 0:
+            return {}
+        with torch.inference_mode():
+            preds = self.model(self._inputs[:n]).numpy()[:, 0]
+        self._record_latencies(time.perf_counter_ns() - self._submitted[:n])
+        keys, callbacks = self._keys, self._callbacks
+        self._keys, self._callbacks = [], []
+        results = dict(zip(keys, preds.tolist()))
+        for key, callback, pred in zip(keys, callbacks, preds.tolist()):
+            if callback is not None:
+                callback(key, pred)
+        return results
+
+    def predict(self, window: np.ndarray) -> float:
+        """Single synchronous prediction through the preallocated buffer."""
+        return self.predict_batch(window.reshape(1, -1))[0]
+
+    def predict_batch(self, windows: np.ndarray) -> np.ndarray:
+        """Predictions for a (n, ...) stack of windows, in chunks of max_batch_size."""
+        windows = windows.reshape(len(windows), -1)
+        out = np.empty(len(windows), dtype=np.float32)
+        with torch.inference_mode():
+            for start in range(0, len(windows), self.max_batch_size):
+                chunk = windows[start:start + self.max_batch_size]
+                n = len(chunk)
+                began = time.perf_counter_ns()
+                self._buffer[:n] = chunk
+                out[start:start + n] = self.model(self._inputs[:n]).numpy()[:, 0]
+                self._record_latencies(np.full(n, time.perf_counter_ns() - began))
+        return out
+
+    def _record_latencies(self, latencies: np.ndarray):
+        capacity = len(self._latencies)
+        idx = (self._latency_count + np.arange(len(latencies))) % capacity
+        self._latencies[idx] = latencies
+        self._latency_count += len(latencies)
+
+    def latency_stats(self) -> Dict[str, Any]:
+        """Request latency percentiles in microseconds over the recent window."""
+        recent = self._latencies[:min(self._latency_count, len(self._latencies))]
+        if len(recent) == 0:
+            return {"count": 0}
+        p50, p99, p999 = np.percentile(recent, [50, 99, 99.9]) / 1e3
+        return {
+            "count": self._latency_count,
+            "mean_us": float(recent.mean() / 1e3),
+            "p50_us": float(p50),
+            "p99_us": float(p99),
+            "p99.9_us": float(p999),
+            "max_us": float(recent.max() / 1e3),
+        }
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+# Example usage:
+# server = InferenceServer(model, input_dim=X.shape[1], max_batch_size=512, time_budget=0.0002, backend="traced")
+# for symbol, window in latest_windows.items():
+#     server.submit(symbol, window, callback=on_prediction)
+# server.flush()
+# print(server.latency_stats()["p99_us"])
@@ -1,21 +1,59 @@
 import asyncio
 import random
-from typing import Callable, Any, Coroutine
+import time
+from typing import Callable, Any, Coroutine, Optional
+from hft_simulator.core.clock import EventScheduler, ScheduledEvent
 
 class LatencySimulator:
-    def __init__(self, base_delay: float = 0.001, jitter: float = 0.0005):
+    def __init__(
+        self,
+        base_delay: float = 0.001,
+        jitter: float = 0.0005,
+        scheduler: Optional[EventScheduler] = None
+    ):
         """
         base_delay: base network or processing delay in seconds (e.g., 0.001 for 1ms)
         jitter: max random jitter to add/subtract from base_delay (in seconds)
+        scheduler: if given, delays are simulated time on the scheduler and
+                   nothing sleeps; otherwise delays are real sleeps
         """
         self.base_delay = base_delay
         self.jitter = jitter
+        self.scheduler = scheduler
 
-    async def inject_latency(self):
-        """Simulate network/exchange latency with jitter."""
+    def sample_delay(self) -> float:
+        """Draw one latency sample in seconds."""
         delay = self.base_delay + random.uniform(-self.jitter, self.jitter)
-        delay = max(0, delay)
+        return max(0, delay)
+
+    def delay_call(self, func: Callable, *args) -> Optional[ScheduledEvent]:
+        """
+        Run func(*args) after a sampled delay: as a future scheduler event in
+        simulated mode, or after a blocking sleep in real-time mode.
+        """
+        delay = self.sample_delay()
+        if self.scheduler is not None:
+            return self.scheduler.schedule_in(delay, func, *args)
+        time.sleep(delay)
+        func(*args)
+        return None
+
+    async def inject_latency(self) -> float:
+        """
+        Simulate network/exchange latency with jitter and return the delay.
+        Real-time mode only: the asyncio paths (wrap_async, wrap_sync,
+        async_market_event_stream) cannot advance a scheduler's virtual
+        clock, so with a scheduler this raises rather than silently
+        dropping the latency. Use delay_call there instead.
+        """
+        if self.scheduler is not None:
+            raise RuntimeError(
+                "inject_latency sleeps in real time; with a scheduler, use delay_call "
+                "so the latency is applied on the simulated clock"
+            )
+        delay = self.sample_delay()
         await asyncio.sleep(delay)
+        return delay
 
     async def wrap_async(self, coro_func: Callable[..., Coroutine], *args, **kwargs) -> Any:
         """Wrap an async function, injecting latency before execution."""
@@ -42,4 +80,10 @@ async def async_market_event_stream(event_generator, latency_sim: LatencySimulat
 # async def main():
 #     async for event in async_market_event_stream(market_event_stream(data), latency_sim):
 #         print(event)
+#
+# Simulated time instead of real sleeps:
+# scheduler = EventScheduler()
+# latency_sim = LatencySimulator(base_delay=0.001, jitter=0.0005, scheduler=scheduler)
+# latency_sim.delay_call(order_book.add_order, "BUY", 100.0, 10)
+# scheduler.run()
 #
\ No newline at end of file
@@ -0,0 +1,103 @@
+import json
+import platform
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MiB (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+def run_benchmark(name: str, op: Callable[[int], Any], n: int, warmup: int = 0) -> Dict[str, Any]:
+    """
+    Time n calls of op(i) individually with perf_counter_ns. Latencies go
+    into a preallocated array so the harness does not allocate per call.
+    Returns throughput, latency percentiles (microseconds) and peak RSS.
+    """
+    for i in range(warmup):
+        op(i)
+    latencies = np.empty(n, dtype=np.int64)
+    clock = time.perf_counter_ns
+    started = clock()
+    for i in range(n):
+        t0 = clock()
+        op(i)
+        latencies[i] = clock() - t0
+    elapsed = (clock() - started) / 1e9
+    p50, p99, p999 = np.percentile(latencies, [50, 99, 99.9]) / 1e3
+    return {
+        "name": name,
+        "ops": n,
+        "seconds": elapsed,
+        "ops_per_sec": n / elapsed if elapsed > 0 else float("inf"),
+        "p50_us": float(p50),
+        "p99_us": float(p99),
+        "p99.9_us": float(p999),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def save_baseline(results: List[Dict[str, Any]], path: str):
+    """Write results as a JSON baseline, keyed by benchmark name."""
+    payload = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created": time.time(),
+        "results": {result["name"]: result for result in results},
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+
+def load_baseline(path: str) -> Dict[str, Dict[str, Any]]:
+    with open(path) as f:
+        return json.load(f)["results"]
+
+def compare_to_baseline(
+    results: List[Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float = 0.10
+) -> List[str]:
+    """
+    Regressions beyond threshold (0.10 = 10%): throughput drops or p99
+    latency increases against the baseline. Benchmarks missing from the
+    baseline are skipped.
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(result["name"])
+        if base is None:
+            continue
+        if result["ops_per_sec"] < base["ops_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{result['name']}: ops/sec {result['ops_per_sec']:.0f} vs baseline {base['ops_per_sec']:.0f}"
+            )
+        if result["p99_us"] > base["p99_us"] * (1 + threshold):
+            regressions.append(
+                f"{result['name']}: p99 {result['p99_us']:.2f}us vs baseline {base['p99_us']:.2f}us"
+            )
+    return regressions
+
+def format_results(results: List[Dict[str, Any]]) -> str:
+    """Fixed-width table of benchmark results."""
+    lines = [f"{'benchmark':<24}{'ops/sec':>14}{'p50 us':>10}{'p99 us':>10}{'p99.9 us':>10}{'rss MiB':>10}"]
+    for r in results:
+        rss = f"{r['peak_rss_mb']:.1f}" if r["peak_rss_mb"] is not None else "-"
+        lines.append(
+            f"{r['name']:<24}{r['ops_per_sec']:>14,.0f}{r['p50_us']:>10.2f}{r['p99_us']:>10.2f}{r['p99.9_us']:>10.2f}{rss:>10}"
+        )
+    return "\n".join(lines)
+
+# Example usage:
+# book = OrderBook()
+# result = run_benchmark("order_book_add", lambda i: book.add_order("BUY", 100.0 - i % 50, 10), n=100_000)
+# print(format_results([result]))
+# save_baseline([result], "benchmarks/baseline.json")
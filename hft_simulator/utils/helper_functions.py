@@ -1,6 +1,10 @@
 from datetime import datetime
-from typing import Any, Optional, List, Union
+from typing import Any, Optional, List, Union, Sequence
 import numpy as np
+import pandas as pd
+
+# Supported tick timestamp formats, tried in order
+TIMESTAMP_FORMATS = ("%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d %H:%M:%S")
 
 def normalize_price(price: Union[float, str]) -> float:
     """
@@ -27,13 +31,31 @@ def convert_timestamp(ts: Optional[str]) -> Optional[datetime]:
     """
     if not ts:
         return None
-    for fmt in ("%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d %H:%M:%S"):
+    for fmt in TIMESTAMP_FORMATS:
         try:
             return datetime.strptime(ts, fmt)
         except ValueError:
             continue
     return None
 
+def parse_timestamps(values: Union[Sequence[str], np.ndarray, pd.Series]) -> np.ndarray:
+    """
+    Vectorized convert_timestamp: parse an array of timestamp strings into
+    int64 epoch nanoseconds. Unparseable or empty values become NaT
+    (the int64 minimum), mirroring None from convert_timestamp.
+    """
+    values = pd.Series(values, dtype=object)
+    result = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    pending = values.notna() & (values != "")
+    for fmt in TIMESTAMP_FORMATS:
+        if not pending.any():
+            break
+        parsed = pd.to_datetime(values[pending], format=fmt, errors="coerce")
+        ok = parsed.notna()
+        result[ok.index[ok]] = parsed[ok]
+        pending[ok.index[ok]] = False
+    return result.to_numpy().view(np.int64)
+
 def moving_average(arr: List[float], window: int) -> Optional[float]:
     """
     Compute the moving average of the last 'window' elements in arr.
@@ -72,6 +94,12 @@ def _test_convert_timestamp():
     assert convert_timestamp("2023/01/01 12:00:00") == datetime(2023, 1, 1, 12, 0, 0)
     assert convert_timestamp("bad format") is None
 
+def _test_parse_timestamps():
+    parsed = parse_timestamps(["2023-01-01 12:00:00.123456", "2023/01/01 12:00:00", "bad format", ""])
+    assert parsed[0] == np.datetime64("2023-01-01T12:00:00.123456", "ns").view(np.int64)
+    assert parsed[1] == np.datetime64("2023-01-01T12:00:00", "ns").view(np.int64)
+    assert parsed[2] == parsed[3] == np.iinfo(np.int64).min
+
 def _test_moving_average():
     assert moving_average([1, 2, 3, 4, 5], 3) == 4.0
     assert moving_average([1, 2], 3) is None
@@ -84,6 +112,7 @@ def run_tests():
     _test_normalize_price()
     _test_normalize_volume()
     _test_convert_timestamp()
+    _test_parse_timestamps()
     _test_moving_average()
     _test_min_max_scale()
     print("All utils.py tests passed.")
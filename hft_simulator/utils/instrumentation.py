@@ -0,0 +1,256 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+import numpy as np
+
+class LatencyHistogram:
+    """
+    Fixed-memory log-linear histogram of non-negative integers (nanoseconds),
+    in the style of HdrHistogram. Values below 2**sub_bucket_bits are exact;
+    above that each power of two is split into 2**(sub_bucket_bits - 1)
+    buckets, so recorded values keep about 2**-(sub_bucket_bits - 1)
+    relative precision. Recording is a few integer ops and one increment.
+    """
+    def __init__(self, max_value: int = 60 * 10 ** 9, sub_bucket_bits: int = 7):
+        self.max_value = max_value
+        self._sub_bits = sub_bucket_bits
+        self._half_bits = sub_bucket_bits - 1
+        n_buckets = self._index(max_value) + 1
+        self.counts = np.zeros(n_buckets, dtype=np.int64)
+        idx = np.arange(n_buckets)
+        shift = np.maximum((idx >> self._half_bits) - 1, 0)
+        self._lower = np.where(idx < (2 << self._half_bits), idx, (idx - (shift << self._half_bits)) << shift)
+        self._upper = self._lower + (1 << shift) - 1  # Highest value equivalent to each bucket
+        self.count = 0
+        self.total = 0
+        self.min = max_value
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        shift = value.bit_length() - self._sub_bits
+        if shift <= 0:
+            return value
+        return (shift << self._half_bits) + (value >> shift)
+
+    def record(self, value: int):
+        if value > self.max_value:
+            value = self.max_value
+        elif value < 0:
+            value = 0
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> int:
+        """Highest value equivalent to the q-th percentile (0-100); 0 when empty."""
+        if self.count == 0:
+            return 0
+        rank = max(int(np.ceil(q / 100.0 * self.count)), 1)
+        idx = int(np.searchsorted(np.cumsum(self.counts), rank))
+        return int(min(self._upper[idx], self.max))
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add another histogram with the same layout into this one."""
+        self.counts += other.counts
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def reset(self):
+        self.counts[:] = 0
+        self.count = self.total = self.max = 0
+        self.min = self.max_value
+
+    def summary(self, quantiles=(50, 90, 99, 99.9)) -> Dict[str, float]:
+        """Count, mean, min/max and quantiles in microseconds."""
+        stats = {"count": self.count, "mean_us": self.mean() / 1e3}
+        stats["min_us"] = (self.min if self.count else 0) / 1e3
+        stats["max_us"] = self.max / 1e3
+        for q in quantiles:
+            stats[f"p{q:g}_us"] = self.percentile(q) / 1e3
+        return stats
+
+class Span:
+    """
+    Reusable timer for one stage: `with span: ...` records the elapsed
+    nanoseconds. One instance per stage, so timing allocates nothing; not
+    reentrant across threads.
+    """
+    __slots__ = ("histogram", "_start")
+
+    def __init__(self, histogram: LatencyHistogram):
+        self.histogram = histogram
+        self._start = 0
+
+    def __enter__(self) -> "Span":
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.record(time.perf_counter_ns() - self._start)
+
+class Instrumentation:
+    """
+    Opt-in stage timing for the tick-to-trade pipeline. Hot-path code is
+    only touched when enabled: instrument() replaces a method on one
+    instance with a timed wrapper, and does nothing when disabled, so a
+    disabled run executes the original code unchanged. Manual spans use
+    `t0 = time.perf_counter_ns()` ... `record(stage, t0)` behind a check of
+    `enabled`.
+    """
+    def __init__(self, enabled: bool = True, max_value: int = 60 * 10 ** 9, sub_bucket_bits: int = 7):
+        self.enabled = enabled
+        self.max_value = max_value
+        self.sub_bucket_bits = sub_bucket_bits
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._spans: Dict[str, Span] = {}
+
+    def histogram(self, stage: str) -> LatencyHistogram:
+        hist = self.histograms.get(stage)
+        if hist is None:
+            hist = self.histograms[stage] = LatencyHistogram(self.max_value, self.sub_bucket_bits)
+        return hist
+
+    def span(self, stage: str) -> Span:
+        """Reusable context manager timing one stage."""
+        span = self._spans.get(stage)
+        if span is None:
+            span = self._spans[stage] = Span(self.histogram(stage))
+        return span
+
+    def record(self, stage: str, start_ns: int):
+        """Record time since start_ns (a perf_counter_ns reading) for a stage."""
+        self.histogram(stage).record(time.perf_counter_ns() - start_ns)
+
+    def wrap(self, stage: str, func: Callable) -> Callable:
+        """Timed version of func (func itself when disabled)."""
+        if not self.enabled:
+            return func
+        record = self.histogram(stage).record
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(clock() - start)
+        timed.__wrapped__ = func
+        return timed
+
+    def timed_stream(self, stage: str, stream):
+        """Iterate stream, timing each next() (e.g. market data parsing)."""
+        if not self.enabled:
+            yield from stream
+            return
+        record = self.histogram(stage).record
+        clock = time.perf_counter_ns
+        iterator = iter(stream)
+        while True:
+            start = clock()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            record(clock() - start)
+            yield item
+
+    def instrument(self, obj: Any, method: str, stage: Optional[str] = None):
+        """Time obj.method on this instance only (no-op when disabled)."""
+        if self.enabled:
+            setattr(obj, method, self.wrap(stage or method, getattr(obj, method)))
+
+    def instrument_pipeline(self, order_book: Any = None, risk_manager: Any = None, engine: Any = None):
+        """Time the standard stages: check_order, send_order and match_orders."""
+        if order_book is not None:
+            self.instrument(order_book, "match_orders")
+        if risk_manager is not None:
+            self.instrument(risk_manager, "check_order")
+        if engine is not None:
+            self.instrument(engine, "send_order")
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {stage: hist.summary() for stage, hist in self.histograms.items()}
+
+    def format_summary(self) -> str:
+        lines = [f"{'stage':<20}{'count':>10}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}{'p99.9 us':>10}{'max us':>10}"]
+        for stage, s in self.summary().items():
+            lines.append(
+                f"{stage:<20}{s['count']:>10}{s['mean_us']:>10.2f}{s['p50_us']:>10.2f}"
+                f"{s['p99_us']:>10.2f}{s['p99.9_us']:>10.2f}{s['max_us']:>10.2f}"
+            )
+        return "\n".join(lines)
+
+    def to_prometheus(self, metric: str = "hft_stage_latency_seconds", quantiles=(0.5, 0.9, 0.99, 0.999)) -> str:
+        """Prometheus text exposition: one summary per stage, in seconds."""
+        lines = [f"# HELP {metric} Stage latency in seconds.", f"# TYPE {metric} summary"]
+        for stage, hist in self.histograms.items():
+            for q in quantiles:
+                lines.append(f'{metric}{{stage="{stage}",quantile="{q:g}"}} {hist.percentile(q * 100) / 1e9:.9f}')
+            lines.append(f'{metric}_sum{{stage="{stage}"}} {hist.total / 1e9:.9f}')
+            lines.append(f'{metric}_count{{stage="{stage}"}} {hist.count}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, **kwargs):
+        """Write to_prometheus() atomically (e.g. for a node_exporter textfile collector)."""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.to_prometheus(**kwargs))
+        os.replace(tmp, path)
+
+    def reset(self):
+        for hist in self.histograms.values():
+            hist.reset()
+
+class PeriodicExporter:
+    """Background thread exporting an Instrumentation every interval seconds."""
+    def __init__(
+        self,
+        instrumentation: Instrumentation,
+        interval: float = 10.0,
+        path: Optional[str] = None,
+        callback: Optional[Callable[[str], None]] = None
+    ):
+        self.instrumentation = instrumentation
+        self.interval = interval
+        self.path = path
+        self.callback = callback
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="instrumentation-export", daemon=True)
+        self._thread.start()
+
+    def export(self):
+        if self.path is not None:
+            self.instrumentation.write_prometheus(self.path)
+        if self.callback is not None:
+            self.callback(self.instrumentation.format_summary())
+
+    def close(self):
+        """Stop and export one final time."""
+        self._stop.set()
+        self._thread.join()
+        self.export()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.export()
+
+DISABLED = Instrumentation(enabled=False)
+
+# Example usage:
+# instr = Instrumentation(enabled=True)
+# instr.instrument_pipeline(order_book=book, risk_manager=risk, engine=engine)
+# signal_func = instr.wrap("signal", generate_signal)
+# with instr.span("tick_to_trade"):
+#     on_tick(tick)
+# print(instr.format_summary())
+# instr.write_prometheus("metrics/hft.prom")
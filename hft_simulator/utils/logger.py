@@ -1,8 +1,104 @@
+import json
 import logging
-from typing import Optional
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+class JsonLinesWriter:
+    """
+    Background writer for hot-path logging. Producers only push a tuple
+    onto a SimpleQueue; the writer thread formats records as JSON lines,
+    writes them in batches with one flush per batch and rotates the file
+    once it passes max_bytes (filename.1 ... filename.<backup_count>).
+    """
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int = 64 * 1024 ** 2,
+        backup_count: int = 5,
+        batch_size: int = 4096,
+        flush_interval: float = 0.1
+    ):
+        self.filename = filename
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self._queue: "queue.SimpleQueue[Optional[Tuple]]" = queue.SimpleQueue()
+        self._file = open(filename, "a", encoding="utf-8")
+        self._size = self._file.tell()
+        self._thread = threading.Thread(target=self._run, name="sim-log-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, record: Tuple):
+        self._queue.put(record)
+
+    def close(self):
+        """Write everything still queued and stop the thread."""
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+
+    def _run(self):
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is None
+            self._write([record for record in batch if record is not None])
+            if stop:
+                return
+
+    def _write(self, records):
+        if not records:
+            return
+        data = "".join(json.dumps(_to_dict(record), default=str, separators=(",", ":")) + "\n" for record in records)
+        self._file.write(data)
+        self._file.flush()
+        self.written += len(records)
+        self._size += len(data)
+        if self._size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        self._file.close()
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                src = f"{self.filename}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.filename}.{i + 1}")
+            os.replace(self.filename, self.filename + ".1")
+        self._file = open(self.filename, "w", encoding="utf-8")
+        self._size = 0
+
+def _to_dict(record: Tuple) -> Dict[str, Any]:
+    """(time, level, msg, args) log records or (time, "EVENT", kind, fields) events."""
+    ts, level, msg, args = record
+    if level == "EVENT":
+        return {"t": ts, "event": msg, **args}
+    if args:
+        try:
+            msg = msg % args
+        except (TypeError, ValueError):
+            msg = f"{msg} {args}"
+    return {"t": ts, "level": level, "msg": msg}
 
 class SimLogger:
     _logger: Optional[logging.Logger] = None
+    _writer: Optional[JsonLinesWriter] = None
+    # Cheap level checks for hot paths: `if SimLogger.debug_enabled: ...`
+    level: int = logging.INFO
+    debug_enabled: bool = False
+    info_enabled: bool = True
 
     @classmethod
     def setup(
@@ -13,8 +109,10 @@ class SimLogger:
         filename: str = "simulation.log"
     ):
         """Configure the central logger."""
+        cls.shutdown()
         cls._logger = logging.getLogger(name)
         cls._logger.setLevel(level)
+        cls._set_level(level)
         formatter = logging.Formatter(
             "[%(asctime)s][%(levelname)s][%(name)s] %(message)s",
             "%Y-%m-%d %H:%M:%S"
@@ -35,19 +133,74 @@ class SimLogger:
             cls._logger.addHandler(fh)
 
     @classmethod
-    def info(cls, msg: str):
-        if cls._logger:
-            cls._logger.info(msg)
+    def setup_hot_path(
+        cls,
+        filename: str = "simulation.jsonl",
+        level: int = logging.INFO,
+        name: str = "Simulator",
+        max_bytes: int = 64 * 1024 ** 2,
+        backup_count: int = 5,
+        batch_size: int = 4096,
+        flush_interval: float = 0.1
+    ):
+        """
+        Log JSON lines through a background writer thread instead of stdlib
+        handlers. Calls on the trading thread only check the level and queue
+        the unformatted message and args.
+        """
+        cls.shutdown()
+        cls._logger = logging.getLogger(name)  # Only handed out by get_logger
+        cls._set_level(level)
+        cls._writer = JsonLinesWriter(filename, max_bytes, backup_count, batch_size, flush_interval)
+
+    @classmethod
+    def shutdown(cls):
+        """Drain and stop the hot-path writer, if any."""
+        if cls._writer is not None:
+            cls._writer.close()
+            cls._writer = None
+
+    @classmethod
+    def _set_level(cls, level: int):
+        cls.level = level
+        cls.debug_enabled = level <= logging.DEBUG
+        cls.info_enabled = level <= logging.INFO
+
+    @classmethod
+    def _log(cls, level: int, msg: str, args: tuple):
+        if cls._writer is not None:
+            cls._writer.put((time.time(), logging.getLevelName(level), msg, args))
+        elif cls._logger:
+            cls._logger.log(level, msg, *args)
+
+    @classmethod
+    def info(cls, msg: str, *args: Any):
+        """Log msg % args; formatting is deferred until the record is written."""
+        if cls.info_enabled:
+            cls._log(logging.INFO, msg, args)
+
+    @classmethod
+    def debug(cls, msg: str, *args: Any):
+        if cls.debug_enabled:
+            cls._log(logging.DEBUG, msg, args)
 
     @classmethod
-    def debug(cls, msg: str):
-        if cls._logger:
-            cls._logger.debug(msg)
+    def error(cls, msg: str, *args: Any):
+        if cls.level <= logging.ERROR:
+            cls._log(logging.ERROR, msg, args)
 
     @classmethod
-    def error(cls, msg: str):
-        if cls._logger:
-            cls._logger.error(msg)
+    def event(cls, kind: str, **fields: Any):
+        """
+        Structured record (e.g. "order", "fill") written as one JSON object
+        in hot-path mode, or as an INFO line otherwise.
+        """
+        if not cls.info_enabled:
+            return
+        if cls._writer is not None:
+            cls._writer.put((time.time(), "EVENT", kind, fields))
+        elif cls._logger:
+            cls._logger.info("%s %s", kind, fields)
 
     @classmethod
     def get_logger(cls) -> logging.Logger:
@@ -60,3 +213,9 @@ class SimLogger:
 # SimLogger.info("Simulation started.")
 # SimLogger.debug("Order book updated.")
 # SimLogger.error("Order rejected due to risk limits.")
+#
+# Hot path: background JSON-lines writer with rotation
+# SimLogger.setup_hot_path("logs/sim.jsonl", max_bytes=256 * 1024 ** 2)
+# SimLogger.event("fill", order_id=order.id, price=price, volume=volume)
+# SimLogger.debug("book %s best bid %s", symbol, bid)  # Not formatted unless written
+# SimLogger.shutdown()
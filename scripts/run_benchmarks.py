@@ -0,0 +1,160 @@
+# run_benchmarks.py
+"""
+Seeded microbenchmarks for the simulator hot paths.
+
+    python scripts/run_benchmarks.py                       # run and print
+    python scripts/run_benchmarks.py --save baseline.json  # record a baseline
+    python scripts/run_benchmarks.py --baseline baseline.json --threshold 0.1
+
+Exits with status 1 when any benchmark regresses past the threshold.
+"""
+import argparse
+import os
+import sys
+import tempfile
+from typing import Any, Callable, Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hft_simulator.core.backtest import Backtester
+from hft_simulator.core.execution import ExecutionEngine, OrderStatus
+from hft_simulator.core.market_data import load_market_data
+from hft_simulator.core.order_book import OrderBook
+from hft_simulator.core.risk_management import RiskLimits, RiskManager
+from hft_simulator.core.strategy import StrategyConfig, generate_signal
+from hft_simulator.enchancements.advanced_order_matching import SmartOrderRouter, Venue
+from hft_simulator.utils.benchmark import compare_to_baseline, format_results, load_baseline, run_benchmark, save_baseline
+
+# Each workload gets (rng, scale, workdir) and returns (op, n): setup happens
+# outside the timed loop; workdir is a scratch directory removed after the run
+Workload = Callable[[np.random.Generator, float, str], Tuple[Callable[[int], Any], int]]
+
+def _orders(rng: np.random.Generator, n: int, mid: float = 100.0):
+    sides = np.where(rng.random(n) < 0.5, "BUY", "SELL")
+    offsets = rng.integers(1, 50, n) * 0.01
+    prices = np.where(sides == "BUY", mid - offsets, mid + offsets).round(2).tolist()
+    volumes = rng.integers(1, 100, n).tolist()
+    return sides.tolist(), prices, volumes
+
+def order_book_add(rng, scale, workdir):
+    n = int(200_000 * scale)
+    sides, prices, volumes = _orders(rng, n)
+    book = OrderBook()
+    return (lambda i: book.add_order(sides[i], prices[i], volumes[i])), n
+
+def order_book_cancel(rng, scale, workdir):
+    n = int(200_000 * scale)
+    sides, prices, volumes = _orders(rng, n)
+    book = OrderBook()
+    ids = [book.add_order(s, p, v) for s, p, v in zip(sides, prices, volumes)]
+    ids = [ids[j] for j in rng.permutation(n)]
+    return (lambda i: book.cancel_order(ids[i])), n
+
+def order_book_match(rng, scale, workdir):
+    n = int(100_000 * scale)
+    sides, prices, volumes = _orders(rng, 2 * n)
+    book = OrderBook()
+    for i in range(n):
+        book.add_order(sides[i], prices[i], volumes[i])
+    # Marketable orders crossing up to 50 ticks through the touch
+    aggressive = np.where(np.array(sides[n:]) == "BUY", 100.5, 99.5).tolist()
+
+    def op(i):
+        book.add_order(sides[n + i], aggressive[i], volumes[n + i])
+        book.match_orders()
+    return op, n
+
+def execution_send(rng, scale, workdir):
+    n = int(200_000 * scale)
+    sides, prices, volumes = _orders(rng, n)
+    filled = {"status": OrderStatus.FILLED}
+    engine = ExecutionEngine(order_book_callback=lambda order: filled, latency=0.0)
+    return (lambda i: engine.send_order("AAPL", sides[i], prices[i], volumes[i])), n
+
+def risk_check(rng, scale, workdir):
+    n = int(500_000 * scale)
+    sides, _, volumes = _orders(rng, n)
+    symbols = [f"SYM{k}" for k in rng.integers(0, 100, n)]
+    risk = RiskManager(RiskLimits(max_position=1_000, max_order_size=90, stop_loss=-1e9), lambda msg: None)
+    return (lambda i: risk.check_order(symbols[i], sides[i], volumes[i])), n
+
+def backtest_run(rng, scale, workdir):
+    ticks = max(int(2_000 * scale), 50)
+    data = pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-02 09:30", periods=ticks, freq="s"),
+        "price": 100 + rng.normal(0, 0.05, ticks).cumsum(),
+    })
+    filled = {"status": "FILLED"}
+    config = StrategyConfig(short_window=5, long_window=20)
+
+    def op(i):
+        Backtester(data, generate_signal, lambda side, price, volume: filled, config).run()
+    return op, 5
+
+def market_data_load(rng, scale, workdir):
+    ticks = int(100_000 * scale)
+    path = os.path.join(workdir, "ticks.csv")
+    sides, prices, volumes = _orders(rng, ticks)
+    pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-02 09:30", periods=ticks, freq="ms").strftime("%Y-%m-%d %H:%M:%S.%f"),
+        "symbol": "AAPL", "price": prices, "volume": volumes, "side": sides,
+    }).to_csv(path, index=False)
+    return (lambda i: load_market_data(path)), 5
+
+def router_route(rng, scale, workdir):
+    n = int(50_000 * scale)
+    venues = [Venue("NYSE", 0.0002), Venue("NASDAQ", 0.0001), Venue("BATS", 0.00015)]
+    for venue in venues:
+        for k in range(1, 51):
+            venue.add_order("SELL", 100.0 + k * 0.01, 10 * n)
+            venue.add_order("BUY", 100.0 - k * 0.01, 10 * n)
+    router = SmartOrderRouter(venues)
+    sides, _, volumes = _orders(rng, n)
+    limits = [100.2 if side == "BUY" else 99.8 for side in sides]
+    return (lambda i: router.route_order(sides[i], limits[i], volumes[i])), n
+
+WORKLOADS: Dict[str, Workload] = {
+    "order_book_add": order_book_add,
+    "order_book_cancel": order_book_cancel,
+    "order_book_match": order_book_match,
+    "execution_send": execution_send,
+    "risk_check_order": risk_check,
+    "backtest_run": backtest_run,
+    "load_market_data": market_data_load,
+    "router_route_order": router_route,
+}
+
+def run_all(names: List[str], scale: float = 1.0, seed: int = 42) -> List[Dict[str, Any]]:
+    results = []
+    with tempfile.TemporaryDirectory(prefix="hft-bench-") as workdir:
+        for name in names:
+            op, n = WORKLOADS[name](np.random.default_rng(seed), scale, workdir)
+            results.append(run_benchmark(name, op, n))
+    return results
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Simulator hot-path benchmarks")
+    parser.add_argument("--only", nargs="*", choices=sorted(WORKLOADS), help="benchmarks to run (default: all)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply workload sizes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save", help="write results to this JSON baseline")
+    parser.add_argument("--baseline", help="compare against this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed regression (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    results = run_all(args.only or list(WORKLOADS), args.scale, args.seed)
+    print(format_results(results))
+    if args.save:
+        save_baseline(results, args.save)
+    if args.baseline:
+        regressions = compare_to_baseline(results, load_baseline(args.baseline), args.threshold)
+        for line in regressions:
+            print("REGRESSION", line)
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
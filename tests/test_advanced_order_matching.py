@@ -0,0 +1,108 @@
+# tests/test_advanced_order_matching.py
+import pytest
+from hft_simulator.core.clock import EventScheduler
+from hft_simulator.core.order_book import FillBuffer
+from hft_simulator.enchancements.advanced_order_matching import Venue, SmartOrderRouter, ParentOrderScheduler
+
+def _venues():
+    cheap, pricey = Venue("A", fee=0.001), Venue("B", fee=0.0005)
+    cheap.order_book.add_order("SELL", 100.0, 5)
+    cheap.order_book.add_order("SELL", 100.2, 5)
+    pricey.order_book.add_order("SELL", 100.0, 3)
+    pricey.order_book.add_order("SELL", 100.1, 4)
+    pricey.order_book.add_order("BUY", 99.0, 10)
+    return cheap, pricey
+
+def test_venue_top_of_book():
+    cheap, pricey = _venues()
+    assert cheap.get_best_price("SELL") == 100.0
+    assert pricey.get_best_price("BUY") == 99.0
+    assert cheap.get_best_price("BUY") is None
+
+def test_venue_reports_fills_beyond_ring_capacity():
+    venue = Venue("A")
+    venue.order_book.fills = FillBuffer(capacity=4)
+    for k in range(10):
+        venue.order_book.add_order("SELL", 100.0 + k * 0.01, 1)
+    assert venue.add_order("BUY", 101.0, 12)["filled"] == 10
+    assert venue.add_order("SELL", 99.0, 3)["filled"] == 2
+
+def test_route_order_sweeps_depth_by_price_then_fee():
+    cheap, pricey = _venues()
+    router = SmartOrderRouter([cheap, pricey])
+    results = router.route_order("BUY", 100.1, 15)
+
+    fills = [(r["order"]["venue"], r["order"]["price"], r["filled"]) for r in results]
+    # Lower fee wins the tie at 100.0; 100.2 is through the limit
+    assert fills == [("B", 100.0, 3), ("A", 100.0, 5), ("B", 100.1, 4), ("A", 100.1, 0)]
+    assert results[-1]["order"]["volume"] == 3
+    assert cheap.order_book.get_best_bid() == (100.1, 3)
+    assert pricey.get_best_price("SELL") is None
+
+def test_route_order_passive_when_nothing_crosses():
+    cheap, pricey = _venues()
+    router = SmartOrderRouter([cheap, pricey])
+    results = router.route_order("SELL", 99.5, 4)
+    assert len(results) == 1 and results[0]["filled"] == 0
+    assert cheap.order_book.get_best_ask() == (99.5, 4)
+
+def test_iceberg_refreshes_only_after_fills():
+    venue = Venue("A")
+    scheduler = EventScheduler()
+    parents = ParentOrderScheduler(SmartOrderRouter([venue]), scheduler)
+    parent_id = parents.iceberg("BUY", 100.0, total_volume=25, display_size=10)
+    parent = parents.parents[parent_id]
+    assert venue.order_book.get_best_bid() == (100.0, 10)
+    assert parent.unsent == 15
+
+    # A partial fill does not refresh; completing the slice does
+    venue.order_book.add_order("SELL", 100.0, 4)
+    scheduler.run()
+    assert venue.order_book.get_best_bid() == (100.0, 6)
+    venue.order_book.add_order("SELL", 100.0, 6)
+    scheduler.run()
+    assert venue.order_book.get_best_bid() == (100.0, 10)
+    assert (parent.filled, parent.unsent) == (10, 5)
+
+    venue.order_book.add_order("SELL", 100.0, 30)
+    scheduler.run()
+    assert parent.done and parent.unsent == 0
+    assert venue.order_book.get_best_ask() == (100.0, 15)
+    assert parent_id not in parents.parents  # Finished parents are dropped
+
+def test_twap_and_vwap_slices_on_sim_clock():
+    venue = Venue("A")
+    venue.order_book.add_order("BUY", 100.0, 1000)
+    scheduler = EventScheduler()
+    parents = ParentOrderScheduler(SmartOrderRouter([venue]), scheduler)
+    twap = parents.parents[parents.twap("SELL", 100.0, 10, start=0.0, end=60.0, slices=3)]
+    vwap = parents.parents[parents.vwap("SELL", 100.0, 10, start=0.0, end=60.0, volume_profile=[1, 3, 1])]
+    assert twap.slice_volumes == [3, 4, 3]
+    assert vwap.slice_volumes == [2, 6, 2]
+    assert len(scheduler) == 2  # One pending wake-up per parent
+
+    scheduler.run_until(20.0)
+    assert (twap.filled, vwap.filled) == (7, 8)
+    scheduler.run()
+    assert twap.done and vwap.done and scheduler.now == 40.0
+
+def test_parent_inputs_are_validated_and_cancel_drops_parent():
+    venue = Venue("A")
+    scheduler = EventScheduler()
+    parents = ParentOrderScheduler(SmartOrderRouter([venue]), scheduler)
+    with pytest.raises(ValueError):
+        parents.twap("SELL", 100.0, 10, start=0.0, end=60.0, slices=0)
+    for profile in ([], [0, 0], [1, -1]):
+        with pytest.raises(ValueError):
+            parents.vwap("SELL", 100.0, 10, start=0.0, end=60.0, volume_profile=profile)
+    with pytest.raises(ValueError):
+        parents.iceberg("BUY", 100.0, total_volume=10, display_size=0)
+    assert parents.parents == {}
+
+    twap_id = parents.twap("BUY", 99.0, 10, start=0.0, end=60.0, slices=2)
+    scheduler.run_until(0.0)
+    assert venue.order_book.get_best_bid() == (99.0, 5)
+    assert parents.cancel(twap_id) and not parents.cancel(twap_id)
+    scheduler.run()
+    assert venue.order_book.get_best_bid() is None  # Resting child cancelled, second slice never sent
+    assert parents.parents == {}
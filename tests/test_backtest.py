@@ -1,7 +1,9 @@
 # tests/test_backtest.py
+import numpy as np
 import pandas as pd
 from hft_simulator.core.execution import ExecutionEngine
 from hft_simulator.core.backtest import Backtester
+from hft_simulator.core.strategy import StrategyConfig, generate_signal, ma_crossover_signals
 
 def test_performance_metrics():
     engine = ExecutionEngine()
@@ -22,3 +24,24 @@ def test_performance_metrics():
     assert "Sharpe" in metrics
     assert isinstance(metrics["PnL"], (float, int))
     assert isinstance(metrics["Sharpe"], (float, int))
+
+def test_vectorized_run_matches_event_loop():
+    rng = np.random.default_rng(7)
+    data = pd.DataFrame({
+        "timestamp": pd.date_range("2023-01-01 09:30", periods=500, freq="s"),
+        "price": 100 + np.cumsum(rng.normal(0, 0.1, 500)).round(2),
+    })
+    config = StrategyConfig(short_window=3, long_window=8)
+
+    def mock_execution(side, price, volume):
+        return {"status": "FILLED"}
+
+    looped = Backtester(data, generate_signal, mock_execution, config).run()
+    vectorized = Backtester(data, generate_signal, mock_execution, config).run_vectorized(ma_crossover_signals)
+
+    assert len(looped.trades) > 10
+    assert vectorized.trades == looped.trades
+    pd.testing.assert_series_equal(vectorized.equity_curve, looped.equity_curve, check_exact=True)
+    assert vectorized.pnl == looped.pnl
+    assert vectorized.sharpe == looped.sharpe
+    assert vectorized.max_drawdown == looped.max_drawdown
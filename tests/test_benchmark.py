@@ -0,0 +1,19 @@
+# tests/test_benchmark.py
+from hft_simulator.utils.benchmark import compare_to_baseline, load_baseline, run_benchmark, save_baseline
+
+def test_run_benchmark_reports_percentiles():
+    calls = []
+    result = run_benchmark("noop", calls.append, n=1000, warmup=10)
+    assert len(calls) == 1010
+    assert result["ops"] == 1000 and result["ops_per_sec"] > 0
+    assert result["p50_us"] <= result["p99_us"] <= result["p99.9_us"]
+
+def test_baseline_round_trip_and_regressions(tmp_path):
+    base = {"name": "book", "ops_per_sec": 1000.0, "p99_us": 10.0}
+    path = str(tmp_path / "baseline.json")
+    save_baseline([base], path)
+    baseline = load_baseline(path)
+    assert compare_to_baseline([{"name": "book", "ops_per_sec": 950.0, "p99_us": 10.5}], baseline, 0.10) == []
+    regressions = compare_to_baseline([{"name": "book", "ops_per_sec": 800.0, "p99_us": 12.0}], baseline, 0.10)
+    assert len(regressions) == 2
+    assert compare_to_baseline([{"name": "new", "ops_per_sec": 1.0, "p99_us": 1e9}], baseline) == []
@@ -0,0 +1,75 @@
+# tests/test_clock.py
+import asyncio
+import time
+from datetime import datetime
+import pytest
+from hft_simulator.core.clock import EventScheduler, event_time, schedule_event_stream
+from hft_simulator.core.tick_store import NAT_NS, datetime_to_ns
+from hft_simulator.enchancements.latency import LatencySimulator
+
+def test_events_run_in_time_order():
+    scheduler = EventScheduler()
+    seen = []
+    scheduler.schedule_at(2.0, seen.append, "b")
+    scheduler.schedule_at(1.0, seen.append, "a")
+    scheduler.schedule_at(2.0, seen.append, "c")
+    cancelled = scheduler.schedule_at(1.5, seen.append, "x")
+    cancelled.cancel()
+    assert len(scheduler) == 3
+
+    scheduler.run_until(1.5)
+    assert seen == ["a"] and scheduler.now == 1.5
+    scheduler.run()
+    assert seen == ["a", "b", "c"] and scheduler.now == 2.0
+
+def test_simulated_latency_does_not_sleep():
+    scheduler = EventScheduler()
+    latency = LatencySimulator(base_delay=5.0, jitter=0.0, scheduler=scheduler)
+    seen = []
+    start = time.perf_counter()
+    for i in range(1000):
+        latency.delay_call(seen.append, i)
+    scheduler.run()
+    assert time.perf_counter() - start < 1.0
+    assert seen == list(range(1000))
+    assert scheduler.now == 5.0
+
+def test_async_latency_refuses_simulated_mode():
+    latency = LatencySimulator(base_delay=5.0, jitter=0.0, scheduler=EventScheduler())
+    with pytest.raises(RuntimeError):
+        asyncio.run(latency.wrap_sync(print, "unreachable"))
+
+def test_market_events_interleave_with_delayed_orders():
+    scheduler = EventScheduler()
+    ticks = [{"timestamp": datetime(2023, 1, 1, 9, 30, s), "price": p} for s, p in ((0, 100.0), (1, 101.0))]
+    log = []
+
+    def on_tick(tick):
+        log.append(("tick", tick["price"]))
+        if tick["price"] == 100.0:
+            scheduler.schedule_in(0.5, log.append, ("order", 100.0))
+
+    schedule_event_stream(scheduler, ticks, on_tick)
+    scheduler.run()
+    assert log == [("tick", 100.0), ("order", 100.0), ("tick", 101.0)]
+
+def test_epoch_ns_timestamps_match_datetimes():
+    start = datetime(2024, 1, 2, 9, 30)
+    ticks = [{"timestamp": datetime_to_ns(datetime(2024, 1, 2, 9, 30, s)), "price": p} for s, p in ((0, 100.0), (1, 101.0))]
+    scheduler = EventScheduler(start_time=event_time(start))
+    log = []
+
+    def on_tick(tick):
+        log.append(("tick", tick["price"], scheduler.now))
+        if tick["price"] == 100.0:
+            scheduler.schedule_in(0.5, log.append, ("order", 100.0, None))
+
+    schedule_event_stream(scheduler, ticks, on_tick)
+    scheduler.run()
+    assert [entry[:2] for entry in log] == [("tick", 100.0), ("order", 100.0), ("tick", 101.0)]
+    assert log[2][2] == event_time(start) + 1.0
+
+def test_missing_timestamps_raise():
+    for ts in (None, NAT_NS, float("nan")):
+        with pytest.raises(ValueError):
+            event_time(ts)
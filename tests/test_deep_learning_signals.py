@@ -0,0 +1,60 @@
+# tests/test_deep_learning_signals.py
+import numpy as np
+import pandas as pd
+import torch
+from hft_simulator.enchancements.deep_learning_signals import (
+    build_window_dataset, make_loader, make_windows, preprocess_data, train_model, train_windowed_model
+)
+
+def _frame(n=60):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"price": 100 + rng.normal(size=n).cumsum(), "volume": rng.integers(1, 100, n)})
+
+def test_preprocess_matches_loop():
+    df = _frame()
+    X, y, scaler = preprocess_data(df, ["price", "volume"], "price", window_size=5)
+    features = scaler.transform(df[["price", "volume"]])
+    expected = np.array([features[i - 5:i].flatten() for i in range(5, len(df))])
+    assert np.array_equal(X, expected)
+    assert np.array_equal(y, df["price"].to_numpy()[5:])
+
+def test_short_history_gives_no_samples():
+    df = _frame(3)
+    X, y, _ = preprocess_data(df, ["price", "volume"], "price", window_size=5)
+    assert X.shape == (0, 10) and y.shape == (0,)
+    dataset, _ = build_window_dataset(df, ["price", "volume"], "price", window_size=5)
+    assert len(dataset) == 0
+
+def test_windows_are_views():
+    features = np.arange(20.0).reshape(10, 2)
+    windows = make_windows(features, 3)
+    assert windows.shape == (8, 3, 2)
+    assert np.shares_memory(windows, features)
+    assert np.array_equal(windows[2], features[2:5])
+
+def test_window_dataset_batches():
+    df = _frame()
+    X, y, _ = preprocess_data(df, ["price", "volume"], "price", window_size=5)
+    dataset, _ = build_window_dataset(df, ["price", "volume"], "price", window_size=5)
+    assert len(dataset) == len(X)
+    x0, y0 = dataset[3]
+    assert np.allclose(x0.numpy(), X[3]) and np.isclose(y0.item(), y[3])
+    batches = list(make_loader(dataset, batch_size=16, shuffle=False))
+    assert sum(len(xb) for xb, _ in batches) == len(X)
+    assert np.allclose(torch.cat([xb for xb, _ in batches]).numpy(), X, atol=1e-6)
+    assert batches[0][1].shape == (16, 1)
+
+def test_minibatch_training_reduces_loss():
+    df = _frame(200)
+    X, y, _ = preprocess_data(df, ["price", "volume"], "price", window_size=5)
+    torch.manual_seed(0)
+    threads = torch.get_num_threads()
+    model = train_model(X, y, input_dim=X.shape[1], epochs=30, batch_size=32, seed=0, num_threads=threads + 1)
+    assert torch.get_num_threads() == threads
+    dataset, _ = build_window_dataset(df, ["price", "volume"], "price", window_size=5)
+    torch.manual_seed(0)
+    windowed = train_windowed_model(dataset, epochs=30, batch_size=32, seed=0)
+    with torch.no_grad():
+        for m in (model, windowed):
+            mse = float(((m(torch.as_tensor(X, dtype=torch.float32)).squeeze(1).numpy() - y) ** 2).mean())
+            assert mse < float(((y - 0) ** 2).mean())
@@ -1,5 +1,6 @@
 # tests/test_execution.py
-from hft_simulator.core.execution import ExecutionEngine
+from hft_simulator.core.clock import EventScheduler
+from hft_simulator.core.execution import ExecutionEngine, OrderStatus
 
 def test_order_execution():
     engine = ExecutionEngine()
@@ -20,3 +21,49 @@ def test_risk_check_execution():
         engine.send_order("BUY", 100, 10)
     # Assume risk_check returns False if position > 100 shares
     assert not engine.risk_check()
+
+def test_send_order_with_simulated_latency():
+    scheduler = EventScheduler()
+    arrivals = []
+
+    def order_book(order):
+        arrivals.append((scheduler.now, order.id))
+        return {"status": OrderStatus.FILLED}
+
+    engine = ExecutionEngine(order_book, latency=10.0, scheduler=scheduler)
+    first = engine.send_order("AAPL", "BUY", 100.0, 10)
+    second = engine.send_order("AAPL", "SELL", 101.0, 5)
+    assert engine.get_order_status(first) == OrderStatus.NEW
+
+    engine.cancel_order(second)  # Cancelled while in flight
+    scheduler.run()
+    assert arrivals == [(10.0, first)]
+    assert engine.get_order_status(first) == OrderStatus.FILLED
+    assert engine.get_order_status(second) == OrderStatus.CANCELLED
+
+def test_partial_fills_and_archival():
+    responses = iter([
+        {"status": OrderStatus.PARTIALLY_FILLED, "filled_volume": 4, "price": 100.0},
+        {"status": OrderStatus.FILLED},
+        {"status": OrderStatus.REJECTED},
+    ])
+    engine = ExecutionEngine(lambda order: next(responses), latency=0.0)
+    partial = engine.send_order("AAPL", "BUY", 101.0, 10)
+    filled = engine.send_order("AAPL", "SELL", 102.0, 5)
+    rejected = engine.send_order("MSFT", "BUY", 300.0, 1)
+
+    order = engine.orders[partial]
+    assert (order.status, order.filled, order.leaves) == (OrderStatus.PARTIALLY_FILLED, 4, 6)
+    assert engine.apply_fill(partial, 6, 101.0)
+    assert order.avg_price == (4 * 100.0 + 6 * 101.0) / 10
+
+    # Terminal orders leave the hot dict but stay queryable
+    assert engine.orders == {}
+    assert len(engine.store.archive) == 3
+    assert engine.get_order_status(rejected) == OrderStatus.REJECTED
+    assert engine.store.archive.get(partial)["avg_price"] == order.avg_price
+    assert engine.get_order(filled).filled == 5
+
+    positions = []
+    engine.update_position(filled, lambda o: positions.append((o.symbol, o.side, o.filled)))
+    assert positions == [("AAPL", "SELL", 5)]
@@ -0,0 +1,59 @@
+# tests/test_feature_store.py
+import os
+import numpy as np
+import pandas as pd
+from hft_simulator.enchancements.deep_learning_signals import preprocess_data
+from hft_simulator.enchancements.feature_store import FeatureStore, cached_predictions, cached_preprocess
+
+def _write_ticks(path, n=50, seed=0):
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({"price": 100 + rng.normal(size=n).cumsum(), "volume": rng.integers(1, 100, n)}).to_csv(path, index=False)
+
+def test_cached_preprocess_hits_and_matches(tmp_path):
+    ticks = str(tmp_path / "ticks.csv")
+    _write_ticks(ticks)
+    store = FeatureStore(str(tmp_path / "store"))
+    X, y, scaler = cached_preprocess(store, ticks, ["price", "volume"], "price", window_size=5)
+    X2, y2, scaler2 = cached_preprocess(store, ticks, ["price", "volume"], "price", window_size=5)
+    assert (store.hits, store.misses) == (1, 1)
+    assert isinstance(X2, np.memmap)
+    expected_X, expected_y, _ = preprocess_data(pd.read_csv(ticks), ["price", "volume"], "price", 5)
+    assert np.array_equal(X2, expected_X) and np.array_equal(y2, expected_y)
+    assert np.allclose(scaler2.transform([[100.0, 10]]), scaler.transform([[100.0, 10]]))
+    # A different window is a different entry
+    cached_preprocess(store, ticks, ["price", "volume"], "price", window_size=3)
+    assert len(store) == 2
+    # Reopening the store sees the same entries
+    assert len(FeatureStore(str(tmp_path / "store"))) == 2
+
+def test_source_change_invalidates(tmp_path):
+    ticks = str(tmp_path / "ticks.csv")
+    _write_ticks(ticks)
+    store = FeatureStore(str(tmp_path / "store"))
+    X, _, _ = cached_preprocess(store, ticks, ["price"], "price", window_size=5)
+    _write_ticks(ticks, n=60, seed=1)
+    os.utime(ticks, ns=(0, os.stat(ticks).st_mtime_ns + 10 ** 9))
+    X2, _, _ = cached_preprocess(store, ticks, ["price"], "price", window_size=5)
+    assert store.misses == 2 and len(X2) == 55
+    assert len(store) == 1  # The entry for the old file was dropped
+
+def test_lru_eviction_under_budget(tmp_path):
+    ticks = str(tmp_path / "ticks.csv")
+    _write_ticks(ticks)
+    store = FeatureStore(str(tmp_path / "store"), max_bytes=2 * 800)
+    calls = []
+    for model_id in ("a", "b", "a", "c"):
+        cached_predictions(store, ticks, {"window": 5}, model_id, lambda: calls.append(1) or np.zeros(100))
+    assert len(calls) == 3  # "a" was served from the store the second time
+    assert len(store) == 2 and store.nbytes <= store.max_bytes
+    cached_predictions(store, ticks, {"window": 5}, "a", lambda: calls.append(1) or np.zeros(100))
+    assert len(calls) == 3  # "b" was least recently used, not "a"
+
+def test_mapped_entries_stay_under_ram_budget(tmp_path):
+    store = FeatureStore(str(tmp_path / "store"), max_mapped_bytes=2 * 800)
+    for key in ("a", "b", "c"):
+        store.put(key, {"x": np.full(100, ord(key), dtype=np.float64)})
+    assert len(store) == 3 and store.mapped_bytes <= store.max_mapped_bytes
+    assert store.get("c") is store.get("c")  # Mapped entries are reused, not reopened
+    assert store.get("a")["x"][0] == ord("a")  # Unmapped entries reload from disk
+    assert store.mapped_bytes <= store.max_mapped_bytes
@@ -0,0 +1,61 @@
+# tests/test_gateway.py
+import asyncio
+import time
+from hft_simulator.core.execution import ExecutionEngine, OrderStatus
+from hft_simulator.core.gateway import AsyncOrderGateway
+
+def test_orders_are_pipelined_in_batches():
+    calls = []
+
+    def order_book(order):
+        calls.append(order.id)
+        return {"status": OrderStatus.FILLED}
+
+    engine = ExecutionEngine(order_book, latency=0.05)
+
+    async def main():
+        async with AsyncOrderGateway(engine) as gateway:
+            ids = gateway.send_orders([("AAPL", "BUY", 100.0, 1)] * 200)
+            assert engine.get_order_status(ids[0]) == OrderStatus.NEW
+            statuses = await asyncio.gather(*(gateway.completion(i) for i in ids))
+        return ids, statuses
+
+    start = time.perf_counter()
+    ids, statuses = asyncio.run(main())
+    # 200 orders share one round-trip instead of paying 200 * 50ms
+    assert time.perf_counter() - start < 1.0
+    assert statuses == [OrderStatus.FILLED] * 200
+    assert calls == ids
+
+def test_bulk_cancel_and_errors():
+    def order_book(order):
+        if order.volume > 100:
+            raise ValueError("too big")
+        return {"status": OrderStatus.FILLED}
+
+    engine = ExecutionEngine(order_book, latency=0.0)
+
+    async def main():
+        gateway = AsyncOrderGateway(engine, batch_interval=0.001)
+        ids = gateway.send_orders([
+            ("AAPL", "BUY", 100.0, 1), ("AAPL", "BUY", 99.0, 1), ("AAPL", "BUY", 98.0, 500)
+        ])
+        # Still queued in the gateway, so cancelled without being sent
+        gateway.cancel_orders([ids[1]])
+        futures = [gateway.completion(i) for i in ids]
+        await gateway.flush()
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        # Already handled by the book, so this cancel has no effect
+        gateway.cancel_order(ids[0])
+        await gateway.close()
+        return ids, results
+
+    ids, (kept, dropped, failed) = asyncio.run(main())
+    assert kept == OrderStatus.FILLED
+    assert dropped == OrderStatus.CANCELLED
+    assert isinstance(failed, ValueError)
+    assert engine.get_order_status(ids[0]) == OrderStatus.FILLED
+    assert engine.get_order_status(ids[2]) == OrderStatus.REJECTED
+    # Every order is terminal, so none stays in the live dict
+    assert not engine.orders
+    assert len(engine.store.archive) == 3
@@ -0,0 +1,57 @@
+# tests/test_indicators.py
+import numpy as np
+import pytest
+from hft_simulator.core.indicators import SMA, EMA, RollingStd, ZScore, VWAP
+from hft_simulator.core.strategy import SIGNAL_CODES, StrategyConfig, MACrossoverStrategy, generate_signal, ma_crossover_signals
+
+PRICES = list(100 + np.cumsum(np.random.default_rng(3).normal(0, 0.5, 200)))
+
+def test_sma_matches_window_mean():
+    sma = SMA(5)
+    for i, price in enumerate(PRICES):
+        value = sma.update(price)
+        if i < 4:
+            assert value is None
+        else:
+            assert value == pytest.approx(np.mean(PRICES[i - 4:i + 1]))
+
+def test_rolling_std_and_zscore():
+    std, z = RollingStd(10), ZScore(10)
+    for i, price in enumerate(PRICES):
+        s, score = std.update(price), z.update(price)
+        if i >= 9:
+            window = PRICES[i - 9:i + 1]
+            assert s == pytest.approx(np.std(window))
+            assert score == pytest.approx((price - np.mean(window)) / np.std(window))
+
+def test_ema_and_vwap():
+    ema = EMA(span=3)
+    assert ema.update(10.0) == 10.0
+    assert ema.update(14.0) == 12.0
+
+    vwap = VWAP(window=2)
+    assert vwap.update(10.0, 1) == 10.0
+    assert vwap.update(20.0, 3) == 17.5
+    assert vwap.update(30.0, 1) == 22.5
+    assert VWAP().update(10.0, 0) is None
+
+def test_ma_crossover_strategy_matches_generate_signal():
+    config = StrategyConfig(short_window=3, long_window=8)
+    strategy = MACrossoverStrategy(config)
+    signals = [strategy.on_tick(p) for p in PRICES]
+    expected = [generate_signal(PRICES[:i + 1], config) for i in range(len(PRICES))]
+    assert signals == expected
+
+def test_ma_crossover_strategy_matches_generate_signal_on_tick_prices():
+    # Tick-quantized walks produce exact MA ties that float noise must not break
+    config = StrategyConfig(short_window=3, long_window=8)
+    rng = np.random.default_rng(11)
+    codes = {code: signal for signal, code in SIGNAL_CODES.items()}
+    for _ in range(50):
+        prices = list(100 + np.cumsum(rng.choice([-0.01, 0.0, 0.01], 300)))
+        strategy = MACrossoverStrategy(config)
+        signals = [strategy.on_tick(p) for p in prices]
+        expected = [generate_signal(prices[:i + 1], config) for i in range(len(prices))]
+        assert signals == expected
+        assert [codes[c] for c in ma_crossover_signals(np.array(prices), config)] == expected
+    assert "HOLD" in expected[config.long_window:]
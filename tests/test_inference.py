@@ -0,0 +1,47 @@
+# tests/test_inference.py
+import numpy as np
+import pytest
+import torch
+from hft_simulator.enchancements.deep_learning_signals import PricePredictorNN, predict_next
+from hft_simulator.enchancements.inference import InferenceServer
+
+def _model(input_dim=10):
+    torch.manual_seed(0)
+    return PricePredictorNN(input_dim)
+
+def test_micro_batch_flushes_when_full():
+    model = _model()
+    server = InferenceServer(model, input_dim=10, max_batch_size=3, time_budget=60.0)
+    windows = np.random.default_rng(0).normal(size=(3, 5, 2)).astype(np.float32)
+    seen = {}
+    assert server.submit("AAPL", windows[0], lambda k, p: seen.__setitem__(k, p)) is None
+    assert server.submit("MSFT", windows[1]) is None
+    results = server.submit("GOOG", windows[2])
+    assert set(results) == {"AAPL", "MSFT", "GOOG"}
+    assert len(server) == 0
+    assert seen["AAPL"] == pytest.approx(results["AAPL"])
+    assert results["MSFT"] == pytest.approx(predict_next(model, windows[1]), abs=1e-5)
+
+def test_server_does_not_touch_callers_model():
+    model = _model()
+    model.train()
+    server = InferenceServer(model, input_dim=10)
+    assert model.training and not server.model.training
+    assert server.model is not model
+
+def test_time_budget_and_stats():
+    server = InferenceServer(_model(), input_dim=10, max_batch_size=64, time_budget=0.0)
+    results = server.submit("AAPL", np.zeros(10, dtype=np.float32))
+    assert list(results) == ["AAPL"]
+    assert server.flush() == {}
+    stats = server.latency_stats()
+    assert stats["count"] == 1 and stats["p99_us"] > 0
+
+@pytest.mark.parametrize("backend", ["traced", "quantized"])
+def test_backends_match_eager(backend):
+    model = _model()
+    windows = np.random.default_rng(1).normal(size=(300, 10)).astype(np.float32)
+    eager = InferenceServer(model, input_dim=10, max_batch_size=128).predict_batch(windows)
+    other = InferenceServer(model, input_dim=10, max_batch_size=128, backend=backend).predict_batch(windows)
+    assert np.allclose(eager, other, atol=0.05)
+    assert InferenceServer(model, input_dim=10).predict(windows[0]) == pytest.approx(eager[0], abs=1e-5)
@@ -0,0 +1,53 @@
+# tests/test_instrumentation.py
+import numpy as np
+from hft_simulator.core.market_data import feed_events_to_order_book
+from hft_simulator.core.order_book import OrderBook
+from hft_simulator.core.risk_management import RiskLimits, RiskManager
+from hft_simulator.utils.instrumentation import Instrumentation, LatencyHistogram
+
+def test_histogram_percentiles_within_precision():
+    hist = LatencyHistogram(sub_bucket_bits=7)
+    values = np.random.default_rng(0).integers(1, 5_000_000, 20_000)
+    for v in values.tolist():
+        hist.record(v)
+    assert hist.count == 20_000 and hist.max == values.max()
+    for q in (50, 99, 99.9):
+        exact = np.percentile(values, q)
+        assert abs(hist.percentile(q) - exact) / exact < 0.02
+    assert hist.percentile(100) == values.max()
+    # Small values are exact
+    small = LatencyHistogram()
+    for v in (3, 3, 7):
+        small.record(v)
+    assert small.percentile(50) == 3 and small.percentile(100) == 7
+
+def test_disabled_mode_leaves_methods_untouched():
+    risk = RiskManager(RiskLimits(100, 50, -1000.0), lambda msg: None)
+    instr = Instrumentation(enabled=False)
+    instr.instrument(risk, "check_order")
+    assert "check_order" not in vars(risk)
+    assert instr.wrap("x", len) is len
+
+def test_pipeline_stages_and_prometheus(tmp_path):
+    book = OrderBook()
+    risk = RiskManager(RiskLimits(100, 50, -1000.0), lambda msg: None)
+    instr = Instrumentation()
+    instr.instrument_pipeline(order_book=book, risk_manager=risk)
+
+    def on_tick(tick):
+        if risk.check_order("AAPL", tick["side"], tick["volume"]):
+            book.add_order(tick["side"], tick["price"], tick["volume"])
+            book.match_orders()
+
+    ticks = [{"side": "BUY" if i % 2 else "SELL", "price": 100.0, "volume": 5} for i in range(10)]
+    feed_events_to_order_book(ticks, on_tick, instrumentation=instr)
+    summary = instr.summary()
+    assert {"check_order", "match_orders", "market_data", "tick_to_trade"} <= set(summary)
+    assert summary["tick_to_trade"]["count"] == 10
+    with instr.span("manual"):
+        pass
+    path = str(tmp_path / "hft.prom")
+    instr.write_prometheus(path)
+    text = open(path).read()
+    assert 'hft_stage_latency_seconds_count{stage="check_order"} 10' in text
+    assert 'quantile="0.99"' in text
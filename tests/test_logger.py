@@ -0,0 +1,35 @@
+# tests/test_logger.py
+import json
+import logging
+from hft_simulator.utils.logger import JsonLinesWriter, SimLogger
+
+class Exploding:
+    def __str__(self):
+        raise AssertionError("formatted a disabled record")
+
+def test_hot_path_writes_json_lines(tmp_path):
+    path = str(tmp_path / "sim.jsonl")
+    SimLogger.setup_hot_path(path, level=logging.INFO)
+    try:
+        assert SimLogger.info_enabled and not SimLogger.debug_enabled
+        SimLogger.info("order %s at %.2f", 7, 101.5)
+        SimLogger.debug("never %s", Exploding())
+        SimLogger.event("fill", order_id=7, price=101.5, volume=3)
+    finally:
+        SimLogger.shutdown()
+    records = [json.loads(line) for line in open(path)]
+    assert [r.get("msg") for r in records] == ["order 7 at 101.50", None]
+    assert records[0]["level"] == "INFO"
+    assert records[1]["event"] == "fill" and records[1]["volume"] == 3
+
+def test_writer_rotates_by_size(tmp_path):
+    path = str(tmp_path / "sim.jsonl")
+    writer = JsonLinesWriter(path, max_bytes=200, backup_count=2, batch_size=1)
+    for i in range(30):
+        writer.put((0.0, "INFO", "message number %d", (i,)))
+    writer.close()
+    assert writer.written == 30
+    assert (tmp_path / "sim.jsonl.1").exists() and (tmp_path / "sim.jsonl.2").exists()
+    assert not (tmp_path / "sim.jsonl.3").exists()
+    newest = [json.loads(line)["msg"] for name in (path + ".1", path) for line in open(name)]
+    assert newest[-1] == "message number 29"
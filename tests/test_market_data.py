@@ -0,0 +1,87 @@
+# tests/test_market_data.py
+import gzip
+import os
+import time
+import numpy as np
+from hft_simulator.core import market_data
+from hft_simulator.core.order_book import OrderBook
+from hft_simulator.core.tick_store import store_path_for, is_store_fresh
+
+CSV_ROWS = [
+    "timestamp,symbol,price,volume,side",
+    "2023-01-01 09:30:00.250000,AAPL,150.5,10,BUY",
+    "2023-01-01 09:30:01,MSFT,310.0,5,SELL",
+    ",AAPL,150.6,7,BUY",
+]
+
+def _write_csv(tmp_path, monkeypatch, rows=CSV_ROWS):
+    monkeypatch.setattr(market_data, "DATA_DIR", str(tmp_path))
+    path = tmp_path / "ticks.csv"
+    path.write_text("\n".join(rows) + "\n")
+    return str(path)
+
+def test_columnar_store_roundtrip(tmp_path, monkeypatch):
+    path = _write_csv(tmp_path, monkeypatch)
+    expected = market_data.load_market_data("ticks.csv")
+
+    ticks = market_data.load_market_data("ticks.csv", columnar=True)
+    assert is_store_fresh(path)
+    assert isinstance(ticks.price, np.memmap)
+    assert ticks.timestamp.dtype == np.int64
+    assert ticks.symbols == ["AAPL", "MSFT"]
+    assert list(ticks.symbol) == [0, 1, 0]
+
+    # Later loads transparently use the binary store
+    assert market_data.load_market_data("ticks.csv") == expected
+
+def test_stale_store_is_ignored(tmp_path, monkeypatch):
+    path = _write_csv(tmp_path, monkeypatch)
+    market_data.convert_csv_to_columnar("ticks.csv")
+    marker_time = time.time() - 10
+    os.utime(os.path.join(store_path_for(path), "dictionary.json"), (marker_time, marker_time))
+    assert not is_store_fresh(path)
+    data = market_data.load_market_data("ticks.csv")
+    assert data[0]["symbol"] == "AAPL"
+    assert data[2]["timestamp"] is None
+
+def test_streaming_matches_full_load(tmp_path, monkeypatch):
+    rows = CSV_ROWS + ["2023/01/01 09:30:02,MSFT,311.0,3,BUY"]
+    _write_csv(tmp_path, monkeypatch, rows)
+    expected = market_data.load_market_data("ticks.csv")
+    with gzip.open(tmp_path / "ticks.csv.gz", "wt") as f:
+        f.write("\n".join(rows) + "\n")
+
+    batches = list(market_data.read_tick_batches(str(tmp_path / "ticks.csv.gz"), batch_size=2))
+    assert [len(b["price"]) for b in batches] == [2, 2]
+    assert batches[1]["timestamp"][0] == np.iinfo(np.int64).min
+    assert list(market_data.stream_market_data("ticks.csv.gz", batch_size=2)) == expected
+
+def test_merge_sources_and_dispatch(tmp_path, monkeypatch):
+    monkeypatch.setattr(market_data, "DATA_DIR", str(tmp_path))
+    header = "timestamp,symbol,price,volume,side"
+    (tmp_path / "AAPL.csv").write_text("\n".join([
+        header,
+        "2023-01-01 09:30:00,AAPL,150.0,10,BUY",
+        "2023-01-01 09:30:02,AAPL,151.0,4,SELL",
+        "2023-01-01 09:30:04,AAPL,149.0,3,SELL",
+    ]) + "\n")
+    (tmp_path / "MSFT.csv").write_text("\n".join([
+        header,
+        "2023-01-01 09:30:01,MSFT,310.0,5,SELL",
+        "2023-01-01 09:30:03,MSFT,309.0,2,BUY",
+    ]) + "\n")
+    market_data.convert_csv_to_columnar("MSFT.csv")
+    paths = [str(tmp_path / "AAPL.csv"), str(tmp_path / "MSFT.csv.cols")]
+
+    events = list(market_data.merge_tick_sources(paths, batch_size=1))
+    assert [e["symbol"] for e in events] == ["AAPL", "MSFT", "AAPL", "MSFT", "AAPL"]
+    assert [e["timestamp"].second for e in events] == [0, 1, 2, 3, 4]
+
+    books = {"AAPL": OrderBook(), "MSFT": OrderBook()}
+    market_data.feed_events_to_order_book(
+        market_data.merge_tick_sources(paths), market_data.make_symbol_dispatcher(books)
+    )
+    assert books["AAPL"].get_best_bid() == (150.0, 7)
+    assert books["AAPL"].get_best_ask() == (151.0, 4)
+    assert books["MSFT"].get_best_ask() == (310.0, 5)
+    assert books["MSFT"].get_best_bid() == (309.0, 2)
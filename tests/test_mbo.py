@@ -0,0 +1,103 @@
+# tests/test_mbo.py
+import numpy as np
+import pytest
+from hft_simulator.core.mbo import (
+    ADD, CANCEL, CLEAR, EXECUTE, MBO_DTYPE, MODIFY, MBOApplier, check_book_consistency, load_mbo_file, write_mbo_file
+)
+from hft_simulator.core.order_book import OrderBook
+
+def _feed(n=5000, seed=0):
+    """Consistent synthetic L3 feed (bids below 100, asks above) and its final per-price volumes."""
+    rng = np.random.default_rng(seed)
+    live = {}
+    rows = []
+    next_id = 10 ** 9  # Well clear of ids allocated by other tests
+    for t in range(n):
+        r = rng.random()
+        if not live or r < 0.5:
+            side = 1 if rng.random() < 0.5 else -1
+            price = 100.0 - side * int(rng.integers(1, 20)) * 0.01
+            volume = int(rng.integers(1, 100))
+            next_id += 1
+            live[next_id] = [side, price, volume]
+            rows.append((t, next_id, price, volume, ADD, side))
+            continue
+        oid = list(live)[int(rng.integers(len(live)))]
+        side, price, volume = live[oid]
+        if r < 0.7:
+            rows.append((t, oid, np.nan, 0, CANCEL, 0))
+            del live[oid]
+        elif r < 0.85:
+            executed = int(rng.integers(1, volume + 1))
+            rows.append((t, oid, np.nan, executed, EXECUTE, 0))
+            live[oid][2] -= executed
+            if live[oid][2] == 0:
+                del live[oid]
+        else:
+            new_price = 100.0 - side * int(rng.integers(1, 20)) * 0.01
+            new_volume = int(rng.integers(1, 100))
+            rows.append((t, oid, new_price, new_volume, MODIFY, 0))
+            live[oid] = [side, new_price, new_volume]
+    expected = {}
+    for side, price, volume in live.values():
+        expected[(side, round(price, 2))] = expected.get((side, round(price, 2)), 0) + volume
+    return np.array(rows, dtype=MBO_DTYPE), expected
+
+def _volumes(book):
+    out = {}
+    for side, book_side in ((1, book.bids), (-1, book.asks)):
+        for level in book_side.iter_levels():
+            out[(side, round(level.price, 2))] = level.volume
+    return out
+
+def test_replay_file_rebuilds_book(tmp_path):
+    records, expected = _feed()
+    path = str(tmp_path / "feed.mbo")
+    write_mbo_file(path, records[:2000])
+    write_mbo_file(path, records[2000:], append=True)
+    loaded = load_mbo_file(path)
+    assert len(loaded) == len(records) and np.array_equal(loaded["order_id"], records["order_id"])
+    book = OrderBook()
+    applier = MBOApplier(book, check_every=1)
+    stats = applier.replay(path, batch_size=512)
+    assert _volumes(book) == expected
+    assert stats["messages"] == len(records) and stats["msgs_per_sec"] > 0
+    assert all(v == 0 for v in stats["errors"].values())
+    assert applier.inconsistencies == []
+
+def test_bad_messages_execute_and_clear():
+    book = OrderBook()
+    fills = []
+    book.subscribe(fills.append)
+    applier = MBOApplier(book)
+    applier.apply(np.array([
+        (0, 1, 99.0, 10, ADD, 1),
+        (1, 1, 99.0, 10, ADD, 1),        # Duplicate id
+        (2, 7, np.nan, 0, CANCEL, 0),    # Unknown id
+        (3, 1, 99.5, 4, EXECUTE, 0),     # Trade at an explicit price
+        (4, 1, np.nan, 2, CANCEL, 0),    # Partial cancel
+        (5, 2, 101.0, 5, ADD, -1),
+        (6, 0, np.nan, 0, 9, 0),         # Unknown type
+        (7, 2, np.nan, 8, EXECUTE, 0),   # Executes more than the 5 resting
+    ], dtype=MBO_DTYPE))
+    assert applier.errors["duplicate_add"] == 1 and applier.errors["unknown_order"] == 1
+    assert applier.errors["unknown_type"] == 1 and applier.errors["bad_volume"] == 1
+    assert book.get_best_bid() == (99.0, 4) and book.get_best_ask() is None
+    assert fills[-1].resting_id == 2 and fills[-1].volume == 5
+    fills.pop()
+    assert fills[-1].resting_id == 1 and fills[-1].price == 99.5 and fills[-1].aggressor_id == 0
+    assert check_book_consistency(book) == []
+    applier.apply(np.array([(8, 0, np.nan, 0, CLEAR, 0)], dtype=MBO_DTYPE))
+    assert book.get_best_bid() is None and book.get_best_ask() is None and not book.order_map
+
+def test_consistency_check_detects_corruption():
+    book = OrderBook()
+    book.add_order("BUY", 99.0, 5, order_id=42)
+    book.bids.best.volume += 1
+    assert any("volume" in problem for problem in check_book_consistency(book))
+
+def test_bad_file_rejected(tmp_path):
+    path = tmp_path / "bad.mbo"
+    path.write_bytes(b"not an mbo file at all")
+    with pytest.raises(ValueError):
+        load_mbo_file(str(path))
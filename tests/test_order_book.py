@@ -20,3 +20,86 @@ def test_order_cancellation():
     ob.add_bid(100, 10)
     ob.cancel_order('bid', 100)  # Presume cancel_order is implemented
     assert ob.best_bid() is None
+
+def test_price_time_priority_and_cancel():
+    ob = OrderBook()
+    first = ob.add_order("BUY", 100.0, 5)
+    second = ob.add_order("BUY", 100.0, 7)
+    ob.add_order("BUY", 99.0, 3)
+    assert ob.get_best_bid() == (100.0, 12)
+
+    # Cancel removes the order and its level immediately
+    assert ob.cancel_order(first)
+    assert not ob.cancel_order(first)
+    assert ob.get_best_bid() == (100.0, 7)
+    assert ob.cancel_order(second)
+    assert ob.get_best_bid() == (99.0, 3)
+    assert len(ob.bids) == 1
+
+def test_matching_fills_oldest_order_first():
+    ob = OrderBook()
+    first = ob.add_order("SELL", 101.0, 5)
+    second = ob.add_order("SELL", 101.0, 5)
+    ob.add_order("BUY", 101.0, 7)
+    assert first not in ob.order_map
+    assert ob.order_map[second].volume == 3
+    assert ob.get_best_ask() == (101.0, 3)
+    assert ob.get_best_bid() is None
+
+def test_modify_order():
+    ob = OrderBook()
+    first = ob.add_order("SELL", 101.0, 5)
+    second = ob.add_order("SELL", 101.0, 5)
+
+    # Reducing volume keeps queue priority, repricing loses it
+    assert ob.modify_order(first, 101.0, 2)
+    assert ob.get_best_ask() == (101.0, 7)
+    assert ob.modify_order(second, 100.5, 5)
+    assert ob.get_best_ask() == (100.5, 5)
+    assert ob.modify_order(second, 101.0, 5)
+    assert list(ob.asks.levels[101.0].orders) == [first, second]
+    assert not ob.modify_order("missing", 100.0, 1)
+
+def test_fill_events():
+    ob = OrderBook(fill_capacity=4)
+    received = []
+    ob.subscribe(received.append)
+    resting = ob.add_order("SELL", 101.0, 5)
+    second = ob.add_order("SELL", 102.0, 5)
+    aggressor = ob.add_order("BUY", 102.0, 8)
+
+    assert [(f.aggressor_id, f.resting_id, f.price, f.volume) for f in received] == [
+        (aggressor, resting, 101.0, 5),
+        (aggressor, second, 102.0, 3),
+    ]
+    assert [f.seq for f in received] == [1, 2]
+    assert received[0].aggressor_side == "BUY"
+    assert list(ob.fills.since(0)["volume"]) == [5, 3]
+    assert list(ob.fills.since(1)["seq"]) == [1, 2]
+    assert list(ob.fills.since(2)["seq"]) == [2]
+    assert len(ob.fills.since(3)) == 0
+    assert list(ob.fills.latest(1)["seq"]) == [2]
+
+    # The ring buffer only retains the most recent fills
+    for _ in range(5):
+        ob.add_order("SELL", 100.0, 1)
+        ob.add_order("BUY", 100.0, 1)
+    assert ob.fills.count == 7
+    assert list(ob.fills.since(0)["seq"]) == [4, 5, 6, 7]
+    assert list(ob.fills.since(2)["seq"]) == [4, 5, 6, 7]  # Older fills were overwritten
+    assert list(ob.fills.since(6)["seq"]) == [6, 7]
+    assert list(ob.fills.latest(3)["seq"]) == [5, 6, 7]
+
+def test_depth():
+    ob = OrderBook()
+    ob.add_order("BUY", 99.0, 1)
+    ob.add_order("BUY", 100.0, 2)
+    ob.add_order("BUY", 100.0, 3)
+    ob.add_order("BUY", 98.0, 4)
+    ob.add_order("SELL", 101.0, 6)
+    depth = ob.depth(2)
+    assert list(depth["bid_prices"]) == [100.0, 99.0]
+    assert list(depth["bid_volumes"]) == [5, 1]
+    assert list(depth["ask_prices"]) == [101.0]
+    assert list(depth["ask_volumes"]) == [6]
+    assert len(ob.depth(0)["bid_prices"]) == 0
@@ -0,0 +1,53 @@
+# tests/test_order_store.py
+import time
+import numpy as np
+from hft_simulator.core.execution import Order, OrderStatus
+from hft_simulator.core.order_store import OrderArchive, OrderStore
+
+def test_archive_grows_and_queries():
+    archive = OrderArchive(capacity=2)
+    orders = [Order("AAPL" if i % 2 else "MSFT", "BUY", 100.0 + i, 10) for i in range(5)]
+    # Orders become terminal out of id order
+    for when, order in enumerate(reversed(orders)):
+        order.status = OrderStatus.CANCELLED
+        archive.append(order, when=float(when))
+    assert len(archive) == 5
+    assert archive.get(orders[2].id)["price"] == 102.0
+    assert archive.get(-1) is None
+    window = archive.between(2.0, 4.0)
+    assert list(window["time"]) == [2.0, 3.0]
+    assert archive.symbols == ["MSFT", "AAPL"]
+
+def test_store_retire(tmp_path):
+    store = OrderStore()
+    order = Order("AAPL", "BUY", 100.0, 10)
+    store.add(order)
+    assert store.get_status(order.id) == OrderStatus.NEW
+    order.status = OrderStatus.FILLED
+    store.retire(order, when=1.0)
+    assert len(store) == 0
+    assert order.id in store
+    assert store.get_status(order.id) == OrderStatus.FILLED
+
+    store.archive.save(tmp_path / "archive.npz")
+    saved = np.load(tmp_path / "archive.npz", allow_pickle=True)
+    assert list(saved["id"]) == [order.id]
+
+def test_lookup_cost_does_not_grow_with_archive():
+    def per_lookup(n):
+        archive = OrderArchive()
+        orders = [Order("AAPL", "BUY", 100.0, 1) for _ in range(n + 2000)]
+        for order in orders:
+            order.status = OrderStatus.FILLED
+        for order in orders[:n]:
+            archive.append(order, when=0.0)
+        archive.find(orders[0].id)
+        start = time.perf_counter()
+        # Interleaved append + lookup, as after each retirement in a session
+        for order in orders[n:]:
+            archive.append(order, when=0.0)
+            assert archive.find(order.id) is not None
+        return time.perf_counter() - start
+
+    small, large = min(per_lookup(1_000) for _ in range(3)), min(per_lookup(100_000) for _ in range(3))
+    assert large < 3 * small
@@ -0,0 +1,29 @@
+# tests/test_orders.py
+import pytest
+from hft_simulator.core.orders import Order, OrderIdMap
+from hft_simulator.core.execution import Order as ExecutionOrder, OrderStatus
+
+def test_order_ids_are_monotonic_integers():
+    first = Order("BUY", 100.0, 10)
+    second = ExecutionOrder("AAPL", "SELL", 101.0, 5)
+    assert isinstance(first.id, int)
+    assert second.id > first.id
+    assert second.symbol == "AAPL"
+    assert second.status == OrderStatus.NEW
+
+def test_orders_have_no_instance_dict():
+    order = ExecutionOrder("AAPL", "BUY", 100.0, 10)
+    with pytest.raises(AttributeError):
+        order.extra = 1
+
+def test_order_id_map():
+    ids = OrderIdMap()
+    order = Order("BUY", 100.0, 10)
+    external = ids.external_id(order.id)
+    assert ids.external_id(order.id) == external
+    assert ids.internal_id(external) == order.id
+    ids.register(order.id + 1, "venue-42")
+    assert ids.internal_id("venue-42") == order.id + 1
+    ids.discard(order.id)
+    assert ids.internal_id(external) is None
+    assert len(ids) == 1
@@ -1,5 +1,8 @@
 # tests/test_risk_management.py
-from hft_simulator.core.risk_management import RiskManager
+import threading
+import time
+import numpy as np
+from hft_simulator.core.risk_management import AlertDispatcher, PortfolioRiskManager, RiskLimits, RiskManager
 
 def test_risk_limits():
     risk_manager = RiskManager(max_position=100)
@@ -9,3 +12,122 @@ def test_risk_limits():
     
     # Test scenario exceeding limits
     assert risk_manager.assess_risk(150) is False
+
+def test_portfolio_batch_checks():
+    alerts = []
+    risk = PortfolioRiskManager(["AAPL", "MSFT"], RiskLimits(100, 50, -1000.0), alerts.append)
+    risk.update_position("AAPL", "BUY", 80, 10.0)
+
+    accepted = risk.check_orders(
+        np.array([0, 1, 0, 1, 0]),
+        np.array([1, 1, -1, -1, 1]),
+        np.array([10, 60, 30, 40, 40]),
+    )
+    # AAPL: 90 ok, 60 ok, 100 ok; MSFT: order size 60 breaches, then -40 is fine
+    assert list(accepted) == [True, False, True, True, True]
+    assert len(alerts) == 1 and "MSFT" in alerts[0]
+    assert not risk.check_orders(np.array([0]), np.array([1]), np.array([21]))[0]
+    assert risk.check_order("MSFT", "SELL", 50)
+
+def test_portfolio_rejected_orders_do_not_count_toward_exposure():
+    risk = PortfolioRiskManager(["AAPL", "MSFT"], RiskLimits(100, 50, -1000.0), lambda msg: None)
+    # Oversized orders are skipped by later orders for the same symbol
+    assert list(risk.check_orders(np.array([0, 0]), np.array([1, 1]), np.array([60, 50]))) == [False, True]
+    assert list(risk.check_orders(np.array([0, 0]), np.array([1, -1]), np.array([200, 50]))) == [False, True]
+
+    # So are position breaches: 90 accepted, 20 breaches, 10 still fits
+    risk.set_limits("MSFT", max_order_size=100)
+    accepted = risk.check_orders(np.array([1, 0, 1, 1, 1]), np.array([1, 1, 1, 1, -1]), np.array([90, 5, 20, 10, 100]))
+    assert list(accepted) == [True, True, False, True, True]
+    expected = []
+    for sid, side, volume in zip([1, 0, 1, 1, 1], [1, 1, 1, 1, -1], [90, 5, 20, 10, 100]):
+        symbol = risk.symbols[sid]
+        ok = risk.check_order(symbol, "BUY" if side > 0 else "SELL", volume)
+        if ok:
+            risk.update_position(symbol, "BUY" if side > 0 else "SELL", volume, 10.0)
+        expected.append(ok)
+    assert list(accepted) == expected
+
+def test_portfolio_mark_to_market():
+    alerts = []
+    risk = PortfolioRiskManager(["AAPL", "MSFT"], RiskLimits(100, 50, -100.0), alerts.append)
+    risk.update_position("AAPL", "BUY", 10, 100.0)
+    risk.update_position("AAPL", "BUY", 10, 110.0)
+    assert risk.avg_cost[0] == 105.0
+    assert alerts == []  # Buying alone no longer triggers the stop-loss
+
+    risk.update_position("AAPL", "SELL", 5, 115.0)
+    assert risk.realized[0] == 50.0
+    risk.mark(np.array([104.0, np.nan]))
+    assert risk.unrealized[0] == -15.0
+    assert risk.get_pnl() == 35.0
+
+    risk.update_position("MSFT", "SELL", 10, 300.0)
+    risk.mark(np.array([np.nan, 315.0]))
+    assert risk.get_pnl() == 35.0 - 150.0
+    assert risk.stopped and len(alerts) == 1
+    assert not risk.check_order("AAPL", "SELL", 1)
+
+def test_headroom_fast_path_matches_limits():
+    alerts = []
+    risk = RiskManager(RiskLimits(max_position=100, max_order_size=50, stop_loss=-1e9), alerts.append)
+    assert risk.check_order("AAPL", "BUY", 50)
+    assert not risk.check_order("AAPL", "BUY", 51)
+    assert alerts == ["Order size limit breached: 51"]
+
+    risk.update_position("AAPL", "BUY", 80, 10.0)
+    assert risk.check_order("AAPL", "BUY", 20)
+    assert not risk.check_order("AAPL", "BUY", 21)
+    assert alerts[-1] == "Position limit breached for AAPL: 101"
+    assert risk.check_order("AAPL", "SELL", 50)
+
+def test_fast_path_rejects_what_the_full_check_rejects():
+    alerts = []
+    risk = RiskManager(RiskLimits(max_position=100, max_order_size=50, stop_loss=-1e9), alerts.append)
+    # Negative volume moves the position the other way
+    assert not risk.check_order("AAPL", "BUY", -500)
+    assert alerts[-1] == "Position limit breached for AAPL: -500"
+
+    # Already beyond the limit (set directly): reducing by too little still breaches
+    risk.positions["AAPL"] = 150
+    assert not risk.check_order("AAPL", "SELL", 10)
+    assert risk.check_order("AAPL", "SELL", 50)
+
+    # Limits changed in place apply immediately
+    risk.positions["AAPL"] = 0
+    risk.limits.max_order_size = 10
+    assert not risk.check_order("AAPL", "BUY", 20)
+
+def test_alerts_are_coalesced_off_thread():
+    alerts, threads = [], []
+
+    def sink(msg):
+        alerts.append(msg)
+        threads.append(threading.current_thread())
+
+    dispatcher = AlertDispatcher(sink, min_interval=60.0)
+    risk = RiskManager(RiskLimits(10, 5, -1e9), sink, alert_dispatcher=dispatcher)
+    for _ in range(1000):
+        assert not risk.check_order("AAPL", "BUY", 6)
+    assert not risk.check_order("MSFT", "BUY", 11)
+    dispatcher.close()
+
+    assert alerts == [
+        "Order size limit breached: 6",
+        "Position limit breached for MSFT: 11",
+        "Order size limit breached: 6 (repeated 999x)",
+    ]
+    assert threading.current_thread() not in threads
+
+def test_alert_dispatcher_without_rate_limit_idles():
+    alerts = []
+    dispatcher = AlertDispatcher(alerts.append, min_interval=0.0)
+    cpu = time.thread_time()
+    start = time.process_time()
+    time.sleep(0.2)
+    # An idle consumer thread must not spin
+    assert time.process_time() - start - (time.thread_time() - cpu) < 0.05
+    dispatcher.alert("a", "x {}", 1)
+    dispatcher.alert("a", "x {}", 2)
+    dispatcher.close()
+    assert alerts == ["x 1", "x 2"]
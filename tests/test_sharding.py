@@ -0,0 +1,67 @@
+# tests/test_sharding.py
+import numpy as np
+import pytest
+from hft_simulator.core.risk_management import RiskLimits
+from hft_simulator.core.sharding import TICK_DTYPE, ShardedSimulation, ShardRunner, ShmRingBuffer, run_sharded
+
+def _ticks(n_symbols=6, n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    ticks = np.empty(n, dtype=TICK_DTYPE)
+    ticks["timestamp"] = np.arange(n)
+    ticks["symbol"] = rng.integers(0, n_symbols, n)
+    ticks["side"] = np.where(rng.random(n) < 0.5, 1, -1)
+    walk = 100 + rng.normal(0, 0.05, (n_symbols, n)).cumsum(axis=1)
+    ticks["price"] = walk[ticks["symbol"], np.arange(n)].round(2)
+    ticks["volume"] = rng.integers(1, 20, n)
+    return ticks
+
+def _broken_strategy(symbol):
+    raise ValueError(f"no strategy for {symbol}")
+
+def test_ring_buffer_wraps_and_bounds():
+    ring = ShmRingBuffer(8)
+    try:
+        ticks = _ticks(n=20)
+        assert ring.write(ticks[:6]) == 6
+        assert np.array_equal(ring.read(4), ticks[:4])
+        assert ring.write(ticks[6:20]) == 6  # Only 6 free slots
+        assert np.array_equal(ring.read(100), ticks[4:12])
+        assert not ring.finished
+        ring.close_writer()
+        assert ring.finished
+    finally:
+        ring.release()
+
+def test_sharded_run_matches_single_process():
+    symbols = [f"S{i}" for i in range(6)]
+    limits = RiskLimits(max_position=5, max_order_size=5, stop_loss=-1e12)
+    ticks = _ticks()
+    reference = ShardRunner(symbols, range(6), limits)
+    fills = reference.process(ticks)
+    result = run_sharded(ticks, symbols, limits, n_shards=3, chunk_size=500, ring_capacity=256)
+    assert result["ticks"] == len(ticks)
+    assert len(result["shards"]) == 3
+    assert result["positions"] == {s: reference.risk.get_position(s) for s in symbols}
+    assert len(result["fills"]) == len(fills) > 0
+    assert not result["halted"]
+
+def test_global_stop_loss_halts_shards():
+    symbols = [f"S{i}" for i in range(4)]
+    # A stop-loss above zero trips at the first mark
+    halted = run_sharded(_ticks(4), symbols, RiskLimits(5, 5, stop_loss=1.0), n_shards=2, chunk_size=200)
+    free = run_sharded(_ticks(4), symbols, RiskLimits(5, 5, stop_loss=-1e12), n_shards=2, chunk_size=200)
+    assert halted["halted"]
+    assert len(halted["fills"]) < len(free["fills"])
+
+def test_worker_errors_are_raised():
+    symbols = [f"S{i}" for i in range(4)]
+    with pytest.raises(RuntimeError, match="no strategy for S"):
+        run_sharded(_ticks(4), symbols, RiskLimits(5, 5, stop_loss=-1e12), n_shards=2, strategy_factory=_broken_strategy)
+
+def test_publish_raises_when_worker_dies():
+    symbols = [f"S{i}" for i in range(2)]
+    with pytest.raises(RuntimeError, match="Shard 0 exited"):
+        with ShardedSimulation(symbols, RiskLimits(5, 5, stop_loss=-1e12), n_shards=2, ring_capacity=16) as sim:
+            sim._procs[0].kill()
+            sim._procs[0].join()
+            sim.publish(_ticks(2, n=200))
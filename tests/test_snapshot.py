@@ -0,0 +1,117 @@
+# tests/test_snapshot.py
+import os
+from datetime import datetime, timedelta
+import numpy as np
+from hft_simulator.core.clock import event_time
+from hft_simulator.core.execution import ExecutionEngine, OrderStatus
+from hft_simulator.core.market_data import make_symbol_dispatcher
+from hft_simulator.core.order_book import OrderBook
+from hft_simulator.core.risk_management import RiskLimits, RiskManager
+from hft_simulator.core.snapshot import (
+    ReplayCheckpointer, load_checkpoint, restore_execution_engine, restore_order_book, restore_risk_manager,
+    save_checkpoint, snapshot_execution_engine, snapshot_order_book, snapshot_risk_manager, tick_columns_source
+)
+from hft_simulator.core.tick_store import NAT_NS, TickColumns, datetime_to_ns
+
+def _events(n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        {"timestamp": float(i), "symbol": "AAPL", "side": "BUY" if rng.random() < 0.5 else "SELL",
+         "price": float(100 + rng.integers(-5, 6)), "volume": int(rng.integers(1, 10))}
+        for i in range(n)
+    ]
+
+def test_order_book_round_trip_keeps_priority():
+    book = OrderBook()
+    first = book.add_order("BUY", 100.0, 5)
+    second = book.add_order("BUY", 100.0, 7)
+    book.add_order("SELL", 101.0, 3)
+    book.add_order("SELL", 100.0, 2)  # Fills against the first bid
+    restored = restore_order_book(snapshot_order_book(book))
+    assert restored.get_best_bid() == (100.0, 10)
+    assert list(restored.bids.best.orders) == [first, second]
+    assert restored.fill_seq == 1 and len(restored.fills.since(1)) == 1
+    # New orders never reuse restored ids
+    assert restored.add_order("SELL", 100.0, 3) > max(restored.order_map)
+    assert first not in restored.order_map  # Filled by the new sell
+
+def test_checkpoint_stores_only_retained_fills(tmp_path):
+    books = {f"SYM{i}": OrderBook() for i in range(100)}
+    for book in books.values():
+        book.add_order("BUY", 100.0, 1)
+    wrapped = books["SYM0"] = OrderBook(fill_capacity=4)
+    for _ in range(6):
+        wrapped.add_order("SELL", 101.0, 1)
+        wrapped.add_order("BUY", 101.0, 1)
+    path = str(tmp_path / "ckpt.npz")
+    save_checkpoint(path, 0, 0.0, books)
+    # Empty preallocated fill rings are not written out
+    assert os.path.getsize(path) < 1024 ** 2
+
+    restored = {name: OrderBook() for name in books}
+    load_checkpoint(path, restored)
+    assert restored["SYM0"].fills.capacity == 4
+    assert list(restored["SYM0"].fills.since(0)["seq"]) == [3, 4, 5, 6]
+    assert np.array_equal(restored["SYM0"].fills.records, wrapped.fills.records)
+    assert restored["SYM1"].get_best_bid() == (100.0, 1)
+
+def test_engine_and_risk_round_trip():
+    engine = ExecutionEngine(lambda order: {"status": OrderStatus.FILLED} if order.volume < 5 else {}, latency=0)
+    filled = engine.send_order("AAPL", "BUY", 100.0, 1)
+    live = engine.send_order("MSFT", "SELL", 50.0, 9)
+    copy = restore_execution_engine(snapshot_execution_engine(engine), ExecutionEngine(lambda o: {}, latency=0))
+    assert copy.get_order_status(filled) == OrderStatus.FILLED
+    assert copy.get_order(live).symbol == "MSFT" and copy.get_order(live).leaves == 9
+    risk = RiskManager(RiskLimits(10, 5, -100.0), lambda msg: None)
+    risk.update_position("AAPL", "BUY", 8, 100.0)
+    copy_risk = restore_risk_manager(snapshot_risk_manager(risk), RiskManager(RiskLimits(10, 5, -100.0), lambda msg: None))
+    assert copy_risk.get_position("AAPL") == 8 and copy_risk.get_pnl() == -800.0
+    assert not copy_risk.check_order("AAPL", "BUY", 3)
+
+def test_seek_matches_full_replay(tmp_path):
+    events = _events()
+    books = {"AAPL": OrderBook()}
+    ckpt = ReplayCheckpointer(str(tmp_path), every=200)
+    assert ckpt.run(events, make_symbol_dispatcher(books), books) == 1000
+    assert [c[0] for c in ckpt.checkpoints()] == [200, 400, 600, 800, 1000]
+
+    reference = {"AAPL": OrderBook()}
+    dispatch = make_symbol_dispatcher(reference)
+    for event in events[:651]:
+        dispatch(event)
+
+    applied = []
+    seeked = {"AAPL": OrderBook()}
+    seeker = make_symbol_dispatcher(seeked)
+
+    def apply(event):
+        applied.append(event)
+        seeker(event)
+    assert ckpt.seek(650.0, lambda start: iter(events[start:]), apply, seeked) == 651
+    assert len(applied) == 51  # Only the tail after the 600-event checkpoint
+    expected, actual = snapshot_order_book(reference["AAPL"]), snapshot_order_book(seeked["AAPL"])
+    # Order ids come from a process-wide counter, so compare everything else
+    for field in ("side", "price", "volume", "seq"):
+        assert np.array_equal(expected["orders"][field], actual["orders"][field])
+    assert np.array_equal(expected["counters"], actual["counters"])
+
+def test_replay_and_seek_skip_missing_timestamps(tmp_path):
+    events = _events(600, seed=1)
+    n = len(events)
+    timestamps = np.array([datetime_to_ns(datetime(2024, 1, 2, 9, 30)) + i * 10 ** 9 for i in range(n)], dtype=np.int64)
+    timestamps[[0, 199, 350]] = NAT_NS  # Missing times, including one on a checkpoint boundary
+    ticks = TickColumns(
+        timestamps, np.array([e["price"] for e in events]), np.array([e["volume"] for e in events], dtype=np.int64),
+        np.zeros(n, dtype=np.int32), np.array([0 if e["side"] == "BUY" else 1 for e in events], dtype=np.int8),
+        ["AAPL"], ["BUY", "SELL"]
+    )
+    source = tick_columns_source(ticks, batch_size=128)
+    books = {"AAPL": OrderBook()}
+    ckpt = ReplayCheckpointer(str(tmp_path), every=200)
+    assert ckpt.run(source(0), make_symbol_dispatcher(books), books) == n
+    # The NaT tick closing the first checkpoint takes the previous tick's time
+    assert ckpt.checkpoints()[0][1] == event_time(int(timestamps[198]))
+
+    seeked = {"AAPL": OrderBook()}
+    target = datetime(2024, 1, 2, 9, 30, 0) + timedelta(seconds=351)
+    assert ckpt.seek(target, source, make_symbol_dispatcher(seeked), seeked) == 352
@@ -0,0 +1,37 @@
+# tests/test_sweep.py
+import numpy as np
+import pandas as pd
+from hft_simulator.core.backtest import Backtester
+from hft_simulator.core.strategy import StrategyConfig, ma_crossover_signals
+from hft_simulator.core.sweep import expand_grid, run_parameter_sweep
+
+def _data():
+    rng = np.random.default_rng(11)
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2023-01-01 09:30", periods=400, freq="s"),
+        "price": 100 + np.cumsum(rng.normal(0, 0.1, 400)),
+    })
+
+def test_expand_grid_order():
+    assert expand_grid({"a": [1, 2], "b": [3, 4]}) == [
+        {"a": 1, "b": 3}, {"a": 1, "b": 4}, {"a": 2, "b": 3}, {"a": 2, "b": 4}
+    ]
+
+def test_parallel_sweep_matches_serial_backtests():
+    data = _data()
+    grid = {"short_window": [2, 5], "long_window": [10, 20, 30]}
+    seen = []
+    table = run_parameter_sweep(data, grid, processes=2, progress=lambda done, total: seen.append((done, total)))
+
+    assert list(table.columns) == ["short_window", "long_window", "pnl", "sharpe", "max_drawdown", "trades"]
+    assert table[["short_window", "long_window"]].to_dict("records") == expand_grid(grid)
+    assert seen[-1] == (6, 6)
+
+    expected = Backtester(data, None, None, StrategyConfig(5, 30)).run_vectorized(ma_crossover_signals)
+    row = table.iloc[5]
+    assert row["pnl"] == expected.pnl
+    assert row["sharpe"] == expected.sharpe
+    assert row["trades"] == len(expected.trades)
+
+    serial = run_parameter_sweep(data, grid, processes=1)
+    pd.testing.assert_frame_equal(serial, table)